@@ -3,25 +3,68 @@ Predictor component for ATK Classifier.
 Provides prediction engine with caching and result display.
 Enhanced dengan visualisasi yang menarik.
 """
-from typing import Optional
+from typing import Optional, Dict, Any, Union
 from PIL import Image
 
 import streamlit as st
 
-from models.inference import InferencePipeline
+from models.inference import InferencePipeline, ReadinessStatus
+from models.batching import MicroBatcher
+from models.metrics import MetricsRegistry, LoggingSink, PrometheusTextfileSink, metrics
 from models.cnn_model import PredictionResult
-from app.config import settings
+from models.provisioning import ModelProvisioner, ProvisioningStatus
+from app.config import settings, create_model_provisioner
 
 
 class PredictionEngine:
     """
     Prediction engine with Streamlit caching support.
-    Uses st.cache_resource for model caching.
+    Uses st.cache_resource for model caching and a shared MicroBatcher
+    so concurrent sessions are coalesced into batched forward passes.
+    The model is provisioned in the background; until it is ready the
+    pipeline serves demo predictions, then swaps in the real model.
+    Every model is warmed up at each micro-batch size before it serves.
     """
     
     def __init__(self):
         """Initialize prediction engine."""
+        self._metrics = self._get_cached_metrics()
+        self._provisioner = self._get_cached_provisioner()
         self._pipeline = self._get_cached_pipeline()
+        self._batcher = self._get_cached_batcher()
+    
+    @staticmethod
+    @st.cache_resource
+    def _get_cached_metrics() -> MetricsRegistry:
+        """
+        Configure the process-wide latency metrics and their sinks once.
+        
+        Returns:
+            The shared MetricsRegistry
+        """
+        metrics.enabled = settings.METRICS_ENABLED
+        metrics.window = settings.METRICS_WINDOW
+        if settings.METRICS_LOG:
+            metrics.add_sink(LoggingSink())
+        if settings.METRICS_PROMETHEUS_PATH:
+            metrics.add_sink(PrometheusTextfileSink(settings.METRICS_PROMETHEUS_PATH))
+        if metrics.enabled and (settings.METRICS_LOG or settings.METRICS_PROMETHEUS_PATH):
+            metrics.start_reporter(settings.METRICS_FLUSH_INTERVAL_SEC)
+        return metrics
+    
+    @staticmethod
+    @st.cache_resource
+    def _get_cached_provisioner() -> ModelProvisioner:
+        """
+        Get the shared model provisioner, starting the download in the background.
+        
+        Returns:
+            Cached ModelProvisioner instance
+        """
+        provisioner = create_model_provisioner()
+        if settings.MODEL_AUTO_PROVISION:
+            provisioner.start()
+        return provisioner
     
     @staticmethod
     @st.cache_resource
@@ -33,30 +76,87 @@ class PredictionEngine:
         Returns:
             Cached InferencePipeline instance
         """
-        return InferencePipeline(
+        pipeline = InferencePipeline(
             model_path=str(settings.MODEL_PATH),
             input_size=settings.INPUT_SIZE,
             class_names=settings.CLASS_NAMES,
-            low_confidence_threshold=settings.LOW_CONFIDENCE_THRESHOLD
+            low_confidence_threshold=settings.LOW_CONFIDENCE_THRESHOLD,
+            backend=settings.MODEL_BACKEND,
+            cache_size=settings.PREDICTION_CACHE_SIZE,
+            fast_decode=settings.FAST_DECODE,
+            resample=settings.RESAMPLE_FILTER
+        )
+        
+        # Trace/allocate before the first user request; reload_model() reuses these sizes
+        warmup_batch_sizes = settings.WARMUP_BATCH_SIZES
+        if warmup_batch_sizes is None:
+            warmup_batch_sizes = list(range(1, settings.BATCH_MAX_SIZE + 1))
+        pipeline.warmup(warmup_batch_sizes)
+        
+        # Start in demo mode and switch to the real model once it is downloaded
+        if pipeline.is_demo_mode():
+            PredictionEngine._get_cached_provisioner().add_ready_callback(
+                lambda model_path: pipeline.reload_model(str(model_path))
+            )
+        return pipeline
+    
+    @staticmethod
+    @st.cache_resource
+    def _get_cached_batcher() -> MicroBatcher:
+        """
+        Get cached micro-batcher shared by all sessions.
+        
+        Returns:
+            Cached MicroBatcher wrapping the cached pipeline
+        """
+        return MicroBatcher(
+            PredictionEngine._get_cached_pipeline(),
+            max_batch_size=settings.BATCH_MAX_SIZE,
+            max_wait_ms=settings.BATCH_MAX_WAIT_MS
         )
     
     def is_demo_mode(self) -> bool:
         """Check if running in demo mode."""
         return self._pipeline.is_demo_mode()
     
-    def predict(self, image: Image.Image, top_k: int = None) -> PredictionResult:
+    def predict(self, image: Union[Image.Image, bytes], top_k: int = None) -> PredictionResult:
         """
         Run prediction on an image.
         
         Args:
-            image: PIL Image to classify
+            image: PIL Image or raw encoded image bytes to classify.
+                Raw bytes let repeated reruns hit the prediction cache without decoding.
             top_k: Number of top predictions (default from settings)
             
         Returns:
             PredictionResult with classification results
         """
         top_k = top_k or settings.TOP_K_PREDICTIONS
-        return self._pipeline.predict(image, top_k=top_k)
+        return self._batcher.predict(image, top_k=top_k)
+    
+    def is_ready(self) -> bool:
+        """Check if a real model is loaded and warmed up (readiness probe)."""
+        return self._pipeline.readiness().ready
+    
+    def get_readiness(self) -> ReadinessStatus:
+        """Get readiness plus model load and warm-up times."""
+        return self._pipeline.readiness()
+    
+    def get_provisioning_status(self) -> ProvisioningStatus:
+        """Get download state and progress of the model file."""
+        return self._provisioner.status()
+    
+    def get_batching_stats(self) -> Dict[str, Any]:
+        """Get throughput and p50/p99 latency of the shared micro-batcher."""
+        return self._batcher.get_stats()
+    
+    def get_latency_stats(self) -> Dict[str, Dict[str, float]]:
+        """Get count and p50/p95/p99 latency per pipeline stage."""
+        return self._metrics.snapshot()
+    
+    def get_cache_info(self) -> Dict[str, int]:
+        """Get hit/miss counters of the pipeline's prediction cache."""
+        return self._pipeline.cache_info()
 
 
 def get_confidence_color(percentage: float) -> str:
@@ -3,34 +3,9 @@ Configuration module for ATK Classifier application.
 """
 from pathlib import Path
 from dataclasses import dataclass, field
-from typing import List, Tuple
+from typing import List, Tuple, Optional
 
-
-def ensure_model_exists():
-    """Download model from Google Drive if not exists."""
-    model_path = Path("models/best_model.keras")
-    
-    if model_path.exists() and model_path.stat().st_size > 50 * 1024 * 1024:
-        return True  # Model exists and is valid (>50MB)
-    
-    try:
-        import gdown
-        
-        # Google Drive file ID
-        file_id = "1pmZlycIZl6B6EMH1V31NNI29w6128DcV"
-        url = f"https://drive.google.com/uc?id={file_id}"
-        
-        model_path.parent.mkdir(exist_ok=True)
-        gdown.download(url, str(model_path), quiet=False)
-        
-        return model_path.exists()
-    except Exception as e:
-        print(f"Failed to download model: {e}")
-        return False
-
-
-# Auto-download model on import
-ensure_model_exists()
+from models.provisioning import ModelProvisioner, read_expected_sha256
 
 
 @dataclass
@@ -48,7 +23,14 @@ class Settings:
     
     # Model Configuration
     MODEL_PATH: Path = field(default_factory=lambda: Path("models/best_model.keras"))
+    MODEL_SOURCE: str = "https://drive.google.com/uc?id=1pmZlycIZl6B6EMH1V31NNI29w6128DcV"  # Path lokal, URL HTTP(S) atau Google Drive
+    MODEL_MIN_SIZE_BYTES: int = 50 * 1024 * 1024  # File lebih kecil dianggap rusak/belum lengkap (hanya jika metadata tidak berisi sha256)
+    MODEL_AUTO_PROVISION: bool = True  # Unduh model di background saat app start (demo mode sampai siap)
+    MODEL_CACHE_DIR: Path = field(default_factory=lambda: Path.home() / ".cache" / "atk-classifier")  # Cache model per host (berbasis SHA-256)
+    MODEL_BACKEND: Optional[str] = None  # "keras" / "numpy", None = dari ekstensi file
     INPUT_SIZE: Tuple[int, int] = (300, 300)  # Sesuai notebook
+    FAST_DECODE: bool = True  # Decode JPEG besar langsung ke ukuran mendekati INPUT_SIZE
+    RESAMPLE_FILTER: str = "nearest"  # Paling dekat dengan resize training (tf.image.resize bilinear tanpa antialias), lihat benchmarks/bench_resample.py
     NUM_CLASSES: int = 3  # pensil, eraser, kertas
     CLASS_NAMES: List[str] = field(default_factory=lambda: [
         "eraser",
@@ -72,9 +54,81 @@ class Settings:
     TOP_K_PREDICTIONS: int = 3
     LOW_CONFIDENCE_THRESHOLD: float = 0.5
     
+    # Prediction Cache Configuration
+    PREDICTION_CACHE_SIZE: int = 128  # Max cached results keyed by image content hash
+    
+    # Micro-batching Configuration
+    BATCH_MAX_SIZE: int = 8  # Max requests coalesced into one forward pass
+    BATCH_MAX_WAIT_MS: float = 5.0  # Max time the first request waits for others
+    
+    # Warm-up Configuration
+    WARMUP_BATCH_SIZES: Optional[List[int]] = None  # None = setiap ukuran 1..BATCH_MAX_SIZE, [] = tanpa warm-up
+    
+    # Latency Metrics Configuration
+    METRICS_ENABLED: bool = True  # Catat latency per tahap (decode, resize, to_array, forward, ...)
+    METRICS_WINDOW: int = 1024  # Jumlah observasi terakhir per tahap untuk p50/p95/p99
+    METRICS_FLUSH_INTERVAL_SEC: float = 60.0  # Interval kirim snapshot ke sink
+    METRICS_LOG: bool = False  # Tulis ringkasan latency ke logging
+    METRICS_PROMETHEUS_PATH: Optional[Path] = None  # File .prom untuk node_exporter textfile collector
+    
     # Demo Mode
     DEMO_MODE_MESSAGE: str = "Running in demo mode - predictions are simulated"
 
 
 # Global settings instance
 settings = Settings()
+
+
+def model_source_serves(model_path: Path, backend: Optional[str] = None) -> bool:
+    """
+    Check whether MODEL_SOURCE is where the model at model_path comes from.
+    
+    MODEL_SOURCE serves the Keras .keras model. NumPy exports, weight
+    directories and TFLite files are produced locally from it, so they are
+    never downloaded (that would overwrite them with Keras zip bytes).
+    
+    Args:
+        model_path: Configured MODEL_PATH
+        backend: Configured MODEL_BACKEND (None = from the file suffix)
+    
+    Returns:
+        True if model_path is the .keras artifact served by MODEL_SOURCE
+    """
+    return model_path.suffix.lower() == ".keras" and backend in (None, "keras")
+
+
+def create_model_provisioner() -> ModelProvisioner:
+    """
+    Build the provisioner for settings.MODEL_PATH.
+    
+    Only the artifact MODEL_SOURCE serves is downloaded; any other
+    MODEL_PATH is just required to exist. MODEL_MIN_SIZE_BYTES only guards
+    models without a recorded checksum: a GAP-head model is ~0.5MB, and
+    the SHA-256 check already rejects truncated or wrong files.
+    
+    Returns:
+        ModelProvisioner (not started)
+    """
+    if not model_source_serves(settings.MODEL_PATH, settings.MODEL_BACKEND):
+        return ModelProvisioner(None, settings.MODEL_PATH)
+    expected_sha256 = read_expected_sha256(settings.MODEL_PATH)
+    return ModelProvisioner(
+        settings.MODEL_SOURCE,
+        settings.MODEL_PATH,
+        min_size_bytes=0 if expected_sha256 else settings.MODEL_MIN_SIZE_BYTES,
+        expected_sha256=expected_sha256,
+        cache_dir=settings.MODEL_CACHE_DIR
+    )
+
+
+def ensure_model_exists() -> bool:
+    """
+    Download the model if it is missing, blocking until done.
+    
+    The app provisions in the background instead (see PredictionEngine);
+    this is for scripts that need the model before continuing.
+    
+    Returns:
+        True if the model file is ready
+    """
+    return create_model_provisioner().provision().state == "ready"
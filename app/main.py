@@ -248,6 +248,40 @@ def get_prediction_engine():
     return PredictionEngine()
 
 
+def render_model_status(engine: PredictionEngine):
+    """Render model download progress while the app runs in demo mode."""
+    status = engine.get_provisioning_status()
+    
+    if status.state in ("idle", "downloading"):
+        if status.progress is not None:
+            st.progress(status.progress, text=f"Menyiapkan model... {status.progress:.0%}")
+        else:
+            st.caption("⏳ Menyiapkan model... hasil asli akan muncul otomatis setelah model siap.")
+    elif status.state == "failed":
+        st.caption(f"❌ Model gagal disiapkan: {status.error}")
+
+
+def render_latency_panel(engine: PredictionEngine):
+    """Render per-stage latency histograms (expert mode)."""
+    stats = engine.get_latency_stats()
+    if not stats:
+        return
+    
+    with st.expander("⏱️ Latency per Tahap"):
+        st.table([
+            {
+                "Tahap": stage,
+                "Count": summary["count"],
+                "p50 (ms)": f"{summary['p50_ms']:.1f}",
+                "p95 (ms)": f"{summary['p95_ms']:.1f}",
+                "p99 (ms)": f"{summary['p99_ms']:.1f}",
+            }
+            for stage, summary in stats.items()
+            if summary["p50_ms"] is not None
+        ])
+        st.caption("decode → resize → to_array → forward → postprocess; pipeline = total per batch (termasuk cache)")
+
+
 def render_main_header():
     """Render main content header - Standard Streamlit."""
     # Judul Main Header dengan ukuran yang sama dengan Sidebar (32px)
@@ -301,17 +335,18 @@ def render_analysis_result(result):
             st.json(result.top_predictions)
 
 
-def render_twin_frames(image: Image.Image, source_name: str):
+def render_twin_frames(image: Image.Image, source_name: str, image_bytes: bytes = None):
     """Render twin frames layout - Image & Analysis side by side dengan ukuran tetap."""
     engine = get_prediction_engine()
     
-    # Process prediction
+    # Process prediction - raw bytes (jika ada) agar rerun kena cache tanpa decode ulang
     with st.spinner("Analyzing..."):
-        result = engine.predict(image, top_k=3)
+        result = engine.predict(image_bytes if image_bytes is not None else image, top_k=3)
     
     # Demo mode check
     if result.is_demo:
         st.warning("Demo Mode Active")
+        render_model_status(engine)
         return
     
     # Google-like Result Layout (Card based)
@@ -324,6 +359,16 @@ def render_twin_frames(image: Image.Image, source_name: str):
         
     with col2:
         render_analysis_result(result)
+    
+    if st.session_state.get("user_mode") == "expert":
+        readiness = engine.get_readiness()
+        if readiness.load_time_sec is not None:
+            warmup = f"{readiness.warmup_time_sec:.2f}s" if readiness.warmup_time_sec is not None else "-"
+            st.caption(
+                f"⚙️ Backend {readiness.backend} · load {readiness.load_time_sec:.2f}s · "
+                f"warm-up {warmup} (batch {readiness.warmup_batch_sizes})"
+            )
+        render_latency_panel(engine)
 
 
 def render_input_section():
@@ -342,7 +387,7 @@ def render_input_section():
         if uploaded_file:
             try:
                 image = Image.open(uploaded_file)
-                render_twin_frames(image, uploaded_file.name)
+                render_twin_frames(image, uploaded_file.name, uploaded_file.getvalue())
             except Exception:
                 st.error("❌ Format file tidak valid.")
         else:
@@ -359,7 +404,7 @@ def render_input_section():
             camera_image = st.camera_input("Ambil foto", label_visibility="collapsed")
             if camera_image:
                 image = Image.open(camera_image)
-                render_twin_frames(image, "Camera Capture")
+                render_twin_frames(image, "Camera Capture", camera_image.getvalue())
         else:
             st.info("Klik checkbox di atas untuk mengaktifkan kamera.")
 
@@ -408,7 +453,7 @@ def render_sample_section():
             with col:
                 if st.button(f"🔍 {label}", key=f"try_{key}", use_container_width=True):
                     img = Image.open(filepath)
-                    render_twin_frames(img, f"Sample: {label}")
+                    render_twin_frames(img, f"Sample: {label}", filepath.read_bytes())
 
 
 def render_footer():
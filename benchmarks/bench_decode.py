@@ -0,0 +1,93 @@
+"""
+Benchmark: fast decode (JPEG draft / reduce) vs full decode.
+Measures decode+resize time per image format and the drift it introduces,
+both in pixels and in model predictions.
+
+Usage:
+    python -m benchmarks.bench_decode [--model PATH] [--limit N]
+"""
+import argparse
+import json
+import time
+from collections import defaultdict
+
+import numpy as np
+
+from benchmarks.common import dataset_images, resolve_model_path
+
+from models.preprocessing import ImagePreprocessor
+from models.cnn_model import ModelPredictor
+
+
+def run(model_path: str = None, limit: int = None, batch_size: int = 16) -> dict:
+    """
+    Run the decode benchmark over dataset_alat_tulis.
+    
+    Args:
+        model_path: Path to model (random model if missing)
+        limit: Maximum number of dataset images
+        batch_size: Batch size for the prediction drift check
+        
+    Returns:
+        Dictionary with per-format timings and drift statistics
+    """
+    images = dataset_images(limit=limit)
+    full = ImagePreprocessor(normalize=False, fast_decode=False)
+    fast = ImagePreprocessor(normalize=False, fast_decode=True)
+    
+    timings = defaultdict(lambda: {"full": [], "fast": []})
+    full_arrays, fast_arrays = [], []
+    
+    for path in images:
+        data = path.read_bytes()
+        fmt = path.suffix.lower().lstrip(".")
+        for name, preprocessor, arrays in (("full", full, full_arrays), ("fast", fast, fast_arrays)):
+            start = time.perf_counter()
+            arrays.append(preprocessor.preprocess(data)[0])
+            timings[fmt][name].append((time.perf_counter() - start) * 1000)
+    
+    full_batch = np.stack(full_arrays)
+    fast_batch = np.stack(fast_arrays)
+    pixel_diff = np.abs(full_batch - fast_batch)
+    
+    predictor = ModelPredictor(model_path=str(resolve_model_path(model_path)))
+    full_probs = np.concatenate([
+        predictor._predict_probabilities(full_batch[i:i + batch_size]) for i in range(0, len(images), batch_size)
+    ])
+    fast_probs = np.concatenate([
+        predictor._predict_probabilities(fast_batch[i:i + batch_size]) for i in range(0, len(images), batch_size)
+    ])
+    
+    results = {"formats": {}, "num_images": len(images)}
+    for fmt, values in sorted(timings.items()):
+        full_ms, fast_ms = np.mean(values["full"]), np.mean(values["fast"])
+        results["formats"][fmt] = {
+            "count": len(values["full"]),
+            "full_ms": float(full_ms),
+            "fast_ms": float(fast_ms),
+            "speedup": float(full_ms / fast_ms)
+        }
+        print(f"{fmt:>5} n={len(values['full']):<4} full={full_ms:.1f}ms fast={fast_ms:.1f}ms speedup={full_ms / fast_ms:.2f}x")
+    
+    results["pixel_mean_abs_diff"] = float(pixel_diff.mean())
+    results["pixel_max_abs_diff"] = float(pixel_diff.max())
+    results["top1_agreement"] = float((full_probs.argmax(1) == fast_probs.argmax(1)).mean())
+    results["max_prob_diff"] = float(np.abs(full_probs - fast_probs).max())
+    print(
+        f"pixel drift: mean={results['pixel_mean_abs_diff']:.2f} max={results['pixel_max_abs_diff']:.0f} (0-255) | "
+        f"top-1 agreement={results['top1_agreement']:.2%} max prob diff={results['max_prob_diff']:.4f}"
+    )
+    
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--model", default=None, help="Path to model file")
+    parser.add_argument("--limit", type=int, default=None, help="Maximum number of images")
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    args = parser.parse_args()
+    
+    results = run(args.model, args.limit)
+    if args.json:
+        print(json.dumps(results, indent=2))
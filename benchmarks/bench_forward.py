@@ -0,0 +1,56 @@
+"""
+Benchmark: compiled forward function vs model.predict.
+Compares single-image and batch latency of ModelPredictor with compiled=True/False.
+
+Usage:
+    python -m benchmarks.bench_forward [--model PATH] [--repeats N]
+"""
+import argparse
+import json
+
+from benchmarks.common import dataset_images, resolve_model_path, time_call
+
+from models.preprocessing import ImagePreprocessor
+from models.cnn_model import ModelPredictor
+
+
+def run(model_path: str = None, repeats: int = 20, batch_sizes=(1, 8)) -> dict:
+    """
+    Run the forward-pass benchmark.
+    
+    Args:
+        model_path: Path to .keras model (random model if missing)
+        repeats: Timed repetitions per measurement
+        batch_sizes: Batch sizes to measure
+        
+    Returns:
+        Dictionary of latency stats keyed by mode and batch size
+    """
+    path = resolve_model_path(model_path)
+    images = dataset_images(limit=max(batch_sizes))
+    preprocessor = ImagePreprocessor(normalize=False)
+    results = {}
+    
+    for compiled in (False, True):
+        predictor = ModelPredictor(model_path=str(path), compiled=compiled)
+        mode = "compiled" if compiled else "model.predict"
+        
+        for batch_size in batch_sizes:
+            batch = preprocessor.preprocess_batch(images[:batch_size])
+            stats = time_call(lambda: predictor.predict_batch(batch), repeats=repeats)
+            results[f"{mode}/batch_{batch_size}"] = stats
+            print(f"{mode:>14} batch={batch_size:<3} p50={stats['p50_ms']:.1f}ms mean={stats['mean_ms']:.1f}ms")
+    
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--model", default=None, help="Path to .keras model")
+    parser.add_argument("--repeats", type=int, default=20)
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    args = parser.parse_args()
+    
+    results = run(args.model, args.repeats)
+    if args.json:
+        print(json.dumps(results, indent=2))
@@ -0,0 +1,85 @@
+"""
+Benchmark: Flatten vs global-average-pooling classifier head.
+Trains both variants on dataset_alat_tulis with the same split and seed,
+then reports parameter count, .keras / .npz file size, single-image
+latency (Keras and NumPy backends) and best validation accuracy.
+
+Usage:
+    python -m benchmarks.bench_heads [--epochs N] [--output report.json]
+"""
+import argparse
+import json
+import tempfile
+from pathlib import Path
+
+import numpy as np
+
+from benchmarks.common import DATASET_DIR, time_call
+from models.cnn_model import HEADS, ModelPredictor
+from models.numpy_engine import export_weights
+from models.train_model import ATKModelTrainer, DatasetManager, TrainingConfig
+
+
+def compare_head(head: str, epochs: int, workdir: Path, repeats: int = 20) -> dict:
+    """Train one head variant and measure its size and latency."""
+    import tensorflow as tf
+    
+    config = TrainingConfig(head=head, epochs=epochs, early_stopping_patience=epochs, precision="auto")
+    tf.keras.utils.set_random_seed(config.seed)
+    train_ds, val_ds, class_names = DatasetManager(str(DATASET_DIR)).load_dataset(config, use_cache=True)
+    
+    model_path = workdir / f"{head}.keras"
+    trainer = ATKModelTrainer(config)
+    result = trainer.train(train_ds, val_ds, class_names, str(model_path), verbose=0)
+    npz_path = export_weights(tf.keras.models.load_model(str(model_path)), workdir / f"{head}.npz")
+    
+    image = np.random.default_rng(0).integers(0, 256, (1, config.img_height, config.img_width, 3)).astype(np.uint8)
+    latency = {}
+    for backend, path in (("keras", model_path), ("numpy", npz_path)):
+        predictor = ModelPredictor(model_path=str(path))
+        latency[backend] = time_call(lambda: predictor._predict_probabilities(image), repeats=repeats)["min_ms"]
+    
+    return {
+        "params": int(trainer.model.count_params()),
+        "keras_size_mb": model_path.stat().st_size / 1024 / 1024,
+        "npz_size_mb": npz_path.stat().st_size / 1024 / 1024,
+        "keras_latency_ms": latency["keras"],
+        "numpy_latency_ms": latency["numpy"],
+        "best_val_accuracy": float(max(result.history["val_accuracy"])),
+        "epochs": result.epochs_trained,
+    }
+
+
+def run(epochs: int = 10) -> dict:
+    """
+    Compare every head variant.
+    
+    Args:
+        epochs: Training epochs per variant
+    
+    Returns:
+        Mapping of head name to its report row
+    """
+    report = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        for head in HEADS:
+            report[head] = compare_head(head, epochs, Path(tmp))
+            r = report[head]
+            print(
+                f"{head:<8} params {r['params']:>11,}  .keras {r['keras_size_mb']:6.1f}MB  .npz {r['npz_size_mb']:6.1f}MB  "
+                f"latency keras {r['keras_latency_ms']:6.1f}ms numpy {r['numpy_latency_ms']:6.1f}ms  "
+                f"best val_acc {r['best_val_accuracy']:.3f}"
+            )
+    return report
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--epochs", type=int, default=10)
+    parser.add_argument("--output", default=None, help="Write the report as JSON")
+    args = parser.parse_args()
+    
+    results = run(args.epochs)
+    if args.output:
+        Path(args.output).write_text(json.dumps(results, indent=2))
+        print(f"Report saved to: {args.output}")
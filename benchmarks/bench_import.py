@@ -0,0 +1,93 @@
+"""
+Benchmark: module import time.
+Runs ``python -X importtime -c "import <module>"`` in a fresh interpreter for
+each module, reports the cumulative import time and whether TensorFlow was
+pulled in, and fails when a module exceeds its budget.
+
+Usage:
+    python -m benchmarks.bench_import [--budget-ms 500] [--modules models models.preprocessing]
+"""
+import argparse
+import json
+import subprocess
+import sys
+
+from benchmarks.common import ROOT_DIR
+
+# Modules that must start without TensorFlow
+DEFAULT_MODULES = [
+    "models.preprocessing",
+    "models",
+    "models.inference",
+    "models.classify",
+    "models.train_model",
+]
+
+
+def import_time(module: str) -> dict:
+    """
+    Measure one module import in a fresh interpreter.
+    
+    Args:
+        module: Dotted module name
+        
+    Returns:
+        Dictionary with cumulative import time (ms) and whether TensorFlow loaded
+    """
+    code = f"import sys, {module}; print('tensorflow' in sys.modules)"
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=str(ROOT_DIR), capture_output=True, text=True, check=True
+    )
+    
+    # importtime lines: "import time: self [us] | cumulative | imported package"
+    # Top-level imports have no indentation in the package column
+    total_us = 0
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        if not name.startswith("  "):
+            total_us += int(cumulative)
+    
+    return {
+        "import_ms": total_us / 1000,
+        "tensorflow_loaded": proc.stdout.strip().splitlines()[-1] == "True"
+    }
+
+
+def run(modules: list = None, budget_ms: float = 500.0) -> dict:
+    """
+    Measure import time for each module against a budget.
+    
+    Args:
+        modules: Dotted module names (default: DEFAULT_MODULES)
+        budget_ms: Maximum allowed cumulative import time per module
+        
+    Returns:
+        Dictionary keyed by module with import time, TensorFlow flag and budget verdict
+    """
+    results = {}
+    for module in modules or DEFAULT_MODULES:
+        result = import_time(module)
+        result["within_budget"] = result["import_ms"] <= budget_ms and not result["tensorflow_loaded"]
+        results[module] = result
+        print(
+            f"{module:<24} {result['import_ms']:8.1f}ms  "
+            f"tensorflow={'yes' if result['tensorflow_loaded'] else 'no':<3}  "
+            f"{'OK' if result['within_budget'] else 'OVER BUDGET'}"
+        )
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--modules", nargs="+", default=None, help="Modules to import")
+    parser.add_argument("--budget-ms", type=float, default=500.0, help="Import time budget per module")
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    args = parser.parse_args()
+    
+    results = run(args.modules, args.budget_ms)
+    if args.json:
+        print(json.dumps(results, indent=2))
+    sys.exit(0 if all(r["within_budget"] for r in results.values()) else 1)
@@ -0,0 +1,82 @@
+"""
+Benchmark: training input pipeline steps/sec.
+Iterates the training split for two epochs with the previous
+image_dataset_from_directory pipeline, the split-aware decode pipeline and
+the tensor-cache pipeline. Epoch 1 includes decoding; epoch 2 shows the
+steady state after in-memory caching.
+
+Usage:
+    python -m benchmarks.bench_input_pipeline [--batch-size N] [--augment]
+"""
+import argparse
+import json
+import time
+
+from benchmarks.common import DATASET_DIR
+from models.input_pipeline import build_splits
+from models.train_model import TrainingConfig
+
+
+def epoch_steps_per_sec(dataset, epochs: int = 2) -> list:
+    """Steps/sec of each pass over a batched dataset."""
+    rates = []
+    for _ in range(epochs):
+        steps = 0
+        start = time.perf_counter()
+        for _ in dataset:
+            steps += 1
+        rates.append(steps / (time.perf_counter() - start))
+    return rates
+
+
+def legacy_train_dataset(config: TrainingConfig):
+    """Training pipeline as load_dataset built it before the split-aware pipeline."""
+    import tensorflow as tf
+    
+    train_ds = tf.keras.utils.image_dataset_from_directory(
+        str(DATASET_DIR),
+        validation_split=0.1,
+        subset="training",
+        seed=123,
+        image_size=(config.img_height, config.img_width),
+        batch_size=15,
+        verbose=False
+    )
+    return train_ds.cache().shuffle(1000).prefetch(buffer_size=tf.data.AUTOTUNE)
+
+
+def run(config: TrainingConfig, epochs: int = 2) -> dict:
+    """
+    Measure steps/sec per epoch for each input pipeline.
+    
+    Args:
+        config: Training configuration driving the new pipelines
+        epochs: Passes per pipeline
+    
+    Returns:
+        Mapping of pipeline name to steps/sec per epoch
+    """
+    pipelines = {
+        "image_dataset_from_directory": lambda: legacy_train_dataset(config),
+        "split_aware_decode": lambda: build_splits(DATASET_DIR, config).train,
+        "split_aware_tensor_cache": lambda: build_splits(DATASET_DIR, config, use_cache=True).train,
+    }
+    results = {}
+    for name, make in pipelines.items():
+        results[name] = epoch_steps_per_sec(make(), epochs)
+        rates = ", ".join(f"epoch {i + 1}: {rate:.1f}" for i, rate in enumerate(results[name]))
+        print(f"{name:<30} steps/sec {rates}")
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--batch-size", type=int, default=15)
+    parser.add_argument("--augment", action="store_true", help="Enable batch augmentation in the new pipelines")
+    parser.add_argument("--epochs", type=int, default=2)
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    args = parser.parse_args()
+    
+    results = run(TrainingConfig(batch_size=args.batch_size, augment=args.augment), args.epochs)
+    if args.json:
+        print(json.dumps(results, indent=2))
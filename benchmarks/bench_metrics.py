@@ -0,0 +1,88 @@
+"""
+Benchmark: per-stage latency breakdown and instrumentation overhead.
+Runs dataset images through InferencePipeline with metrics enabled and
+prints p50/p95/p99 per stage (decode, resize, to_array, forward,
+postprocess, pipeline), then compares pipeline latency with metrics on and
+off, plus the raw cost of one timer() block in each state.
+
+Usage:
+    python -m benchmarks.bench_metrics [--model PATH] [--images N]
+"""
+import argparse
+import json
+import time
+
+from benchmarks.common import dataset_images, resolve_model_path, time_call
+from models.inference import InferencePipeline
+from models.metrics import MetricsRegistry, metrics
+
+
+def timer_overhead_ns(enabled: bool, calls: int = 200_000) -> float:
+    """Mean cost in nanoseconds of one empty ``with registry.timer(...)`` block."""
+    registry = MetricsRegistry(enabled=enabled)
+    start = time.perf_counter()
+    for _ in range(calls):
+        with registry.timer("stage"):
+            pass
+    return (time.perf_counter() - start) / calls * 1e9
+
+
+def run(model_path: str = None, num_images: int = 32, repeats: int = 3) -> dict:
+    """
+    Measure the stage breakdown and the overhead of the metrics hooks.
+    
+    Args:
+        model_path: Model file (random .keras model if missing)
+        num_images: Dataset images per pass
+        repeats: Timed passes per setting
+    
+    Returns:
+        Dictionary with per-stage stats, pipeline latency on/off and timer overhead
+    """
+    pipeline = InferencePipeline(
+        model_path=str(resolve_model_path(model_path)),
+        cache_size=0,
+        fast_decode=True,
+        resample="nearest"
+    )
+    images = dataset_images(limit=num_images)
+    
+    def one_pass():
+        for path in images:
+            pipeline.predict(path)
+    
+    latency = {}
+    was_enabled = metrics.enabled
+    try:
+        for enabled in (False, True):
+            metrics.enabled = enabled
+            metrics.reset()
+            result = time_call(one_pass, repeats=repeats, warmup=1)
+            latency["on" if enabled else "off"] = result["p50_ms"] / len(images)
+        stages = metrics.snapshot()
+    finally:
+        metrics.enabled = was_enabled
+    
+    overhead = {"disabled_ns": timer_overhead_ns(False), "enabled_ns": timer_overhead_ns(True)}
+    
+    for stage, summary in stages.items():
+        print(
+            f"{stage:>12}: count={summary['count']:<5} p50={summary['p50_ms']:.2f}ms "
+            f"p95={summary['p95_ms']:.2f}ms p99={summary['p99_ms']:.2f}ms"
+        )
+    print(f"per image: metrics off {latency['off']:.2f}ms, on {latency['on']:.2f}ms")
+    print(f"timer(): disabled {overhead['disabled_ns']:.0f}ns, enabled {overhead['enabled_ns']:.0f}ns per block")
+    
+    return {"stages": stages, "latency_per_image_ms": latency, "timer_overhead": overhead}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--model", default=None, help="Model file (.keras, .npz, .tflite or weight directory)")
+    parser.add_argument("--images", type=int, default=32)
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    args = parser.parse_args()
+    
+    results = run(args.model, args.images)
+    if args.json:
+        print(json.dumps(results, indent=2))
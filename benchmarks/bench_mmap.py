@@ -0,0 +1,142 @@
+"""
+Benchmark: per-worker memory with in-memory vs memory-mapped weights.
+Starts N serving processes at once (like N Streamlit workers on one host),
+each loading the model and running one prediction, then reads every
+worker's /proc/<pid>/smaps_rollup while they are all alive.
+
+RSS counts shared page-cache pages in every process that maps them, so it
+barely moves with memory-mapped weights; PSS (shared pages split between
+the processes mapping them) and private memory show the actual saving.
+
+Linux only.
+
+Usage:
+    python -m benchmarks.bench_mmap [--model PATH.keras] [--workers N] [--keras]
+"""
+import argparse
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+from benchmarks.common import ROOT_DIR, dataset_images, resolve_model_path
+
+CHILD_SCRIPT = """
+import sys, json
+sys.path.insert(0, {root!r})
+from models.inference import InferencePipeline
+pipeline = InferencePipeline(model_path={model!r}, cache_size=0)
+assert not pipeline.is_demo_mode(), "model failed to load"
+pipeline.predict({image!r})
+print("ready", flush=True)
+sys.stdin.readline()
+stats = {{}}
+with open("/proc/self/smaps_rollup") as f:
+    for line in f:
+        key, _, value = line.partition(":")
+        if value.strip().endswith("kB"):
+            stats[key] = int(value.split()[0]) / 1024
+print(json.dumps({{
+    "backend": pipeline.predictor.backend,
+    "rss_mb": stats["Rss"],
+    "pss_mb": stats["Pss"],
+    "private_mb": stats["Private_Clean"] + stats["Private_Dirty"],
+    "shared_mb": stats["Shared_Clean"] + stats["Shared_Dirty"],
+}}), flush=True)
+sys.stdin.readline()
+"""
+
+
+def measure_workers(model_path: Path, image: Path, num_workers: int) -> list:
+    """
+    Run num_workers concurrent workers on one model and measure each of them.
+    
+    Args:
+        model_path: Model file or weight directory
+        image: Image used for the warm-up prediction
+        num_workers: Number of concurrent processes
+    
+    Returns:
+        List of per-worker memory dictionaries (MB)
+    """
+    script = CHILD_SCRIPT.format(root=str(ROOT_DIR), model=str(model_path), image=str(image))
+    workers = [
+        subprocess.Popen(
+            [sys.executable, "-c", script],
+            stdin=subprocess.PIPE, stdout=subprocess.PIPE, text=True
+        )
+        for _ in range(num_workers)
+    ]
+    try:
+        # Measure only once every worker has loaded, so pages are actually shared
+        for worker in workers:
+            if worker.stdout.readline().strip() != "ready":
+                raise RuntimeError(f"Worker failed to load {model_path}")
+        results = []
+        for worker in workers:
+            worker.stdin.write("measure\n")
+            worker.stdin.flush()
+            results.append(json.loads(worker.stdout.readline()))
+        return results
+    finally:
+        for worker in workers:
+            worker.stdin.close()
+            worker.wait()
+
+
+def run(model_path: str = None, num_workers: int = 4, include_keras: bool = False) -> dict:
+    """
+    Compare worker memory across weight formats.
+    
+    Args:
+        model_path: Path to .keras model (random model if missing)
+        num_workers: Concurrent worker processes per format
+        include_keras: Also measure keras.models.load_model workers
+    
+    Returns:
+        Dictionary of format -> per-worker averages and totals (MB)
+    """
+    keras_path = resolve_model_path(model_path)
+    npz_path = keras_path.with_suffix(".npz")
+    weight_dir = keras_path.with_suffix(".weights")
+    if not (npz_path.exists() and weight_dir.exists()):
+        from tensorflow import keras
+        from models.numpy_engine import export_weights, export_weight_dir
+        model = keras.models.load_model(str(keras_path))
+        export_weights(model, npz_path)
+        export_weight_dir(model, weight_dir)
+    
+    formats = {"npz": npz_path, "mmap": weight_dir}
+    if include_keras:
+        formats = {"keras": keras_path, **formats}
+    
+    image = dataset_images(limit=1)[0]
+    results = {}
+    for name, path in formats.items():
+        workers = measure_workers(path, image, num_workers)
+        summary = {
+            key: sum(w[key] for w in workers) / len(workers)
+            for key in ("rss_mb", "pss_mb", "private_mb", "shared_mb")
+        }
+        summary["total_pss_mb"] = sum(w["pss_mb"] for w in workers)
+        results[name] = summary
+        print(
+            f"{name:>6} x{num_workers}: rss={summary['rss_mb']:.0f}MB pss={summary['pss_mb']:.0f}MB "
+            f"private={summary['private_mb']:.0f}MB shared={summary['shared_mb']:.0f}MB per worker, "
+            f"total pss={summary['total_pss_mb']:.0f}MB"
+        )
+    
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--model", default=None, help="Path to .keras model")
+    parser.add_argument("--workers", type=int, default=4, help="Concurrent worker processes")
+    parser.add_argument("--keras", action="store_true", help="Also measure Keras workers (imports TensorFlow)")
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    args = parser.parse_args()
+    
+    results = run(args.model, args.workers, args.keras)
+    if args.json:
+        print(json.dumps(results, indent=2))
@@ -0,0 +1,115 @@
+"""
+Benchmark: NumPy engine vs Keras backend.
+Measures cold start (process start -> first prediction), peak RSS, steady-state
+latency, and the max probability difference between the two backends.
+
+Each backend runs in a fresh subprocess. The NumPy run blocks the tensorflow
+import to prove it serves without TensorFlow.
+
+Usage:
+    python -m benchmarks.bench_numpy_engine [--model PATH.keras] [--repeats N]
+"""
+import argparse
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+from benchmarks.common import ROOT_DIR, dataset_images, resolve_model_path
+
+CHILD_SCRIPT = """
+import sys, time, json, resource
+start = time.perf_counter()
+if {block_tf}:
+    sys.modules["tensorflow"] = None  # simulate a TensorFlow-free install
+sys.path.insert(0, {root!r})
+import numpy as np
+from models.inference import InferencePipeline
+pipeline = InferencePipeline(model_path={model!r})
+assert not pipeline.is_demo_mode(), "model failed to load"
+images = {images!r}
+first = pipeline.predict_batch(images[:1])
+cold_start = time.perf_counter() - start
+timings = []
+for _ in range({repeats}):
+    t = time.perf_counter()
+    pipeline.predict_batch(images[:1])
+    timings.append(time.perf_counter() - t)
+batch = pipeline.preprocessor.preprocess_batch(images)
+probs = pipeline.predictor._predict_probabilities(batch)
+print(json.dumps({{
+    "backend": pipeline.predictor.backend,
+    "cold_start_s": cold_start,
+    "latency_p50_ms": float(np.percentile(timings, 50) * 1000),
+    "peak_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+    "tensorflow_imported": "tensorflow" in sys.modules and sys.modules["tensorflow"] is not None,
+    "probabilities": probs.tolist(),
+}}))
+"""
+
+
+def run_child(model_path: Path, images, repeats: int, block_tf: bool) -> dict:
+    """Run one backend in a fresh interpreter and return its measurements."""
+    script = CHILD_SCRIPT.format(
+        block_tf=block_tf,
+        root=str(ROOT_DIR),
+        model=str(model_path),
+        images=[str(p) for p in images],
+        repeats=repeats
+    )
+    output = subprocess.run(
+        [sys.executable, "-c", script],
+        check=True, capture_output=True, text=True
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def run(model_path: str = None, repeats: int = 10, num_images: int = 4) -> dict:
+    """
+    Run the backend comparison.
+    
+    Args:
+        model_path: Path to .keras model (random model if missing)
+        repeats: Timed single-image predictions per backend
+        num_images: Dataset images used for the output comparison
+        
+    Returns:
+        Dictionary with per-backend measurements and max probability difference
+    """
+    keras_path = resolve_model_path(model_path)
+    npz_path = keras_path.with_suffix(".npz")
+    if not npz_path.exists():
+        from tensorflow import keras
+        from models.numpy_engine import export_weights
+        export_weights(keras.models.load_model(str(keras_path)), npz_path)
+    
+    images = dataset_images(limit=num_images)
+    keras_result = run_child(keras_path, images, repeats, block_tf=False)
+    numpy_result = run_child(npz_path, images, repeats, block_tf=True)
+    
+    import numpy as np
+    max_diff = float(np.abs(
+        np.array(keras_result.pop("probabilities")) - np.array(numpy_result.pop("probabilities"))
+    ).max())
+    
+    for result in (keras_result, numpy_result):
+        print(
+            f"{result['backend']:>6}: cold_start={result['cold_start_s']:.2f}s "
+            f"p50={result['latency_p50_ms']:.1f}ms peak_rss={result['peak_rss_mb']:.0f}MB "
+            f"tensorflow_imported={result['tensorflow_imported']}"
+        )
+    print(f"max |p_keras - p_numpy| = {max_diff:.2e}")
+    
+    return {"keras": keras_result, "numpy": numpy_result, "max_abs_diff": max_diff}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--model", default=None, help="Path to .keras model")
+    parser.add_argument("--repeats", type=int, default=10)
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    args = parser.parse_args()
+    
+    results = run(args.model, args.repeats)
+    if args.json:
+        print(json.dumps(results, indent=2))
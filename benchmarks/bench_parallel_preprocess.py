@@ -0,0 +1,85 @@
+"""
+Benchmark: preprocessing throughput vs worker count.
+Measures images/sec for the threaded preprocessing stage alone and for
+end-to-end InferencePipeline.predict_stream on dataset_alat_tulis.
+
+Usage:
+    python -m benchmarks.bench_parallel_preprocess [--model PATH] [--workers 1 2 4] [--batch-size N]
+"""
+import argparse
+import json
+import os
+import time
+
+from benchmarks.common import dataset_images, resolve_model_path
+
+from models.inference import InferencePipeline
+from models.parallel import ParallelPreprocessor
+
+
+def default_worker_counts() -> list:
+    """Powers of two up to the number of cores (at least 1 and 2)."""
+    counts = [1, 2]
+    while counts[-1] * 2 <= (os.cpu_count() or 1):
+        counts.append(counts[-1] * 2)
+    return counts
+
+
+def run(model_path: str = None, workers: list = None, batch_size: int = 16, limit: int = None) -> dict:
+    """
+    Run the throughput benchmark for each worker count.
+    
+    Args:
+        model_path: Path to model (random model if missing)
+        workers: Worker counts to compare
+        batch_size: Images per batch
+        limit: Maximum number of dataset images
+        
+    Returns:
+        Dictionary keyed by worker count with preprocess-only and end-to-end images/sec
+    """
+    images = dataset_images(limit=limit)
+    pipeline = InferencePipeline(model_path=str(resolve_model_path(model_path)), cache_size=0)
+    workers = workers or default_worker_counts()
+    
+    # Warm up the forward pass and the OS file cache
+    list(pipeline.predict_stream(images[:batch_size], batch_size=batch_size))
+    
+    print(f"{len(images)} images, batch size {batch_size}, {os.cpu_count()} cores")
+    results = {}
+    for num_workers in workers:
+        stage = ParallelPreprocessor(pipeline.preprocessor, num_workers=num_workers)
+        start = time.perf_counter()
+        for _ in stage.iter_batches(images, batch_size):
+            pass
+        preprocess_ips = len(images) / (time.perf_counter() - start)
+        
+        start = time.perf_counter()
+        for _ in pipeline.predict_stream(images, batch_size=batch_size, num_workers=num_workers):
+            pass
+        end_to_end_ips = len(images) / (time.perf_counter() - start)
+        
+        results[num_workers] = {
+            "preprocess_images_per_sec": preprocess_ips,
+            "end_to_end_images_per_sec": end_to_end_ips
+        }
+        print(
+            f"workers={num_workers:<3} preprocess {preprocess_ips:7.1f} img/s  "
+            f"end-to-end {end_to_end_ips:7.1f} img/s"
+        )
+    
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--model", default=None, help="Path to model file")
+    parser.add_argument("--workers", type=int, nargs="+", default=None, help="Worker counts to compare")
+    parser.add_argument("--batch-size", type=int, default=16, help="Images per batch")
+    parser.add_argument("--limit", type=int, default=None, help="Maximum number of images")
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    args = parser.parse_args()
+    
+    results = run(args.model, args.workers, args.batch_size, args.limit)
+    if args.json:
+        print(json.dumps(results, indent=2))
@@ -0,0 +1,108 @@
+"""
+Benchmark: per-image allocations in preprocessing.
+Compares the allocating path (float32 array per image, then copied into the
+batch) with preprocess_into writing into a reused uint8 buffer, using
+tracemalloc for Python/NumPy heap allocations.
+
+Usage:
+    python -m benchmarks.bench_preprocess_alloc [--limit N] [--batch-size N]
+"""
+import argparse
+import json
+import time
+import tracemalloc
+
+import numpy as np
+
+from benchmarks.common import dataset_images
+
+from models.preprocessing import ImagePreprocessor
+
+
+def allocating_batch(preprocessor: ImagePreprocessor, sources) -> np.ndarray:
+    """Previous preprocessing path: one float32 array per image, then stacked."""
+    return np.concatenate([
+        np.expand_dims(preprocessor.normalize_image(preprocessor._load_resized(source)), axis=0)
+        for source in sources
+    ])
+
+
+def buffered_batch(preprocessor: ImagePreprocessor, sources) -> np.ndarray:
+    """preprocess_into a reused per-thread uint8 buffer."""
+    buffer = preprocessor.get_batch_buffer(len(sources), np.uint8)
+    return preprocessor.preprocess_into(sources, buffer)
+
+
+def measure(fn, preprocessor: ImagePreprocessor, batches) -> dict:
+    """
+    Time fn over all batches and trace the heap allocated while it runs.
+    
+    Args:
+        fn: Batch preprocessing function
+        preprocessor: Shared ImagePreprocessor
+        batches: List of source lists
+    
+    Returns:
+        Dictionary with latency and peak traced heap growth per image
+    """
+    # Warm-up so one-time buffers are not counted
+    fn(preprocessor, batches[0])
+    
+    num_images = sum(len(batch) for batch in batches)
+    peaks = []
+    elapsed = 0.0
+    tracemalloc.start()
+    for batch in batches:
+        baseline, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        start = time.perf_counter()
+        fn(preprocessor, batch)
+        elapsed += time.perf_counter() - start
+        _, peak = tracemalloc.get_traced_memory()
+        peaks.append((peak - baseline) / len(batch))
+    tracemalloc.stop()
+    
+    return {
+        "latency_ms": elapsed * 1000 / num_images,
+        "peak_bytes_per_image": float(np.max(peaks))
+    }
+
+
+def run(limit: int = 64, batch_size: int = 8, input_size=(300, 300)) -> dict:
+    """
+    Run the allocation benchmark over dataset_alat_tulis.
+    
+    Args:
+        limit: Maximum number of dataset images
+        batch_size: Images per preprocessing batch
+        input_size: Target size (width, height)
+    
+    Returns:
+        Dictionary of results for the allocating and buffered paths
+    """
+    encoded = [path.read_bytes() for path in dataset_images(limit=limit)]
+    batches = [encoded[i:i + batch_size] for i in range(0, len(encoded), batch_size)]
+    preprocessor = ImagePreprocessor(input_size=input_size, normalize=False)
+    
+    results = {
+        "allocating": measure(allocating_batch, preprocessor, batches),
+        "buffered": measure(buffered_batch, preprocessor, batches)
+    }
+    for name, result in results.items():
+        print(
+            f"{name:>10}: {result['latency_ms']:6.2f}ms/img  "
+            f"peak traced heap {result['peak_bytes_per_image'] / 1024:8.1f}KB/img"
+        )
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--limit", type=int, default=64, help="Maximum number of images")
+    parser.add_argument("--batch-size", type=int, default=8, help="Images per batch")
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    args = parser.parse_args()
+    
+    results = run(args.limit, args.batch_size)
+    if args.json:
+        print(json.dumps(results, indent=2))
@@ -0,0 +1,101 @@
+"""
+Benchmark: resampling filters vs the training-time resize.
+For every filter in ImagePreprocessor.RESAMPLE_FILTERS, measures preprocessing
+latency, pixel error and top-1 agreement against the resize used by
+image_dataset_from_directory during training (tf.image.resize, bilinear,
+no antialiasing).
+
+Usage:
+    python -m benchmarks.bench_resample [--model PATH] [--limit N]
+"""
+import argparse
+import json
+import time
+
+import numpy as np
+
+from benchmarks.common import dataset_images, resolve_model_path
+
+from models.preprocessing import ImagePreprocessor
+from models.cnn_model import ModelPredictor
+
+
+def training_resize(paths, input_size) -> np.ndarray:
+    """
+    Reproduce the training-time decode and resize.
+    
+    Args:
+        paths: Image paths
+        input_size: Target size (width, height)
+    
+    Returns:
+        Float32 array with shape (N, height, width, 3)
+    """
+    import tensorflow as tf
+    
+    width, height = input_size
+    arrays = []
+    for path in paths:
+        image = tf.io.decode_image(tf.io.read_file(str(path)), channels=3, expand_animations=False)
+        arrays.append(tf.image.resize(image, (height, width), method="bilinear").numpy())
+    return np.stack(arrays).astype(np.float32)
+
+
+def predict_top1(predictor: ModelPredictor, batch: np.ndarray, batch_size: int = 16) -> np.ndarray:
+    """Top-1 class index for every image in batch."""
+    return np.concatenate([
+        predictor._predict_probabilities(batch[i:i + batch_size]).argmax(axis=1)
+        for i in range(0, len(batch), batch_size)
+    ])
+
+
+def run(model_path: str = None, limit: int = None, input_size=(300, 300)) -> dict:
+    """
+    Run the resampling benchmark over dataset_alat_tulis.
+    
+    Args:
+        model_path: Path to model (random model if missing)
+        limit: Maximum number of dataset images
+        input_size: Target size (width, height)
+    
+    Returns:
+        Dictionary of per-filter latency, pixel error and top-1 agreement
+    """
+    images = dataset_images(limit=limit)
+    encoded = [path.read_bytes() for path in images]
+    predictor = ModelPredictor(model_path=str(resolve_model_path(model_path)))
+    
+    reference = training_resize(images, input_size)
+    reference_top1 = predict_top1(predictor, reference)
+    
+    results = {}
+    for name in ImagePreprocessor.RESAMPLE_FILTERS:
+        preprocessor = ImagePreprocessor(input_size=input_size, normalize=False, resample=name)
+        
+        start = time.perf_counter()
+        batch = preprocessor.preprocess_batch(encoded)
+        latency_ms = (time.perf_counter() - start) * 1000 / len(encoded)
+        
+        results[name] = {
+            "latency_ms": latency_ms,
+            "pixel_mae": float(np.abs(batch - reference).mean()),
+            "top1_agreement": float((predict_top1(predictor, batch) == reference_top1).mean())
+        }
+        print(
+            f"{name:>9}: {latency_ms:6.2f}ms/img  pixel MAE vs training={results[name]['pixel_mae']:6.2f}  "
+            f"top-1 agreement={results[name]['top1_agreement']:.2%}"
+        )
+    
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--model", default=None, help="Path to model file")
+    parser.add_argument("--limit", type=int, default=None, help="Maximum number of images")
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    args = parser.parse_args()
+    
+    results = run(args.model, args.limit)
+    if args.json:
+        print(json.dumps(results, indent=2))
@@ -0,0 +1,110 @@
+"""
+Benchmark: epoch time of the training modes on dataset_alat_tulis.
+Trains the same model from the same seed in float32, float32 + XLA,
+mixed_bfloat16 and mixed_bfloat16 + XLA, each in a fresh interpreter
+(thread pools and dtype policies are process-wide), and reports the first
+epoch (includes tracing/compilation), the median later epoch and the best
+validation accuracy.
+
+Usage:
+    python -m benchmarks.bench_training_modes [--epochs N] [--threads N]
+"""
+import argparse
+import json
+import subprocess
+import sys
+import time
+
+import numpy as np
+
+from benchmarks.common import DATASET_DIR, ROOT_DIR
+
+MODES = {
+    "float32": {"precision": "float32", "jit_compile": False},
+    "float32+xla": {"precision": "float32", "jit_compile": True},
+    "mixed_bfloat16": {"precision": "mixed_bfloat16", "jit_compile": False},
+    "mixed_bfloat16+xla": {"precision": "mixed_bfloat16", "jit_compile": True},
+}
+
+
+def train_once(mode: str, epochs: int, threads: int, img_size: int) -> dict:
+    """Train one mode in this process and time every epoch."""
+    import tensorflow as tf
+    from models.train_model import ATKModelTrainer, DatasetManager, TrainingConfig, configure_threads
+    
+    config = TrainingConfig(
+        img_height=img_size, img_width=img_size, epochs=epochs, early_stopping_patience=epochs,
+        intra_op_threads=threads, inter_op_threads=min(threads, 2), **MODES[mode]
+    )
+    configure_threads(config)
+    tf.keras.utils.set_random_seed(config.seed)
+    train_ds, val_ds, class_names = DatasetManager(str(DATASET_DIR)).load_dataset(config, use_cache=True)
+    
+    epoch_starts, epoch_times = [], []
+    
+    class EpochTimer(tf.keras.callbacks.Callback):
+        def on_epoch_begin(self, epoch, logs=None):
+            epoch_starts.append(time.perf_counter())
+        
+        def on_epoch_end(self, epoch, logs=None):
+            epoch_times.append(time.perf_counter() - epoch_starts[-1])
+    
+    trainer = ATKModelTrainer(config)
+    trainer.build_model(len(class_names))
+    history = trainer.model.fit(train_ds, validation_data=val_ds, epochs=epochs, callbacks=[EpochTimer()], verbose=0)
+    return {
+        "precision": trainer.precision,
+        "jit_compile": config.jit_compile,
+        "epoch_times_sec": epoch_times,
+        "first_epoch_sec": epoch_times[0],
+        "steady_epoch_sec": float(np.median(epoch_times[1:])) if len(epoch_times) > 1 else epoch_times[0],
+        "best_val_accuracy": float(max(history.history["val_accuracy"])),
+    }
+
+
+def run(epochs: int = 3, threads: int = 0, img_size: int = 300, modes=tuple(MODES)) -> dict:
+    """
+    Train every mode in its own interpreter.
+    
+    Args:
+        epochs: Epochs per mode
+        threads: Intra-op threads (0 = TensorFlow default)
+        img_size: Square input size
+        modes: Mode names from MODES
+    
+    Returns:
+        Mapping of mode name to epoch timings and best validation accuracy
+    """
+    results = {}
+    for mode in modes:
+        output = subprocess.run(
+            [sys.executable, "-m", "benchmarks.bench_training_modes", "--child", mode,
+             "--epochs", str(epochs), "--threads", str(threads), "--img-size", str(img_size)],
+            cwd=str(ROOT_DIR), check=True, capture_output=True, text=True
+        ).stdout
+        results[mode] = json.loads(output.strip().splitlines()[-1])
+        r = results[mode]
+        print(
+            f"{mode:<20} first epoch {r['first_epoch_sec']:7.2f}s  steady epoch {r['steady_epoch_sec']:7.2f}s  "
+            f"best val_acc {r['best_val_accuracy']:.3f}"
+        )
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--epochs", type=int, default=3)
+    parser.add_argument("--threads", type=int, default=0, help="Intra-op threads (0 = default)")
+    parser.add_argument("--img-size", type=int, default=300)
+    parser.add_argument("--modes", nargs="+", default=list(MODES), choices=list(MODES))
+    parser.add_argument("--child", default=None, help=argparse.SUPPRESS)
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    args = parser.parse_args()
+    
+    if args.child:
+        print(json.dumps(train_once(args.child, args.epochs, args.threads, args.img_size)))
+        sys.exit(0)
+    
+    results = run(args.epochs, args.threads, args.img_size, tuple(args.modes))
+    if args.json:
+        print(json.dumps(results, indent=2))
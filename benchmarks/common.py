@@ -0,0 +1,94 @@
+"""
+Shared helpers for ATK Classifier benchmarks.
+Provides dataset image discovery, model fixtures, and timing utilities.
+"""
+import sys
+import time
+import tempfile
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+# Add parent directory to path for imports
+ROOT_DIR = Path(__file__).parent.parent
+sys.path.insert(0, str(ROOT_DIR))
+
+import numpy as np
+
+from models.preprocessing import IMAGE_EXTENSIONS
+
+DATASET_DIR = ROOT_DIR / "dataset_alat_tulis"
+DEFAULT_MODEL_PATH = ROOT_DIR / "models" / "best_model.keras"
+
+
+def dataset_images(dataset_dir: Path = DATASET_DIR, limit: Optional[int] = None) -> List[Path]:
+    """
+    List dataset images in a stable order.
+    
+    Args:
+        dataset_dir: Root directory with one sub-directory per class
+        limit: Maximum number of images to return
+        
+    Returns:
+        Sorted list of image paths
+    """
+    paths = sorted(
+        p for p in Path(dataset_dir).rglob("*")
+        if p.is_file() and p.suffix.lower() in IMAGE_EXTENSIONS
+    )
+    return paths[:limit] if limit else paths
+
+
+def resolve_model_path(model_path: Optional[str] = None) -> Path:
+    """
+    Return a usable .keras model path, building a random one when no weights exist.
+    
+    The randomly initialized model has the same architecture and cost as the
+    trained one, so it is fine for latency measurements (not for accuracy).
+    
+    Args:
+        model_path: Explicit model path, defaults to models/best_model.keras
+        
+    Returns:
+        Path to an existing model file
+    """
+    path = Path(model_path) if model_path else DEFAULT_MODEL_PATH
+    if path.exists():
+        return path
+    
+    from models.cnn_model import ATKClassifier
+    
+    random_path = Path(tempfile.gettempdir()) / "atk_benchmark_random_model.keras"
+    if not random_path.exists():
+        print(f"No weights at {path}, using randomly initialized model: {random_path}")
+        ATKClassifier.build_model().save(str(random_path))
+    return random_path
+
+
+def time_call(fn: Callable[[], object], repeats: int = 20, warmup: int = 2) -> Dict[str, float]:
+    """
+    Time repeated calls of a function.
+    
+    Args:
+        fn: Zero-argument function to time
+        repeats: Number of timed calls
+        warmup: Number of untimed calls made first
+        
+    Returns:
+        Dictionary with mean/p50/p95/min latency in milliseconds
+    """
+    for _ in range(warmup):
+        fn()
+    
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - start) * 1000)
+    
+    timings = np.array(timings)
+    return {
+        "mean_ms": float(timings.mean()),
+        "p50_ms": float(np.percentile(timings, 50)),
+        "p95_ms": float(np.percentile(timings, 95)),
+        "min_ms": float(timings.min()),
+    }
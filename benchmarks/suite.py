@@ -0,0 +1,278 @@
+"""
+Benchmark suite: end-to-end inference speed over dataset_alat_tulis.
+Measures single-image latency, batch throughput at several batch sizes,
+preprocessing throughput per image format, and cold start / peak RSS, writes
+the results as JSON, and compares them against a stored baseline.
+
+Runs fully offline: without trained weights it uses a randomly initialized
+model from ATKClassifier.build_model (same cost as the trained one), and
+``--demo`` skips the model entirely (preprocessing-only numbers).
+
+Timings are best-of-N, which is far less sensitive to scheduling noise
+than means or medians. Metric names end in their unit. Lower is better for ``_ms``, ``_s`` and
+``_mb``; higher is better for ``_per_sec``. A metric regresses when it is
+worse than the baseline by more than ``--tolerance`` (relative).
+
+Usage:
+    python -m benchmarks.suite --output results.json
+    python -m benchmarks.suite --save-baseline              # store benchmarks/baseline.json
+    python -m benchmarks.suite --baseline benchmarks/baseline.json --tolerance 0.25
+"""
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+from collections import defaultdict
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from benchmarks.common import DEFAULT_MODEL_PATH, ROOT_DIR, dataset_images, resolve_model_path, time_call
+
+from models.inference import InferencePipeline
+from models.preprocessing import ImagePreprocessor
+
+DEFAULT_BASELINE = ROOT_DIR / "benchmarks" / "baseline.json"
+
+# Serving configuration benchmarked (matches app.config defaults)
+INPUT_SIZE = (300, 300)
+FAST_DECODE = True
+RESAMPLE = "nearest"
+
+COLD_START_SCRIPT = """
+import sys, time, json, resource
+start = time.perf_counter()
+sys.path.insert(0, {root!r})
+from models.inference import InferencePipeline
+pipeline = InferencePipeline(model_path={model!r}, cache_size=0, fast_decode={fast_decode!r}, resample={resample!r})
+loaded = time.perf_counter() - start
+pipeline.predict({image!r})
+print(json.dumps({{
+    "load_s": loaded,
+    "first_prediction_s": time.perf_counter() - start,
+    "peak_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+}}))
+"""
+
+
+def bench_single_image(pipeline: InferencePipeline, images: List[Path], repeats: int) -> Dict[str, float]:
+    """Latency of one predict() call (decode through result) per image, cache disabled."""
+    # Best of `repeats` per image: scheduling noise only ever adds time
+    timings = [time_call(lambda: pipeline.predict(path), repeats=repeats, warmup=1)["min_ms"] for path in images]
+    return {
+        "single_image/p50_ms": float(np.percentile(timings, 50)),
+        "single_image/p95_ms": float(np.percentile(timings, 95)),
+    }
+
+
+def bench_batch_throughput(
+    pipeline: InferencePipeline,
+    images: List[Path],
+    batch_sizes: List[int],
+    repeats: int
+) -> Dict[str, float]:
+    """Images/sec of predict_batch() at each batch size, cache disabled."""
+    results = {}
+    for batch_size in batch_sizes:
+        batch = (images * (batch_size // len(images) + 1))[:batch_size]
+        stats = time_call(lambda: pipeline.predict_batch(batch), repeats=repeats, warmup=1)
+        results[f"batch_{batch_size}/throughput_per_sec"] = batch_size / (stats["min_ms"] / 1000)
+    return results
+
+
+def bench_preprocess_by_format(images: List[Path], repeats: int) -> Dict[str, float]:
+    """Decode + resize + batch copy throughput per file format."""
+    preprocessor = ImagePreprocessor(input_size=INPUT_SIZE, normalize=False, fast_decode=FAST_DECODE, resample=RESAMPLE)
+    by_format = defaultdict(list)
+    for path in images:
+        by_format[path.suffix.lower().lstrip(".")].append(path)
+    
+    results = {}
+    for image_format, paths in sorted(by_format.items()):
+        buffer = preprocessor.get_batch_buffer(len(paths), np.uint8)
+        stats = time_call(lambda: preprocessor.preprocess_into(paths, buffer), repeats=repeats, warmup=1)
+        results[f"preprocess_{image_format}/throughput_per_sec"] = len(paths) / (stats["min_ms"] / 1000)
+    return results
+
+
+def bench_cold_start(model_path: Optional[Path], image: Path, runs: int) -> Dict[str, float]:
+    """Process start -> first prediction in fresh interpreters (median of runs) and peak RSS."""
+    script = COLD_START_SCRIPT.format(
+        root=str(ROOT_DIR),
+        model=str(model_path) if model_path else None,
+        fast_decode=FAST_DECODE,
+        resample=RESAMPLE,
+        image=str(image)
+    )
+    samples = []
+    for _ in range(runs):
+        output = subprocess.run(
+            [sys.executable, "-c", script],
+            check=True, capture_output=True, text=True
+        ).stdout
+        samples.append(json.loads(output.strip().splitlines()[-1]))
+    return {
+        "cold_start/load_s": float(np.median([s["load_s"] for s in samples])),
+        "cold_start/first_prediction_s": float(np.median([s["first_prediction_s"] for s in samples])),
+        "cold_start/peak_rss_mb": float(np.median([s["peak_rss_mb"] for s in samples])),
+    }
+
+
+def environment(pipeline: InferencePipeline, model_source: str) -> Dict[str, Any]:
+    """Describe the machine and code the numbers were measured on."""
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=str(ROOT_DIR), capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "timestamp": datetime.now().isoformat(),
+        "commit": commit,
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "backend": pipeline.predictor.backend if not pipeline.is_demo_mode() else "demo",
+        "model_source": model_source,
+        "input_size": list(INPUT_SIZE),
+        "fast_decode": FAST_DECODE,
+        "resample": RESAMPLE,
+    }
+
+
+def run(
+    model_path: Optional[str] = None,
+    demo: bool = False,
+    num_images: int = 32,
+    batch_sizes: tuple = (1, 4, 8, 16),
+    repeats: int = 5,
+    cold_start_runs: int = 3
+) -> Dict[str, Any]:
+    """
+    Run the whole suite.
+    
+    Args:
+        model_path: Model file or weight directory (random .keras model if missing)
+        demo: Run without a model (demo predictions)
+        num_images: Dataset images used for latency/throughput
+        batch_sizes: Batch sizes for the throughput measurement
+        repeats: Timed repetitions per throughput measurement (best one counts)
+        cold_start_runs: Fresh interpreters started for the cold-start measurement
+    
+    Returns:
+        Dictionary with 'environment' and flat 'metrics' (name -> value)
+    """
+    if demo:
+        path, model_source = None, "demo"
+    else:
+        path = resolve_model_path(model_path)
+        requested = Path(model_path) if model_path else DEFAULT_MODEL_PATH
+        model_source = str(path) if path == requested else "random"
+    
+    all_images = dataset_images()
+    images = all_images[:num_images]
+    pipeline = InferencePipeline(
+        model_path=str(path) if path else None,
+        input_size=INPUT_SIZE,
+        cache_size=0,
+        fast_decode=FAST_DECODE,
+        resample=RESAMPLE
+    )
+    
+    metrics: Dict[str, float] = {}
+    metrics.update(bench_single_image(pipeline, images, max(1, repeats // 2)))
+    metrics.update(bench_batch_throughput(pipeline, images, list(batch_sizes), repeats))
+    metrics.update(bench_preprocess_by_format(all_images, repeats))
+    metrics.update(bench_cold_start(path, images[0], cold_start_runs))
+    
+    return {"environment": environment(pipeline, model_source), "metrics": metrics}
+
+
+def compare(metrics: Dict[str, float], baseline: Dict[str, float], tolerance: float) -> List[Dict[str, Any]]:
+    """
+    Compare metrics against a baseline.
+    
+    Args:
+        metrics: Current flat metrics
+        baseline: Baseline flat metrics
+        tolerance: Allowed relative slowdown (0.2 = 20%)
+    
+    Returns:
+        One row per shared metric with baseline, current, relative slowdown
+        (positive = worse, negative = faster) and whether it regressed
+    """
+    rows = []
+    for name in sorted(set(metrics) & set(baseline)):
+        current, reference = metrics[name], baseline[name]
+        if not reference:
+            continue
+        higher_is_better = name.endswith("_per_sec")
+        change = (reference - current) / reference if higher_is_better else (current - reference) / reference
+        rows.append({
+            "metric": name,
+            "baseline": reference,
+            "current": current,
+            "change": change,
+            "regressed": change > tolerance,
+        })
+    return rows
+
+
+def print_comparison(rows: List[Dict[str, Any]]) -> None:
+    """Print the baseline comparison table."""
+    for row in rows:
+        flag = "REGRESSED" if row["regressed"] else "ok"
+        print(
+            f"{row['metric']:<40} {row['baseline']:>10.2f} -> {row['current']:>10.2f} "
+            f"slowdown {row['change']:+7.1%}  {flag}"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--model", default=None, help="Model file (random .keras model if missing)")
+    parser.add_argument("--demo", action="store_true", help="Benchmark without a model (demo mode)")
+    parser.add_argument("--images", type=int, default=32, help="Dataset images for latency/throughput")
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[1, 4, 8, 16])
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--cold-start-runs", type=int, default=3)
+    parser.add_argument("--output", default=None, help="Write results JSON here")
+    parser.add_argument("--baseline", default=str(DEFAULT_BASELINE), help="Baseline JSON to compare against")
+    parser.add_argument("--save-baseline", action="store_true", help="Store these results as the baseline")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Allowed relative slowdown per metric")
+    args = parser.parse_args()
+    
+    results = run(args.model, args.demo, args.images, tuple(args.batch_sizes), args.repeats, args.cold_start_runs)
+    for name, value in results["metrics"].items():
+        print(f"{name:<40} {value:10.2f}")
+    
+    if args.output:
+        Path(args.output).write_text(json.dumps(results, indent=2))
+        print(f"Results saved to: {args.output}")
+    
+    if args.save_baseline:
+        Path(args.baseline).write_text(json.dumps(results, indent=2))
+        print(f"Baseline saved to: {args.baseline}")
+        sys.exit(0)
+    
+    baseline_path = Path(args.baseline)
+    if not baseline_path.exists():
+        print(f"No baseline at {baseline_path}; run with --save-baseline to create one")
+        sys.exit(0)
+    
+    baseline = json.loads(baseline_path.read_text())
+    if baseline["environment"].get("backend") != results["environment"]["backend"]:
+        print(f"Warning: baseline backend {baseline['environment'].get('backend')} differs from {results['environment']['backend']}")
+    rows = compare(results["metrics"], baseline["metrics"], args.tolerance)
+    print(f"\nCompared against {baseline_path} (commit {baseline['environment'].get('commit')}):")
+    print_comparison(rows)
+    regressions = [row["metric"] for row in rows if row["regressed"]]
+    if regressions:
+        print(f"{len(regressions)} metric(s) regressed by more than {args.tolerance:.0%}: {', '.join(regressions)}")
+    sys.exit(1 if regressions else 0)
@@ -2,12 +2,17 @@
 Download model file from cloud storage.
 Supports Google Drive and direct URLs.
 """
-import os
 import sys
+import json
+import argparse
 from pathlib import Path
+from typing import Optional
+
+from models.provisioning import ModelProvisioner, fetch, file_sha256, read_expected_sha256
 
 MODEL_DIR = Path("models")
 MODEL_FILE = MODEL_DIR / "best_model.keras"
+MIN_SIZE_BYTES = 50 * 1024 * 1024  # Valid model should be > 50MB
 
 # Google Drive file ID - REPLACE WITH YOUR ACTUAL FILE ID
 # To get file ID: Share file > Copy link > Extract ID from URL
@@ -16,41 +21,14 @@ MODEL_FILE = MODEL_DIR / "best_model.keras"
 GDRIVE_FILE_ID = "1pmZlycIZl6B6EMH1V31NNI29w6128DcV"
 
 
-def download_from_gdrive(file_id: str, destination: Path) -> bool:
-    """Download file from Google Drive."""
-    try:
-        import gdown
-        url = f"https://drive.google.com/uc?id={file_id}"
-        gdown.download(url, str(destination), quiet=False)
-        return destination.exists()
-    except ImportError:
-        print("Installing gdown...")
-        os.system(f"{sys.executable} -m pip install gdown")
-        import gdown
-        url = f"https://drive.google.com/uc?id={file_id}"
-        gdown.download(url, str(destination), quiet=False)
-        return destination.exists()
-    except Exception as e:
-        print(f"Error: {e}")
-        return False
+def print_progress(bytes_done: int, bytes_total: Optional[int]) -> None:
+    """Print download progress on one line."""
+    if bytes_total:
+        print(f"\r   {bytes_done / 1024 / 1024:.1f}/{bytes_total / 1024 / 1024:.1f}MB", end="", flush=True)
 
 
 def download_model() -> bool:
     """Download model file."""
-    MODEL_DIR.mkdir(exist_ok=True)
-    
-    # Check if model exists and is valid
-    if MODEL_FILE.exists():
-        size_mb = MODEL_FILE.stat().st_size / 1024 / 1024
-        if size_mb > 50:  # Valid model should be > 50MB
-            print(f"✅ Model exists: {size_mb:.1f}MB")
-            return True
-        else:
-            print(f"⚠️ Model file too small ({size_mb:.1f}MB), re-downloading...")
-            MODEL_FILE.unlink()
-    
-    print("📥 Downloading model from Google Drive...")
-    
     if GDRIVE_FILE_ID == "YOUR_GOOGLE_DRIVE_FILE_ID":
         print("❌ Please set GDRIVE_FILE_ID in download_model.py")
         print("   1. Upload best_model.keras to Google Drive")
@@ -59,14 +37,64 @@ def download_model() -> bool:
         print("   4. Replace YOUR_GOOGLE_DRIVE_FILE_ID with actual ID")
         return False
     
-    return download_from_gdrive(GDRIVE_FILE_ID, MODEL_FILE)
+    # A recorded checksum replaces the size check (GAP-head models are ~0.5MB)
+    expected_sha256 = read_expected_sha256(MODEL_FILE)
+    provisioner = ModelProvisioner(
+        f"https://drive.google.com/uc?id={GDRIVE_FILE_ID}",
+        MODEL_FILE,
+        min_size_bytes=0 if expected_sha256 else MIN_SIZE_BYTES,
+        expected_sha256=expected_sha256,
+        fetcher=lambda source, destination, _progress, resume=False: fetch(
+            source, destination, print_progress, resume=resume
+        )
+    )
+    
+    # Check if model exists and is valid
+    if provisioner.is_present():
+        print(f"✅ Model exists: {MODEL_FILE.stat().st_size / 1024 / 1024:.1f}MB")
+        return True
+    
+    print("📥 Downloading model...")
+    status = provisioner.provision()
+    print()
+    if status.state != "ready":
+        print(f"Error: {status.error}")
+    return status.state == "ready"
+
+
+def record_sha256() -> str:
+    """
+    Pin the downloaded model's checksum in its sidecar metadata.
+    
+    The shipped best_model.json has no 'sha256', so downloads of the
+    published model are only size-checked. Run this once on a model you
+    trust and commit the metadata; later downloads are then verified.
+    
+    Returns:
+        The recorded hex digest
+    """
+    metadata_path = MODEL_FILE.with_suffix(".json")
+    metadata = json.loads(metadata_path.read_text()) if metadata_path.exists() else {}
+    metadata["sha256"] = file_sha256(MODEL_FILE)
+    with open(metadata_path, "w") as f:
+        json.dump(metadata, f, indent=2)
+    return metadata["sha256"]
 
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Download the ATK Classifier model")
+    parser.add_argument(
+        "--record-sha256", action="store_true",
+        help="Write the downloaded model's SHA-256 into models/best_model.json"
+    )
+    args = parser.parse_args()
+    
     print("🤖 ATK Classifier - Model Downloader")
     print("=" * 50)
     
     if download_model():
+        if args.record_sha256:
+            print(f"🔒 sha256 recorded: {record_sha256()}")
         print("\n✨ Model ready!")
         print("   Run: streamlit run streamlit_app.py")
     else:
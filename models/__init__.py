@@ -2,6 +2,9 @@
 from models.preprocessing import ImagePreprocessor, ImageValidator
 from models.cnn_model import ATKClassifier, ModelPredictor, PredictionResult
 from models.inference import InferencePipeline
+from models.batching import MicroBatcher
+from models.parallel import ParallelPreprocessor
+from models.metrics import MetricsRegistry, metrics
 
 __all__ = [
     "ImagePreprocessor",
@@ -10,4 +13,8 @@ __all__ = [
     "ModelPredictor",
     "PredictionResult",
     "InferencePipeline",
+    "MicroBatcher",
+    "ParallelPreprocessor",
+    "MetricsRegistry",
+    "metrics",
 ]
@@ -0,0 +1,252 @@
+"""
+Micro-batching module for ATK Classifier.
+Coalesces concurrent prediction requests into batched forward passes.
+"""
+from typing import Any, Dict, List, Optional
+from concurrent.futures import Future
+from collections import deque
+from dataclasses import dataclass, field, replace
+import threading
+import queue
+import time
+
+import numpy as np
+
+from models.cnn_model import PredictionResult
+
+
+@dataclass
+class _PendingRequest:
+    """A single prediction request waiting to be batched."""
+    image_source: Any
+    top_k: int
+    future: Future = field(default_factory=Future)
+    submitted_at: float = field(default_factory=time.perf_counter)
+
+
+class MicroBatcher:
+    """
+    Request-coalescing scheduler in front of an InferencePipeline.
+    
+    Incoming predict calls are held for up to ``max_wait_ms`` (or until
+    ``max_batch_size`` requests are queued) and then run as one batch
+    through ``pipeline.predict_batch``. Each caller gets its own result
+    back through a Future.
+    """
+    
+    def __init__(
+        self,
+        pipeline: Any,
+        max_batch_size: int = 8,
+        max_wait_ms: float = 5.0,
+        stats_window: int = 1000
+    ):
+        """
+        Initialize the batcher and start its worker thread.
+        
+        Args:
+            pipeline: Object exposing predict_batch(sources, top_k) (e.g. InferencePipeline)
+            max_batch_size: Maximum number of requests per forward pass
+            max_wait_ms: Maximum time to hold the first request of a batch, in milliseconds
+            stats_window: Number of recent requests kept for latency percentiles
+        """
+        if max_batch_size < 1:
+            raise ValueError("max_batch_size must be at least 1")
+        if max_wait_ms < 0:
+            raise ValueError("max_wait_ms must be non-negative")
+        
+        self.pipeline = pipeline
+        self.max_batch_size = max_batch_size
+        self.max_wait_ms = max_wait_ms
+        
+        self._queue: "queue.Queue[Optional[_PendingRequest]]" = queue.Queue()
+        self._stats_lock = threading.Lock()
+        self._latencies = deque(maxlen=stats_window)
+        self._batch_sizes = deque(maxlen=stats_window)
+        self._total_requests = 0
+        self._total_batches = 0
+        self._started_at = time.perf_counter()
+        # Guards _closed so no request can be queued behind the stop sentinel
+        self._close_lock = threading.Lock()
+        self._closed = False
+        
+        self._worker = threading.Thread(target=self._run, name="MicroBatcher", daemon=True)
+        self._worker.start()
+    
+    def submit(self, image_source: Any, top_k: int = 3) -> Future:
+        """
+        Queue an image for prediction.
+        
+        Args:
+            image_source: Image source (path, bytes, BytesIO, or PIL Image)
+            top_k: Number of top predictions to return
+        
+        Returns:
+            Future resolving to a PredictionResult
+        """
+        request = _PendingRequest(image_source=image_source, top_k=top_k)
+        with self._close_lock:
+            if self._closed:
+                raise RuntimeError("MicroBatcher is closed")
+            self._queue.put(request)
+        return request.future
+    
+    def predict(self, image_source: Any, top_k: int = 3, timeout: Optional[float] = None) -> PredictionResult:
+        """
+        Queue an image for prediction and wait for its result.
+        
+        Args:
+            image_source: Image source (path, bytes, BytesIO, or PIL Image)
+            top_k: Number of top predictions to return
+            timeout: Maximum seconds to wait for the result
+        
+        Returns:
+            PredictionResult for the image
+        """
+        return self.submit(image_source, top_k=top_k).result(timeout=timeout)
+    
+    def close(self, timeout: Optional[float] = None) -> None:
+        """
+        Stop accepting requests and stop the worker thread.
+        
+        Requests queued before close() are still predicted; any request the
+        worker can no longer serve has its future failed with RuntimeError.
+        
+        Args:
+            timeout: Maximum seconds to wait for the worker to finish
+        """
+        with self._close_lock:
+            if self._closed:
+                return
+            self._closed = True
+            self._queue.put(None)
+        self._worker.join(timeout=timeout)
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get throughput and latency statistics.
+        
+        Returns:
+            Dictionary with request/batch counts, mean batch size,
+            throughput (requests/sec) and p50/p99 latency in milliseconds
+        """
+        with self._stats_lock:
+            latencies = np.array(self._latencies, dtype=np.float64)
+            batch_sizes = list(self._batch_sizes)
+            total_requests = self._total_requests
+            total_batches = self._total_batches
+        
+        elapsed = time.perf_counter() - self._started_at
+        stats = {
+            "requests": total_requests,
+            "batches": total_batches,
+            "mean_batch_size": float(np.mean(batch_sizes)) if batch_sizes else 0.0,
+            "throughput_rps": total_requests / elapsed if elapsed > 0 else 0.0,
+            "latency_p50_ms": None,
+            "latency_p99_ms": None,
+            "max_batch_size": self.max_batch_size,
+            "max_wait_ms": self.max_wait_ms,
+        }
+        
+        if latencies.size:
+            stats["latency_p50_ms"] = float(np.percentile(latencies, 50) * 1000)
+            stats["latency_p99_ms"] = float(np.percentile(latencies, 99) * 1000)
+        
+        return stats
+    
+    def _collect_batch(self, first: _PendingRequest) -> List[_PendingRequest]:
+        """Collect requests until the batch is full or the wait window expires."""
+        batch = [first]
+        deadline = time.perf_counter() + self.max_wait_ms / 1000.0
+        
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                break
+            try:
+                request = self._queue.get(timeout=remaining)
+            except queue.Empty:
+                break
+            if request is None:
+                # Re-queue the sentinel so the main loop stops after this batch
+                self._queue.put(None)
+                break
+            batch.append(request)
+        
+        return batch
+    
+    def _run(self) -> None:
+        """Worker loop: wait for requests, coalesce, predict, resolve futures."""
+        while True:
+            first = self._queue.get()
+            if first is None:
+                break
+            
+            # Claim each future; requests the caller cancelled are dropped
+            batch = [
+                request for request in self._collect_batch(first)
+                if request.future.set_running_or_notify_cancel()
+            ]
+            if not batch:
+                continue
+            try:
+                self._process_batch(batch)
+            except Exception as e:
+                self._fail(batch, e)
+        
+        # Nothing is queued after the sentinel, but never leave a caller waiting
+        leftovers = []
+        while True:
+            try:
+                request = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if request is not None and request.future.set_running_or_notify_cancel():
+                leftovers.append(request)
+        self._fail(leftovers, RuntimeError("MicroBatcher is closed"))
+    
+    @staticmethod
+    def _fail(batch: List[_PendingRequest], error: Exception) -> None:
+        """Fail every request in batch whose future has no outcome yet."""
+        for request in batch:
+            if not request.future.done():
+                request.future.set_exception(error)
+    
+    def _process_batch(self, batch: List[_PendingRequest]) -> None:
+        """Run one forward pass for the batch and deliver each result."""
+        # One pass with the largest top_k, trimmed per request afterwards
+        top_k = max(request.top_k for request in batch)
+        
+        try:
+            results = self.pipeline.predict_batch(
+                [request.image_source for request in batch],
+                top_k=top_k
+            )
+            if len(results) != len(batch):
+                raise RuntimeError(f"Pipeline returned {len(results)} results for {len(batch)} images")
+        except Exception:
+            # Fall back to one-by-one so a single bad image doesn't fail the batch
+            results = []
+            for request in batch:
+                try:
+                    single = self.pipeline.predict_batch([request.image_source], top_k=top_k)
+                    if len(single) != 1:
+                        raise RuntimeError(f"Pipeline returned {len(single)} results for 1 image")
+                    results.append(single[0])
+                except Exception as e:
+                    results.append(e)
+        
+        finished_at = time.perf_counter()
+        for request, result in zip(batch, results):
+            if isinstance(result, Exception):
+                request.future.set_exception(result)
+            else:
+                if len(result.top_predictions) > request.top_k:
+                    result = replace(result, top_predictions=result.top_predictions[:request.top_k])
+                request.future.set_result(result)
+        
+        with self._stats_lock:
+            self._total_requests += len(batch)
+            self._total_batches += 1
+            self._batch_sizes.append(len(batch))
+            self._latencies.extend(finished_at - request.submitted_at for request in batch)
@@ -0,0 +1,369 @@
+"""
+Offline bulk classification for ATK Classifier.
+Streams every image under a directory (or glob) through InferencePipeline in
+batches and writes results incrementally as JSONL or CSV, with a manifest of
+processed files so an interrupted run can resume.
+
+Usage:
+    python -m models.classify dataset_alat_tulis -o results.jsonl
+    python -m models.classify "photos/**/*.jpg" -o results.csv --resume
+"""
+import sys
+import os
+import csv
+import json
+import glob
+import time
+import argparse
+from pathlib import Path
+from typing import Any, Dict, Iterator, Optional, Set, TextIO, Tuple
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from models.inference import InferencePipeline
+from models.cnn_model import PredictionResult
+from models.preprocessing import IMAGE_EXTENSIONS
+
+CSV_FIELDS = ["path", "predicted_class", "confidence", "is_low_confidence", "is_demo", "error"]
+
+
+def iter_image_paths(target: str) -> Iterator[str]:
+    """
+    Lazily yield image paths under a directory tree or matching a glob.
+    
+    Directories are walked in sorted order so reruns visit files in the
+    same order.
+    
+    Args:
+        target: Directory, single image file, or glob pattern ("**" allowed)
+    
+    Yields:
+        Image file paths as strings
+    """
+    if os.path.isdir(target):
+        for root, dirs, files in os.walk(target):
+            dirs.sort()
+            for name in sorted(files):
+                if Path(name).suffix.lower() in IMAGE_EXTENSIONS:
+                    yield os.path.join(root, name)
+    elif os.path.isfile(target):
+        yield target
+    else:
+        for path in glob.iglob(target, recursive=True):
+            if Path(path).suffix.lower() in IMAGE_EXTENSIONS and os.path.isfile(path):
+                yield path
+
+
+def load_manifest(manifest_path: Path) -> Tuple[Set[str], Optional[int]]:
+    """
+    Read the set of already-processed paths and the committed output size.
+    
+    Each line is ``path<TAB>offset``, where offset is the size of the output
+    file once that path's batch was flushed. A trailing line without a newline
+    was cut off mid-write and is ignored.
+    
+    Args:
+        manifest_path: Manifest file (one path per line)
+    
+    Returns:
+        Tuple of (processed paths, committed output size in bytes or None if
+        the manifest records no offsets); (empty set, None) if the manifest
+        does not exist
+    """
+    done: Set[str] = set()
+    offset = None
+    if not manifest_path.exists():
+        return done, offset
+    with open(manifest_path, 'r', encoding='utf-8') as f:
+        for line in f:
+            if not line.endswith('\n') or not line.strip():
+                continue
+            path, sep, size = line[:-1].rpartition('\t')
+            if sep and size.isdigit():
+                done.add(path)
+                offset = int(size)
+            else:
+                done.add(line[:-1])
+    return done, offset
+
+
+def to_record(path: str, result: Any) -> Dict[str, Any]:
+    """
+    Convert a stream result (PredictionResult or Exception) to an output row.
+    
+    Args:
+        path: Image path
+        result: PredictionResult, or the exception raised while loading the image
+    
+    Returns:
+        JSON-serializable dictionary
+    """
+    if isinstance(result, PredictionResult):
+        return {
+            "path": path,
+            "predicted_class": result.predicted_class,
+            "confidence": round(result.confidence, 6),
+            "top_predictions": [
+                {"class": p["class"], "confidence": round(p["confidence"], 6)}
+                for p in result.top_predictions
+            ],
+            "is_low_confidence": result.is_low_confidence,
+            "is_demo": result.is_demo,
+            "error": None
+        }
+    return {
+        "path": path,
+        "predicted_class": None,
+        "confidence": None,
+        "top_predictions": [],
+        "is_low_confidence": None,
+        "is_demo": None,
+        "error": f"{type(result).__name__}: {result}"
+    }
+
+
+class ResultWriter:
+    """Appends result rows to a JSONL or CSV file, flushing once per batch."""
+    
+    def __init__(self, output_path: Path, output_format: str):
+        """
+        Open the output file for appending.
+        
+        Args:
+            output_path: Destination file
+            output_format: 'jsonl' or 'csv'
+        """
+        if output_format not in ("jsonl", "csv"):
+            raise ValueError(f"Unknown output format: {output_format}")
+        
+        self.output_format = output_format
+        is_new = not output_path.exists() or output_path.stat().st_size == 0
+        self._file: TextIO = open(output_path, 'a', encoding='utf-8', newline='')
+        self._csv = None
+        if output_format == "csv":
+            self._csv = csv.DictWriter(self._file, fieldnames=CSV_FIELDS, extrasaction='ignore')
+            if is_new:
+                self._csv.writeheader()
+    
+    def write(self, record: Dict[str, Any]) -> None:
+        """Write one result row."""
+        if self._csv is not None:
+            self._csv.writerow(record)
+        else:
+            self._file.write(json.dumps(record) + "\n")
+    
+    def flush(self) -> int:
+        """
+        Flush buffered rows to disk.
+        
+        Returns:
+            Size of the output file in bytes after the flush
+        """
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        return os.fstat(self._file.fileno()).st_size
+    
+    def close(self) -> None:
+        """Flush and close the output file."""
+        self.flush()
+        self._file.close()
+
+
+def classify(
+    target: str,
+    output_path: str,
+    model_path: str = "models/best_model.keras",
+    output_format: Optional[str] = None,
+    resume: bool = False,
+    batch_size: int = 16,
+    num_workers: Optional[int] = None,
+    top_k: int = 3,
+    backend: Optional[str] = None,
+    resample: str = "nearest",
+    fast_decode: bool = True,
+    progress_every: int = 10,
+    demo: bool = False
+) -> Dict[str, Any]:
+    """
+    Classify every image under target and stream results to output_path.
+    
+    Results and the manifest are flushed after every batch, so a crash loses
+    at most the batch in flight. Rows past the last committed batch are cut
+    from the output (on error, and again on ``resume`` in case the process
+    was killed), so those files are processed again without duplicate rows.
+    
+    Args:
+        target: Directory, image file, or glob pattern
+        output_path: JSONL or CSV results file
+        model_path: Path to the trained model
+        output_format: 'jsonl' or 'csv' (None = from output suffix)
+        resume: Skip files listed in the manifest and append to the output
+        batch_size: Images per forward pass
+        num_workers: Decode threads (None = os.cpu_count())
+        top_k: Number of top predictions per image
+        backend: Inference backend, inferred from the model file if None
+        resample: Resampling filter name
+        fast_decode: Decode large images close to the input size
+        progress_every: Print throughput every N batches (0 disables)
+        demo: Allow demo predictions when the model cannot be loaded
+    
+    Returns:
+        Summary with processed/failed/skipped counts, elapsed seconds and images/sec
+    
+    Raises:
+        RuntimeError: If the model cannot be loaded and ``demo`` is False
+    """
+    output_path = Path(output_path)
+    output_format = output_format or ("csv" if output_path.suffix.lower() == ".csv" else "jsonl")
+    manifest_path = output_path.with_name(output_path.name + ".manifest")
+    
+    pipeline = InferencePipeline(
+        model_path=model_path,
+        backend=backend,
+        cache_size=0,
+        fast_decode=fast_decode,
+        resample=resample
+    )
+    if pipeline.is_demo_mode():
+        # Demo rows would be committed to the manifest and never redone on resume
+        if not demo:
+            raise RuntimeError(
+                f"Model could not be loaded from {model_path}; pass demo=True (--demo) to write demo predictions"
+            )
+        print(f"Warning: model not loaded from {model_path}, results are demo predictions", file=sys.stderr)
+    
+    if not resume:
+        for path in (output_path, manifest_path):
+            if path.exists():
+                path.unlink()
+    done, committed = load_manifest(manifest_path) if resume else (set(), None)
+    if committed is not None and output_path.exists() and output_path.stat().st_size > committed:
+        os.truncate(output_path, committed)
+    
+    skipped = 0
+    
+    def pending() -> Iterator[str]:
+        nonlocal skipped
+        for path in iter_image_paths(target):
+            if path in done:
+                skipped += 1
+            else:
+                yield path
+    
+    committed = output_path.stat().st_size if output_path.exists() else 0
+    writer = ResultWriter(output_path, output_format)
+    processed = failed = 0
+    start = time.perf_counter()
+    
+    try:
+        with open(manifest_path, 'a', encoding='utf-8') as manifest:
+            batch_paths = []
+            for path, result in pipeline.predict_stream(
+                pending(), top_k=top_k, batch_size=batch_size, num_workers=num_workers
+            ):
+                writer.write(to_record(path, result))
+                batch_paths.append(path)
+                processed += 1
+                failed += isinstance(result, Exception)
+                
+                if len(batch_paths) == batch_size:
+                    committed = _commit_batch(writer, manifest, batch_paths)
+                    if progress_every and (processed // batch_size) % progress_every == 0:
+                        _print_progress(processed, failed, time.perf_counter() - start)
+            
+            _commit_batch(writer, manifest, batch_paths)
+    except BaseException:
+        # Drop rows of the uncommitted batch so a resumed run does not repeat them
+        writer.close()
+        os.truncate(output_path, committed)
+        raise
+    writer.close()
+    
+    elapsed = time.perf_counter() - start
+    summary = {
+        "processed": processed,
+        "failed": failed,
+        "skipped": skipped,
+        "elapsed_sec": elapsed,
+        "images_per_sec": processed / elapsed if elapsed > 0 else 0.0,
+        "output": str(output_path),
+        "manifest": str(manifest_path)
+    }
+    return summary
+
+
+def _commit_batch(writer: ResultWriter, manifest: TextIO, batch_paths: list) -> int:
+    """
+    Flush results first, then record the paths as done in the manifest.
+    
+    Returns:
+        Committed size of the output file in bytes
+    """
+    offset = writer.flush()
+    if not batch_paths:
+        return offset
+    manifest.write("".join(f"{path}\t{offset}\n" for path in batch_paths))
+    manifest.flush()
+    os.fsync(manifest.fileno())
+    batch_paths.clear()
+    return offset
+
+
+def _print_progress(processed: int, failed: int, elapsed: float) -> None:
+    """Print a one-line throughput update to stderr."""
+    rate = processed / elapsed if elapsed > 0 else 0.0
+    print(f"  {processed} images ({failed} failed) - {rate:.1f} images/sec", file=sys.stderr)
+
+
+def main(argv: Optional[list] = None) -> int:
+    """Command-line entry point."""
+    parser = argparse.ArgumentParser(
+        description="Classify a folder of images with the ATK Classifier",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog=__doc__
+    )
+    parser.add_argument("target", help="Directory, image file, or glob pattern")
+    parser.add_argument("-o", "--output", default="predictions.jsonl", help="Results file (.jsonl or .csv)")
+    parser.add_argument("--format", choices=["jsonl", "csv"], default=None, help="Output format (default: from suffix)")
+    parser.add_argument("--model", default="models/best_model.keras", help="Model file (.keras, .npz, .tflite)")
+    parser.add_argument("--backend", choices=["keras", "numpy", "tflite"], default=None)
+    parser.add_argument("--resume", action="store_true", help="Skip files already in the manifest")
+    parser.add_argument("--batch-size", type=int, default=16)
+    parser.add_argument("--workers", type=int, default=None, help="Decode threads (default: CPU count)")
+    parser.add_argument("--top-k", type=int, default=3)
+    parser.add_argument("--resample", default="nearest", help="Resampling filter")
+    parser.add_argument("--no-fast-decode", action="store_true", help="Decode images at full size")
+    parser.add_argument("--demo", action="store_true", help="Write demo predictions if the model cannot be loaded")
+    args = parser.parse_args(argv)
+    
+    try:
+        summary = classify(
+            args.target,
+            args.output,
+            model_path=args.model,
+            output_format=args.format,
+            resume=args.resume,
+            batch_size=args.batch_size,
+            num_workers=args.workers,
+            top_k=args.top_k,
+            backend=args.backend,
+            resample=args.resample,
+            fast_decode=not args.no_fast_decode,
+            demo=args.demo
+        )
+    except RuntimeError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+    
+    print(
+        f"Classified {summary['processed']} images ({summary['failed']} failed, "
+        f"{summary['skipped']} skipped) in {summary['elapsed_sec']:.1f}s - "
+        f"{summary['images_per_sec']:.1f} images/sec"
+    )
+    print(f"Results saved to: {summary['output']}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -2,22 +2,56 @@
 CNN Model module for ATK Classifier.
 Contains model architecture and prediction functionality.
 """
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Sequence, Tuple
 from pathlib import Path
 from dataclasses import dataclass, field
+import importlib.util
 import random
 import json
+import time
 
 import numpy as np
 
-# Try to import TensorFlow/Keras, but allow demo mode without it
-try:
-    import tensorflow as tf
-    from tensorflow import keras
-    from tensorflow.keras import layers, models, optimizers
-    TENSORFLOW_AVAILABLE = True
-except ImportError:
-    TENSORFLOW_AVAILABLE = False
+from models.metrics import metrics
+from models.numpy_engine import NumpyCNN
+from models.tflite_engine import TFLiteModel
+
+# TensorFlow is imported lazily (only when a Keras model is built or loaded),
+# so preprocessing, the NumPy/TFLite backends and demo mode start fast
+TENSORFLOW_AVAILABLE = importlib.util.find_spec("tensorflow") is not None
+
+# Classifier heads: Flatten over the last feature map, or global average pooling
+# (37x37x128 -> 128 features: 1369x fewer weights in the first Dense at 300x300)
+HEADS = ("flatten", "gap")
+
+
+def pooling_layer(head: str) -> Any:
+    """
+    Keras layer that turns the last feature map into a feature vector.
+    
+    Args:
+        head: 'flatten' or 'gap'
+    
+    Returns:
+        Flatten or GlobalAveragePooling2D layer
+    """
+    if head not in HEADS:
+        raise ValueError(f"Unknown head: {head}. Choose from: {', '.join(HEADS)}")
+    from tensorflow.keras import layers
+    return layers.GlobalAveragePooling2D() if head == "gap" else layers.Flatten()
+
+
+def detect_head(layer_types: Sequence[str]) -> str:
+    """
+    Infer the head variant from a model's layer types.
+    
+    Args:
+        layer_types: Layer class names in order
+    
+    Returns:
+        'gap' if the model pools globally, otherwise 'flatten'
+    """
+    return "gap" if "GlobalAveragePooling2D" in layer_types else "flatten"
 
 
 @dataclass
@@ -43,7 +77,8 @@ class ATKClassifier:
         conv3_filters: int = 128,
         dense_units: int = 128,
         dropout_rate: float = 0.5,
-        learning_rate: float = 0.001
+        learning_rate: float = 0.001,
+        head: str = "flatten"
     ) -> Any:
         """
         Build CNN model architecture for ATK classification.
@@ -58,12 +93,18 @@ class ATKClassifier:
             dense_units: Units in dense layer
             dropout_rate: Dropout rate
             learning_rate: Learning rate for optimizer
+            head: 'flatten' (notebook architecture) or 'gap' (global average pooling)
             
         Returns:
             Compiled Keras model
         """
         if not TENSORFLOW_AVAILABLE:
             raise RuntimeError("TensorFlow is not available. Cannot build model.")
+        
+        import tensorflow as tf
+        from tensorflow.keras import layers, models, optimizers
+        
+        features = pooling_layer(head)
 
         model = models.Sequential([
             # Rescaling layer - normalizes pixels to [0, 1]
@@ -82,7 +123,7 @@ class ATKClassifier:
             layers.MaxPooling2D(),
             
             # Dense layers
-            layers.Flatten(),
+            features,
             layers.Dense(dense_units, activation='relu'),
             layers.Dropout(dropout_rate),
             
@@ -107,55 +148,221 @@ class ModelPredictor:
         "eraser", "kertas", "pensil"
     ]
     
+    # Backend inferred from the model file suffix when not given explicitly
+    BACKEND_BY_SUFFIX = {
+        ".keras": "keras",
+        ".h5": "keras",
+        ".npz": "numpy",
+        ".tflite": "tflite",
+    }
+    
     def __init__(
         self,
         model_path: Optional[str] = None,
         class_names: Optional[List[str]] = None,
-        low_confidence_threshold: float = 0.5
+        low_confidence_threshold: float = 0.5,
+        compiled: bool = True,
+        backend: Optional[str] = None
     ):
         """
         Initialize predictor with optional model path.
         
         Args:
-            model_path: Path to saved model file (.keras or .h5)
+            model_path: Path to saved model file (.keras, .h5, .tflite, NumPy .npz)
+                or a NumPy weight directory, which is memory-mapped read-only
             class_names: List of class names for predictions
             low_confidence_threshold: Threshold below which confidence is considered low
+            compiled: Use a traced tf.function forward pass instead of model.predict
+            backend: 'keras', 'tflite' or 'numpy'; inferred from the file
+                suffix or the sidecar .json metadata if None
         """
         self.model_path = Path(model_path) if model_path else None
         self.class_names = class_names or self.DEFAULT_CLASS_NAMES
         self.low_confidence_threshold = low_confidence_threshold
+        self.compiled = compiled
+        self.backend = backend
         self._model = None
+        self._forward = None
         self._demo_mode = False
         self._model_metadata = None
+        self.head: Optional[str] = None
+        self.load_time_sec: Optional[float] = None
+        self.warmup_time_sec: Optional[float] = None
         
         # Try to load model
         self._load_model()
     
+    def _resolve_backend(self, metadata: Optional[Dict[str, Any]] = None) -> str:
+        """
+        Pick the inference backend.
+        
+        Priority: explicit setting, weight directory (memory-mapped NumPy),
+        known file suffix, 'backend' key in the sidecar metadata, then Keras.
+        
+        Args:
+            metadata: Sidecar metadata of the model file, if any
+        """
+        if self.backend:
+            return self.backend
+        if self.model_path.is_dir():
+            return "numpy"
+        suffix = self.model_path.suffix.lower()
+        if suffix in self.BACKEND_BY_SUFFIX:
+            return self.BACKEND_BY_SUFFIX[suffix]
+        if metadata and metadata.get('backend'):
+            return metadata['backend']
+        return "keras"
+    
+    def _load_metadata(self) -> Optional[Dict[str, Any]]:
+        """Read the sidecar .json metadata, or None if there is none."""
+        metadata_path = self.model_path.with_suffix('.json')
+        if not metadata_path.exists():
+            return None
+        with open(metadata_path, 'r') as f:
+            return json.load(f)
+    
     def _load_model(self) -> None:
-        """Attempt to load the model from disk."""
-        if not TENSORFLOW_AVAILABLE:
+        """
+        Attempt to load the model from disk.
+        
+        Metadata and class names are only applied once the model has loaded,
+        so a failed load leaves the defaults in place for demo mode.
+        """
+        if not (self.model_path and self.model_path.exists()):
             self._demo_mode = True
             return
+        
+        start = time.perf_counter()
+        try:
+            metadata = self._load_metadata()
+            backend = self._resolve_backend(metadata)
             
-        if self.model_path and self.model_path.exists():
-            try:
-                self._model = keras.models.load_model(str(self.model_path))
-                self._demo_mode = False
-                
-                # Try to load metadata for class names
-                metadata_path = self.model_path.with_suffix('.json')
-                if metadata_path.exists():
-                    with open(metadata_path, 'r') as f:
-                        self._model_metadata = json.load(f)
-                        if 'class_names' in self._model_metadata:
-                            self.class_names = self._model_metadata['class_names']
-                            
-            except Exception as e:
-                print(f"Error loading model: {e}")
+            # NumPy and TFLite backends serve without TensorFlow
+            if backend == "keras" and not TENSORFLOW_AVAILABLE:
                 self._demo_mode = True
-        else:
+                return
+            
+            if backend == "numpy":
+                model = NumpyCNN.load(self.model_path)
+                forward = model
+            elif backend == "tflite":
+                model = TFLiteModel(self.model_path)
+                forward = model
+            elif backend == "keras":
+                from tensorflow import keras
+                model = keras.models.load_model(str(self.model_path))
+                forward = self._build_forward(model) if self.compiled else None
+            else:
+                raise ValueError(f"Unknown backend: {backend}")
+            
+            self._model = model
+            self._forward = forward
+            self._model_metadata = metadata
+            if metadata and 'class_names' in metadata:
+                self.class_names = metadata['class_names']
+            self.backend = backend
+            self.head = self._resolve_head()
+            self._demo_mode = False
+            self.load_time_sec = time.perf_counter() - start
+        
+        except Exception as e:
+            print(f"Error loading model: {e}")
             self._demo_mode = True
     
+    def _resolve_head(self) -> Optional[str]:
+        """
+        Head variant of the loaded model.
+        
+        Every backend rebuilds the architecture from the model file itself, so
+        both variants load the same way; this only reports which one it is.
+        Priority: 'head' key in the metadata, then the layer types.
+        """
+        if self._model_metadata and self._model_metadata.get('head'):
+            return self._model_metadata['head']
+        if self.backend == "keras":
+            return detect_head([type(layer).__name__ for layer in self._model.layers])
+        if self.backend == "numpy":
+            return detect_head([layer["type"] for layer in self._model.layers])
+        return None
+    
+    @staticmethod
+    def _build_forward(model: Any) -> Any:
+        """
+        Trace the model call once with a fixed input signature.
+        
+        model.predict builds a data adapter and step function on every call,
+        which dominates latency for a single small image. The traced function
+        is reused for every batch size because the batch dimension is None.
+        uint8 batches get their own trace that casts inside the graph, so the
+        host never materializes a float32 copy (the Rescaling layer scales).
+        
+        Args:
+            model: Loaded Keras model
+        
+        Returns:
+            Callable mapping a uint8 or float32 (N, H, W, 3) array to probabilities
+        """
+        import tensorflow as tf
+        
+        shape = (None,) + tuple(model.input_shape[1:])
+        
+        @tf.function(input_signature=[tf.TensorSpec(shape=shape, dtype=tf.float32)], reduce_retracing=True)
+        def forward_float(batch):
+            return model(batch, training=False)
+        
+        @tf.function(input_signature=[tf.TensorSpec(shape=shape, dtype=tf.uint8)], reduce_retracing=True)
+        def forward_uint8(batch):
+            return model(tf.cast(batch, tf.float32), training=False)
+        
+        def forward(batch):
+            if batch.dtype == np.uint8:
+                return forward_uint8(batch)
+            return forward_float(np.asarray(batch, dtype=np.float32))
+        
+        return forward
+    
+    def warmup(
+        self,
+        batch_sizes: Sequence[int] = (1,),
+        input_size: Tuple[int, int] = (300, 300)
+    ) -> float:
+        """
+        Run dummy uint8 batches so the first real request runs at steady-state latency.
+        
+        The first calls pay for graph tracing, kernel selection and lazy
+        allocations; each batch size gets one call so shape-dependent
+        kernels are picked before real traffic arrives.
+        
+        Args:
+            batch_sizes: Batch sizes to run once each
+            input_size: Model input size (width, height)
+        
+        Returns:
+            Warm-up time in seconds (0.0 in demo mode)
+        """
+        if self._demo_mode:
+            return 0.0
+        
+        width, height = input_size
+        start = time.perf_counter()
+        for batch_size in sorted(set(batch_sizes)):
+            self._predict_probabilities(np.zeros((batch_size, height, width, 3), dtype=np.uint8))
+        self.warmup_time_sec = time.perf_counter() - start
+        return self.warmup_time_sec
+    
+    @property
+    def model_version(self) -> str:
+        """
+        Identifier that changes whenever a different model is loaded.
+        
+        Returns:
+            'demo' in demo mode, otherwise backend, file name, size and mtime
+        """
+        if self._demo_mode:
+            return "demo"
+        stat = self.model_path.stat()
+        return f"{self.backend}:{self.model_path.name}:{stat.st_size}:{stat.st_mtime_ns}"
+    
     def get_model_info(self) -> Dict[str, Any]:
         """Get information about the loaded model."""
         if self._demo_mode:
@@ -165,8 +372,13 @@ class ModelPredictor:
             "mode": "production",
             "model_loaded": True,
             "model_path": str(self.model_path),
+            "backend": self.backend,
+            "head": self.head,
             "class_names": self.class_names,
-            "num_classes": len(self.class_names)
+            "num_classes": len(self.class_names),
+            "compiled": self._forward is not None,
+            "load_time_sec": self.load_time_sec,
+            "warmup_time_sec": self.warmup_time_sec
         }
         
         if self._model_metadata:
@@ -197,25 +409,36 @@ class ModelPredictor:
         probs = np.random.dirichlet(np.ones(len(self.class_names)))
         return probs
     
-    def predict(self, preprocessed_image: np.ndarray, top_k: int = 3) -> PredictionResult:
+    def _predict_probabilities(self, batch: np.ndarray) -> np.ndarray:
         """
-        Make prediction on preprocessed image.
+        Run the model (or demo generator) on a preprocessed batch.
         
         Args:
-            preprocessed_image: Preprocessed image array with shape (1, 224, 224, 3)
-            top_k: Number of top predictions to return
-            
+            batch: Preprocessed image array with shape (N, height, width, 3),
+                uint8 or float32 pixels in [0, 255]
+        
         Returns:
-            PredictionResult with predicted class, confidence, and top-k predictions
+            Probability array with shape (N, num_classes)
         """
-        # Ensure top_k doesn't exceed number of classes
-        top_k = min(top_k, len(self.class_names))
-        
         if self._demo_mode:
-            probabilities = self._generate_demo_predictions(top_k)
-        else:
-            probabilities = self._model.predict(preprocessed_image, verbose=0)[0]
+            return np.stack([self._generate_demo_predictions() for _ in range(len(batch))])
+        
+        if self._forward is not None:
+            return np.asarray(self._forward(batch))
         
+        return np.asarray(self._model.predict(batch, verbose=0))
+    
+    def _build_result(self, probabilities: np.ndarray, top_k: int) -> PredictionResult:
+        """
+        Build a PredictionResult from a single probability vector.
+        
+        Args:
+            probabilities: Probability array with shape (num_classes,)
+            top_k: Number of top predictions to return (already capped)
+            
+        Returns:
+            PredictionResult with predicted class, confidence, and top-k predictions
+        """
         # Get top-k indices sorted by probability (descending)
         top_indices = np.argsort(probabilities)[::-1][:top_k]
         
@@ -240,3 +463,39 @@ class ModelPredictor:
             is_demo=self._demo_mode,
             is_low_confidence=best_confidence < self.low_confidence_threshold
         )
+
+    def predict(self, preprocessed_image: np.ndarray, top_k: int = 3) -> PredictionResult:
+        """
+        Make prediction on preprocessed image.
+        
+        Args:
+            preprocessed_image: Preprocessed image array with shape (1, 224, 224, 3)
+            top_k: Number of top predictions to return
+        
+        Returns:
+            PredictionResult with predicted class, confidence, and top-k predictions
+        """
+        return self.predict_batch(preprocessed_image[:1], top_k=top_k)[0]
+    
+    def predict_batch(self, preprocessed_batch: np.ndarray, top_k: int = 3) -> List[PredictionResult]:
+        """
+        Make predictions on a batch of preprocessed images with one forward pass.
+        
+        Args:
+            preprocessed_batch: Preprocessed image array with shape (N, height, width, 3)
+            top_k: Number of top predictions to return per image
+        
+        Returns:
+            List of N PredictionResult objects, in input order
+        """
+        if len(preprocessed_batch) == 0:
+            return []
+        
+        # Ensure top_k doesn't exceed number of classes
+        top_k = min(top_k, len(self.class_names))
+        
+        with metrics.timer("forward"):
+            probabilities = self._predict_probabilities(preprocessed_batch)
+        
+        with metrics.timer("postprocess"):
+            return [self._build_result(probs, top_k) for probs in probabilities]
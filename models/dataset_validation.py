@@ -0,0 +1,223 @@
+"""
+Dataset validation module for ATK Classifier.
+Checks every image in a class-per-folder dataset on a thread pool, records
+the result in a persistent manifest, and moves bad files to a quarantine
+folder instead of deleting them.
+"""
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple, Union
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, asdict
+from datetime import datetime
+from pathlib import Path
+import hashlib
+import shutil
+import json
+import io
+import os
+
+from PIL import Image
+
+# Formats TensorFlow's image_dataset_from_directory decodes for our extensions
+VALID_FORMATS = {"JPEG", "PNG"}
+
+MANIFEST_VERSION = 1
+
+
+@dataclass
+class ImageRecord:
+    """Validation result for one dataset file."""
+    path: str
+    size: int
+    mtime_ns: int
+    sha256: Optional[str] = None
+    format: Optional[str] = None
+    width: Optional[int] = None
+    height: Optional[int] = None
+    status: str = "valid"  # 'valid' or 'quarantined'
+    error: Optional[str] = None
+    quarantine_path: Optional[str] = None
+    checked_at: Optional[str] = None
+
+
+def check_image(path: Union[str, Path]) -> Dict[str, Any]:
+    """
+    Hash and fully decode one file.
+    
+    ``Image.verify`` only parses headers, so the image is decoded as well
+    to catch truncated files.
+    
+    Args:
+        path: Image file
+    
+    Returns:
+        Dictionary with sha256, format, width, height and error (None if valid)
+    """
+    data = Path(path).read_bytes()
+    result = {
+        "sha256": hashlib.sha256(data).hexdigest(),
+        "format": None,
+        "width": None,
+        "height": None,
+        "error": None
+    }
+    try:
+        with Image.open(io.BytesIO(data)) as image:
+            result["format"] = image.format
+            result["width"], result["height"] = image.size
+            image.verify()
+        with Image.open(io.BytesIO(data)) as image:
+            image.load()
+    except Exception as e:
+        result["error"] = f"{type(e).__name__}: {e}"
+        return result
+    
+    if result["format"] not in VALID_FORMATS:
+        result["error"] = f"Unsupported format: {result['format']}"
+    return result
+
+
+class DatasetValidator:
+    """
+    Incremental, parallel validator for a class-per-folder image dataset.
+    
+    Files whose size and mtime match the manifest are not re-read, so only
+    new or changed files are decoded on later runs. Invalid files are moved
+    to ``quarantine_dir/<class>/`` and kept in the manifest with the reason.
+    """
+    
+    def __init__(
+        self,
+        dataset_dir: Union[str, Path],
+        manifest_path: Optional[Union[str, Path]] = None,
+        quarantine_dir: Optional[Union[str, Path]] = None,
+        num_workers: Optional[int] = None
+    ):
+        """
+        Initialize the validator.
+        
+        Args:
+            dataset_dir: Dataset root with one sub-directory per class
+            manifest_path: Manifest JSON (default: <dataset_dir>/.validation_manifest.json,
+                a top-level file that dataset loaders ignore)
+            quarantine_dir: Where invalid files are moved (default: sibling
+                <dataset_dir>_quarantine, outside the dataset so it is never a class)
+            num_workers: Validation threads (None = os.cpu_count())
+        """
+        self.dataset_dir = Path(dataset_dir)
+        self.manifest_path = Path(manifest_path) if manifest_path else self.dataset_dir / ".validation_manifest.json"
+        self.quarantine_dir = (
+            Path(quarantine_dir) if quarantine_dir
+            else self.dataset_dir.with_name(self.dataset_dir.name + "_quarantine")
+        )
+        self.num_workers = max(1, num_workers or os.cpu_count() or 1)
+    
+    def load_manifest(self) -> Dict[str, ImageRecord]:
+        """
+        Read the manifest.
+        
+        Returns:
+            Mapping of dataset-relative path to ImageRecord (empty if missing or unreadable)
+        """
+        try:
+            with open(self.manifest_path, 'r') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        if data.get("version") != MANIFEST_VERSION:
+            return {}
+        return {record["path"]: ImageRecord(**record) for record in data.get("files", [])}
+    
+    def save_manifest(self, records: Dict[str, ImageRecord]) -> None:
+        """Write the manifest atomically."""
+        data = {
+            "version": MANIFEST_VERSION,
+            "dataset_dir": str(self.dataset_dir),
+            "updated_at": datetime.now().isoformat(),
+            "files": [asdict(record) for _, record in sorted(records.items())]
+        }
+        # Per-process temp name: concurrent trainers may validate the same dataset
+        tmp_path = self.manifest_path.with_name(f"{self.manifest_path.name}.{os.getpid()}.tmp")
+        with open(tmp_path, 'w') as f:
+            json.dump(data, f, indent=1)
+        os.replace(tmp_path, self.manifest_path)
+    
+    def iter_files(self) -> Iterator[Path]:
+        """Yield every file inside the class sub-directories, in sorted order."""
+        for class_dir in sorted(p for p in self.dataset_dir.iterdir() if p.is_dir()):
+            for path in sorted(class_dir.iterdir()):
+                if path.is_file():
+                    yield path
+    
+    def validate(self, progress_callback: Optional[Callable[[int], None]] = None) -> Dict[str, int]:
+        """
+        Validate new and changed files, quarantine bad ones, and update the manifest.
+        
+        Args:
+            progress_callback: Called with the number of files processed so far
+        
+        Returns:
+            Dictionary with total, valid, removed (quarantined in this run),
+            checked (decoded in this run) and reused (unchanged since last run) counts
+        """
+        if not self.dataset_dir.exists():
+            return {"valid": 0, "removed": 0, "total": 0, "error": "Dataset directory not found"}
+        
+        previous = self.load_manifest()
+        records: Dict[str, ImageRecord] = {
+            key: record for key, record in previous.items() if record.status == "quarantined"
+        }
+        stats = {"valid": 0, "removed": 0, "total": 0, "checked": 0, "reused": 0}
+        to_check: List[Tuple[str, Path, os.stat_result]] = []
+        
+        for path in self.iter_files():
+            key = path.relative_to(self.dataset_dir).as_posix()
+            stat = path.stat()
+            stats["total"] += 1
+            record = previous.get(key)
+            if (record is not None and record.status == "valid"
+                    and record.size == stat.st_size and record.mtime_ns == stat.st_mtime_ns):
+                records[key] = record
+                stats["valid"] += 1
+                stats["reused"] += 1
+            else:
+                to_check.append((key, path, stat))
+        
+        done = stats["reused"]
+        if progress_callback and done:
+            progress_callback(done)
+        
+        with ThreadPoolExecutor(max_workers=self.num_workers, thread_name_prefix="validate") as executor:
+            for (key, path, stat), result in zip(to_check, executor.map(lambda item: check_image(item[1]), to_check)):
+                record = ImageRecord(
+                    path=key,
+                    size=stat.st_size,
+                    mtime_ns=stat.st_mtime_ns,
+                    checked_at=datetime.now().isoformat(),
+                    **result
+                )
+                if record.error is None:
+                    stats["valid"] += 1
+                else:
+                    record.status = "quarantined"
+                    record.quarantine_path = str(self._quarantine(path))
+                    stats["removed"] += 1
+                records[key] = record
+                stats["checked"] += 1
+                done += 1
+                if progress_callback:
+                    progress_callback(done)
+        
+        self.save_manifest(records)
+        return stats
+    
+    def _quarantine(self, path: Path) -> Path:
+        """Move a file to the quarantine folder, keeping its class sub-directory."""
+        target_dir = self.quarantine_dir / path.parent.name
+        target_dir.mkdir(parents=True, exist_ok=True)
+        target = target_dir / path.name
+        counter = 1
+        while target.exists():
+            target = target_dir / f"{path.stem}_{counter}{path.suffix}"
+            counter += 1
+        shutil.move(str(path), str(target))
+        return target
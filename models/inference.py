@@ -2,14 +2,90 @@
 Inference pipeline module for ATK Classifier.
 Combines preprocessing and prediction in a single pipeline.
 """
-from typing import Union, Optional, List
+from typing import Any, Iterable, Iterator, Sequence, Tuple, Union, Optional, List, Dict
+from collections import OrderedDict
+from dataclasses import dataclass, field
 from pathlib import Path
+import hashlib
+import threading
 import io
 
+import numpy as np
 from PIL import Image
 
 from models.preprocessing import ImagePreprocessor, ImageValidator
 from models.cnn_model import ModelPredictor, PredictionResult
+from models.metrics import metrics
+from models.parallel import ParallelPreprocessor
+
+
+@dataclass
+class ReadinessStatus:
+    """Whether the pipeline serves a loaded, warmed-up model, with timings."""
+    ready: bool
+    is_demo: bool
+    backend: Optional[str] = None
+    load_time_sec: Optional[float] = None
+    warmup_time_sec: Optional[float] = None
+    warmup_batch_sizes: List[int] = field(default_factory=list)
+
+
+class PredictionCache:
+    """
+    Thread-safe bounded LRU cache of prediction results.
+    Keys are content hashes of the input image plus model version and top_k.
+    """
+    
+    def __init__(self, maxsize: int = 128):
+        """
+        Initialize the cache.
+        
+        Args:
+            maxsize: Maximum number of cached results (0 disables caching)
+        """
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[str, PredictionResult]" = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def get(self, key: str) -> Optional[PredictionResult]:
+        """Return the cached result for key, or None on a miss."""
+        with self._lock:
+            result = self._entries.get(key)
+            if result is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return result
+    
+    def put(self, key: str, result: PredictionResult) -> None:
+        """Store a result, evicting the least recently used entry when full."""
+        if self.maxsize <= 0:
+            return
+        with self._lock:
+            self._entries[key] = result
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+    
+    def clear(self) -> None:
+        """Drop all entries and reset counters."""
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+    
+    def info(self) -> Dict[str, int]:
+        """Get hit/miss counters and current size."""
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "size": len(self._entries),
+                "maxsize": self.maxsize
+            }
 
 
 class InferencePipeline:
@@ -23,7 +99,11 @@ class InferencePipeline:
         model_path: Optional[str] = None,
         input_size: tuple = (300, 300),
         class_names: Optional[List[str]] = None,
-        low_confidence_threshold: float = 0.5
+        low_confidence_threshold: float = 0.5,
+        backend: Optional[str] = None,
+        cache_size: int = 128,
+        fast_decode: bool = False,
+        resample: str = "lanczos"
     ):
         """
         Initialize the inference pipeline.
@@ -33,20 +113,93 @@ class InferencePipeline:
             input_size: Target input size for preprocessing
             class_names: List of class names for predictions
             low_confidence_threshold: Threshold for low confidence warning
+            backend: Inference backend ('keras', 'tflite' or 'numpy'), inferred if None
+            cache_size: Max cached predictions keyed by image content (0 disables)
+            fast_decode: Decode large images close to input_size before resampling
+            resample: Resampling filter name used when resizing to input_size
         """
         # normalize=False karena model sudah punya Rescaling layer
-        self.preprocessor = ImagePreprocessor(input_size=input_size, normalize=False)
-        self.predictor = ModelPredictor(
-            model_path=model_path,
-            class_names=class_names,
-            low_confidence_threshold=low_confidence_threshold
+        self.preprocessor = ImagePreprocessor(
+            input_size=input_size,
+            normalize=False,
+            fast_decode=fast_decode,
+            resample=resample
         )
+        self._predictor_kwargs = {
+            'class_names': class_names,
+            'low_confidence_threshold': low_confidence_threshold,
+            'backend': backend
+        }
+        self.predictor = ModelPredictor(model_path=model_path, **self._predictor_kwargs)
         self.validator = ImageValidator()
+        self.cache = PredictionCache(maxsize=cache_size)
+        self._warmup_batch_sizes: List[int] = []
     
     def is_demo_mode(self) -> bool:
         """Check if pipeline is running in demo mode."""
         return self.predictor.is_demo_mode()
     
+    def reload_model(self, model_path: Optional[str] = None) -> bool:
+        """
+        Load a model and swap it in without rebuilding the pipeline.
+        
+        The new predictor is fully loaded (and warmed up, if warmup() was
+        called) before the swap, so requests in flight finish on the old one
+        (e.g. demo mode while provisioning) and the first request on the new
+        one does not pay for tracing.
+        
+        Args:
+            model_path: Model file to load (default: the current model path)
+        
+        Returns:
+            True if the new model loaded (not demo mode)
+        """
+        model_path = model_path or self.predictor.model_path
+        predictor = ModelPredictor(
+            model_path=str(model_path) if model_path else None,
+            **self._predictor_kwargs
+        )
+        if self._warmup_batch_sizes:
+            predictor.warmup(self._warmup_batch_sizes, self.preprocessor.input_size)
+        self.predictor = predictor
+        self.cache.clear()
+        return not predictor.is_demo_mode()
+    
+    def warmup(self, batch_sizes: Sequence[int] = (1,)) -> float:
+        """
+        Warm up the model at each batch size it will serve.
+        
+        The batch sizes are remembered so models swapped in later by
+        reload_model() are warmed up before they take traffic.
+        
+        Args:
+            batch_sizes: Batch sizes to run once each (e.g. 1..BATCH_MAX_SIZE)
+        
+        Returns:
+            Warm-up time in seconds (0.0 in demo mode)
+        """
+        self._warmup_batch_sizes = sorted(set(batch_sizes))
+        return self.predictor.warmup(self._warmup_batch_sizes, self.preprocessor.input_size)
+    
+    def readiness(self) -> ReadinessStatus:
+        """
+        Report whether the pipeline is serving a real model at steady-state latency.
+        
+        Returns:
+            ReadinessStatus; ready is False in demo mode or before a requested warm-up
+        """
+        predictor = self.predictor
+        is_demo = predictor.is_demo_mode()
+        warmed_up = not self._warmup_batch_sizes or predictor.warmup_time_sec is not None
+        return ReadinessStatus(
+            ready=not is_demo and warmed_up,
+            is_demo=is_demo,
+            backend=None if is_demo else predictor.backend,
+            load_time_sec=predictor.load_time_sec,
+            warmup_time_sec=predictor.warmup_time_sec,
+            warmup_batch_sizes=list(self._warmup_batch_sizes)
+        )
+    
     def validate_image(
         self,
         filename: str,
@@ -90,13 +243,142 @@ class InferencePipeline:
         Returns:
             PredictionResult with classification results
         """
-        # Preprocess the image
-        preprocessed = self.preprocessor.preprocess(image_source)
+        return self.predict_batch([image_source], top_k=top_k)[0]
+    
+    def predict_batch(
+        self,
+        image_sources: List[Union[str, Path, bytes, io.BytesIO, Image.Image]],
+        top_k: int = 3
+    ) -> List[PredictionResult]:
+        """
+        Run full inference pipeline on many images with a single forward pass.
+        
+        Images already in the prediction cache skip decode, resize and the
+        forward pass; the rest are preprocessed and predicted as one batch.
+        
+        Args:
+            image_sources: List of image sources (path, bytes, BytesIO, or PIL Image)
+            top_k: Number of top predictions to return per image
+        
+        Returns:
+            List of PredictionResult, one per image in input order
+        """
+        with metrics.timer("pipeline"):
+            return self._predict_cached(list(image_sources), top_k)
+    
+    def _predict_cached(
+        self,
+        image_sources: List[Union[str, Path, bytes, io.BytesIO, Image.Image]],
+        top_k: int
+    ) -> List[PredictionResult]:
+        """Serve cache hits and predict the misses as one batch."""
+        if self.cache.maxsize <= 0:
+            return self._predict_uncached(image_sources, top_k)
         
-        # Run prediction
-        result = self.predictor.predict(preprocessed, top_k=top_k)
+        results: List[Optional[PredictionResult]] = [None] * len(image_sources)
+        miss_indices, miss_sources, miss_keys = [], [], []
+        model_version = self.predictor.model_version
         
-        return result
+        for i, image_source in enumerate(image_sources):
+            # Read encoded bytes once so hashing and decoding share them
+            image_source = self._read_source(image_source)
+            key = self._cache_key(image_source, model_version, top_k)
+            cached = self.cache.get(key)
+            if cached is not None:
+                results[i] = cached
+            else:
+                miss_indices.append(i)
+                miss_sources.append(image_source)
+                miss_keys.append(key)
+        
+        if miss_sources:
+            predictions = self._predict_uncached(miss_sources, top_k)
+            for i, key, result in zip(miss_indices, miss_keys, predictions):
+                self.cache.put(key, result)
+                results[i] = result
+        
+        return results
+    
+    def _predict_uncached(
+        self,
+        image_sources: List[Union[str, Path, bytes, io.BytesIO, Image.Image]],
+        top_k: int
+    ) -> List[PredictionResult]:
+        """Preprocess all images into a reused uint8 (N, H, W, 3) buffer and run one prediction."""
+        # The model's Rescaling layer scales uint8 pixels, so no float32 copy is needed
+        buffer = self.preprocessor.get_batch_buffer(len(image_sources), np.uint8)
+        batch = self.preprocessor.preprocess_into(image_sources, buffer)
+        return self.predictor.predict_batch(batch, top_k=top_k)
+    
+    def predict_stream(
+        self,
+        image_sources: Iterable[Union[str, Path, bytes, io.BytesIO, Image.Image]],
+        top_k: int = 3,
+        batch_size: int = 16,
+        num_workers: Optional[int] = None,
+        prefetch_batches: int = 2
+    ) -> Iterator[Tuple[Any, Union[PredictionResult, Exception]]]:
+        """
+        Predict a large stream of images, decoding on a worker pool.
+        
+        The next batches decode on ``num_workers`` threads while the current
+        batch runs through the model. Results bypass the prediction cache and
+        are yielded in input order; an image that fails to load yields its
+        exception instead of stopping the stream.
+        
+        Args:
+            image_sources: Iterable of image sources (path, bytes, BytesIO, or PIL Image)
+            top_k: Number of top predictions to return per image
+            batch_size: Images per forward pass
+            num_workers: Decode threads (None = os.cpu_count())
+            prefetch_batches: Batches decoded ahead of the model
+        
+        Yields:
+            (image source, PredictionResult or Exception) per image
+        """
+        stage = ParallelPreprocessor(self.preprocessor, num_workers, prefetch_batches)
+        
+        for sources, batch, errors in stage.iter_batches(image_sources, batch_size):
+            if errors:
+                valid = [i for i in range(len(sources)) if i not in errors]
+                batch = batch[valid]
+            predictions = iter(self.predictor.predict_batch(batch, top_k=top_k))
+            
+            for i, image_source in enumerate(sources):
+                yield image_source, errors[i] if i in errors else next(predictions)
+    
+    @staticmethod
+    def _read_source(
+        image_source: Union[str, Path, bytes, io.BytesIO, Image.Image]
+    ) -> Union[bytes, Image.Image]:
+        """Turn paths and BytesIO into raw encoded bytes; leave bytes and PIL Images as-is."""
+        if isinstance(image_source, (str, Path)):
+            return Path(image_source).read_bytes()
+        if isinstance(image_source, io.BytesIO):
+            return image_source.getvalue()
+        return image_source
+    
+    @staticmethod
+    def _cache_key(image_source: Union[bytes, Image.Image], model_version: str, top_k: int) -> str:
+        """
+        Build a cache key from image content, model version and top_k.
+        
+        Encoded bytes are hashed directly (no decode). PIL Images are hashed
+        over their decoded pixels, which still skips resize and the forward pass.
+        """
+        digest = hashlib.blake2b(digest_size=16)
+        if isinstance(image_source, Image.Image):
+            digest.update(f"{image_source.mode}:{image_source.size}".encode())
+            digest.update(image_source.tobytes())
+        elif isinstance(image_source, bytes):
+            digest.update(image_source)
+        else:
+            raise ValueError(f"Unsupported image source type: {type(image_source)}")
+        return f"{model_version}:{top_k}:{digest.hexdigest()}"
+    
+    def cache_info(self) -> Dict[str, int]:
+        """Get prediction cache hit/miss counters."""
+        return self.cache.info()
     
     def get_image_info(
         self,
@@ -0,0 +1,230 @@
+"""
+Training input pipeline for ATK Classifier.
+Lists the dataset once, makes a stratified reproducible train/val/test
+split, and builds tf.data pipelines (parallel decode, vectorized batch
+augmentation, prefetch) from the raw images or the tensor cache.
+"""
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+from dataclasses import dataclass
+from pathlib import Path
+
+import numpy as np
+
+from models.preprocessing import IMAGE_EXTENSIONS
+
+SPLITS = ("train", "validation", "test")
+
+
+@dataclass
+class DatasetSplits:
+    """Batched tf.data pipelines for each split."""
+    train: Any
+    validation: Any
+    test: Optional[Any]
+    class_names: List[str]
+    counts: Dict[str, int]  # images per split
+
+
+def list_image_files(dataset_dir: Union[str, Path]) -> Tuple[List[str], np.ndarray, List[str]]:
+    """
+    List a class-per-folder dataset in one pass.
+    
+    Args:
+        dataset_dir: Dataset root with one sub-directory per class
+    
+    Returns:
+        Tuple of (file paths, int32 labels, sorted class names)
+    """
+    dataset_dir = Path(dataset_dir)
+    class_names = sorted(p.name for p in dataset_dir.iterdir() if p.is_dir())
+    paths, labels = [], []
+    for label, class_name in enumerate(class_names):
+        for path in sorted((dataset_dir / class_name).iterdir()):
+            if path.is_file() and path.suffix.lower() in IMAGE_EXTENSIONS:
+                paths.append(str(path))
+                labels.append(label)
+    return paths, np.array(labels, dtype=np.int32), class_names
+
+
+def stratified_split(
+    labels: Sequence[int],
+    validation_split: float,
+    test_split: float = 0.0,
+    seed: int = 123
+) -> Dict[str, np.ndarray]:
+    """
+    Split row indices per class so every split keeps the class balance.
+    
+    Each class is shuffled with a generator seeded by ``seed`` and cut into
+    test, validation and train parts of round(fraction * class size).
+    
+    Args:
+        labels: Class index of each row
+        validation_split: Fraction of each class used for validation
+        test_split: Fraction of each class held out for testing
+        seed: Shuffle seed
+    
+    Returns:
+        Mapping of 'train', 'validation' and 'test' to sorted row indices
+    """
+    if validation_split < 0 or test_split < 0 or validation_split + test_split >= 1:
+        raise ValueError(
+            f"Invalid split fractions: validation={validation_split}, test={test_split}"
+        )
+    
+    labels = np.asarray(labels)
+    rng = np.random.default_rng(seed)
+    parts: Dict[str, List[np.ndarray]] = {name: [] for name in SPLITS}
+    for label in np.unique(labels):
+        rows = rng.permutation(np.flatnonzero(labels == label))
+        num_test = int(round(test_split * len(rows)))
+        num_val = int(round(validation_split * len(rows)))
+        parts["test"].append(rows[:num_test])
+        parts["validation"].append(rows[num_test:num_test + num_val])
+        parts["train"].append(rows[num_test + num_val:])
+    
+    return {
+        name: np.sort(np.concatenate(chunks)) if chunks else np.empty(0, dtype=np.int64)
+        for name, chunks in parts.items()
+    }
+
+
+def augment_batch(images: Any, labels: Any, seed: Optional[int] = None) -> Tuple[Any, Any]:
+    """
+    Randomly flip and brighten a whole batch in one op per transform.
+    
+    Args:
+        images: float32 batch (N, H, W, 3) in [0, 255]
+        labels: Label batch (passed through)
+        seed: Op-level seed
+    
+    Returns:
+        Tuple of (augmented images, labels)
+    """
+    import tensorflow as tf
+    
+    images = tf.image.random_flip_left_right(images, seed=seed)
+    # Per-image brightness offset of up to +-10% of the pixel range
+    delta = tf.random.uniform((tf.shape(images)[0], 1, 1, 1), -25.5, 25.5, seed=seed)
+    return tf.clip_by_value(images + delta, 0.0, 255.0), labels
+
+
+def load_image(path: Any, img_size: Tuple[int, int]) -> Any:
+    """
+    Decode and resize one image file the way every training source does.
+    
+    Both decode_dataset and the tensor cache go through this function, so
+    a model sees identical pixels whichever source it was trained from.
+    Resizing is bilinear as in image_dataset_from_directory; the result is
+    rounded to uint8 so it can be stored in the cache losslessly.
+    
+    Args:
+        path: Image file path (string tensor)
+        img_size: (height, width)
+    
+    Returns:
+        uint8 tensor of shape (height, width, 3)
+    """
+    import tensorflow as tf
+    
+    image = tf.io.decode_image(tf.io.read_file(path), channels=3, expand_animations=False)
+    image = tf.image.resize(image, img_size, method="bilinear")
+    image = tf.saturate_cast(tf.round(image), tf.uint8)
+    image.set_shape((img_size[0], img_size[1], 3))
+    return image
+
+
+def decode_dataset(
+    paths: Sequence[str],
+    labels: np.ndarray,
+    img_size: Tuple[int, int],
+    batch_size: int,
+    shuffle: bool = False,
+    seed: Optional[int] = None
+) -> Any:
+    """
+    Decode and resize image files in parallel into a batched tf.data.Dataset.
+    
+    Decoded images are cached in memory after the first epoch. Images are
+    float32 in [0, 255], resized by load_image.
+    
+    Args:
+        paths: Image files
+        labels: Class index of each file
+        img_size: (height, width)
+        batch_size: Images per batch
+        shuffle: Reshuffle every epoch
+        seed: Shuffle seed
+    
+    Returns:
+        tf.data.Dataset of (images, labels) batches
+    """
+    import tensorflow as tf
+    
+    def load(path: Any, label: Any) -> Tuple[Any, Any]:
+        return tf.cast(load_image(path, img_size), tf.float32), label
+    
+    dataset = tf.data.Dataset.from_tensor_slices((list(paths), labels.astype(np.int32)))
+    dataset = dataset.map(load, num_parallel_calls=tf.data.AUTOTUNE).cache()
+    if shuffle:
+        dataset = dataset.shuffle(len(paths), seed=seed, reshuffle_each_iteration=True)
+    return dataset.batch(batch_size)
+
+
+def build_splits(
+    dataset_dir: Union[str, Path],
+    config: Any,
+    use_cache: bool = False
+) -> DatasetSplits:
+    """
+    Build the train/validation/test pipelines described by a TrainingConfig.
+    
+    The split depends only on the file list, class names and seed, so the
+    decode and cache sources yield the same files in each split.
+    
+    Args:
+        dataset_dir: Dataset root with one sub-directory per class
+        config: TrainingConfig (img_height, img_width, batch_size,
+            validation_split, test_split, seed, augment)
+        use_cache: Read from the tensor cache instead of decoding files
+    
+    Returns:
+        DatasetSplits with batched, prefetched pipelines
+    """
+    import tensorflow as tf
+    
+    img_size = (config.img_height, config.img_width)
+    if use_cache:
+        from models.tensor_cache import TensorCache
+        
+        cached = TensorCache(dataset_dir, img_size=img_size).open()
+        labels, class_names = cached.labels, cached.class_names
+    else:
+        paths, labels, class_names = list_image_files(dataset_dir)
+    
+    indices = stratified_split(labels, config.validation_split, config.test_split, config.seed)
+    
+    def make(name: str) -> Any:
+        rows = indices[name]
+        training = name == "train"
+        if use_cache:
+            dataset = cached.as_tf_dataset(rows, config.batch_size, shuffle=training, seed=config.seed)
+        else:
+            dataset = decode_dataset(
+                [paths[i] for i in rows], labels[rows], img_size, config.batch_size,
+                shuffle=training, seed=config.seed
+            )
+        if training and config.augment:
+            dataset = dataset.map(
+                lambda images, batch_labels: augment_batch(images, batch_labels, config.seed),
+                num_parallel_calls=tf.data.AUTOTUNE
+            )
+        return dataset.prefetch(tf.data.AUTOTUNE)
+    
+    return DatasetSplits(
+        train=make("train"),
+        validation=make("validation"),
+        test=make("test") if len(indices["test"]) else None,
+        class_names=class_names,
+        counts={name: int(len(rows)) for name, rows in indices.items()}
+    )
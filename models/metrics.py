@@ -0,0 +1,268 @@
+"""
+Latency metrics module for ATK Classifier.
+Collects per-stage timings (decode, resize, array conversion, forward pass)
+into rolling histograms and pushes snapshots to pluggable sinks.
+"""
+from typing import Any, Callable, Dict, List, Optional, Union
+from collections import deque
+from contextlib import nullcontext
+from pathlib import Path
+import threading
+import logging
+import time
+import os
+
+import numpy as np
+
+# Shared no-op context returned by timer() while metrics are disabled
+_NULL_TIMER = nullcontext()
+
+# Stage name -> {"count", "sum_sec", "p50_ms", "p95_ms", "p99_ms"}
+Snapshot = Dict[str, Dict[str, float]]
+
+
+class RollingHistogram:
+    """
+    Thread-safe latency histogram over the most recent observations.
+    
+    Percentiles cover the last ``window`` observations; count and sum are
+    cumulative, matching Prometheus summary semantics.
+    """
+    
+    def __init__(self, window: int = 1024):
+        """
+        Initialize an empty histogram.
+        
+        Args:
+            window: Number of recent observations kept for percentiles
+        """
+        self._values: deque = deque(maxlen=window)
+        self._count = 0
+        self._sum = 0.0
+        self._lock = threading.Lock()
+    
+    def observe(self, seconds: float) -> None:
+        """Record one duration in seconds."""
+        with self._lock:
+            self._values.append(seconds)
+            self._count += 1
+            self._sum += seconds
+    
+    def snapshot(self) -> Dict[str, float]:
+        """
+        Summarize the histogram.
+        
+        Returns:
+            Dictionary with cumulative count and sum_sec, and p50/p95/p99 in
+            milliseconds over the window (None before the first observation)
+        """
+        with self._lock:
+            values = np.array(self._values, dtype=np.float64)
+            count, total = self._count, self._sum
+        
+        summary = {"count": count, "sum_sec": total, "p50_ms": None, "p95_ms": None, "p99_ms": None}
+        if values.size:
+            p50, p95, p99 = np.percentile(values, [50, 95, 99]) * 1000
+            summary.update(p50_ms=float(p50), p95_ms=float(p95), p99_ms=float(p99))
+        return summary
+
+
+class _Timer:
+    """Context manager that records its duration under a stage name."""
+    
+    __slots__ = ("_registry", "_stage", "_start")
+    
+    def __init__(self, registry: "MetricsRegistry", stage: str):
+        self._registry = registry
+        self._stage = stage
+    
+    def __enter__(self) -> "_Timer":
+        self._start = time.perf_counter()
+        return self
+    
+    def __exit__(self, *exc_info: Any) -> None:
+        self._registry.observe(self._stage, time.perf_counter() - self._start)
+
+
+class LoggingSink:
+    """Sink that logs one line per stage."""
+    
+    def __init__(self, logger: Optional[logging.Logger] = None, level: int = logging.INFO):
+        """
+        Initialize the sink.
+        
+        Args:
+            logger: Logger to write to (default: 'atk_classifier.metrics')
+            level: Log level of the summary lines
+        """
+        self.logger = logger or logging.getLogger("atk_classifier.metrics")
+        self.level = level
+    
+    def emit(self, snapshot: Snapshot) -> None:
+        """Log a metrics snapshot."""
+        for stage, summary in snapshot.items():
+            if summary["p50_ms"] is None:
+                continue
+            self.logger.log(
+                self.level,
+                "%s: count=%d p50=%.2fms p95=%.2fms p99=%.2fms",
+                stage, summary["count"], summary["p50_ms"], summary["p95_ms"], summary["p99_ms"]
+            )
+
+
+class PrometheusTextfileSink:
+    """
+    Sink that writes a Prometheus text-format file (node_exporter textfile collector).
+    
+    Each stage becomes one series of the ``<prefix>_stage_duration_seconds``
+    summary. The file is replaced atomically so scrapers never read a partial write.
+    """
+    
+    def __init__(self, path: Union[str, Path], prefix: str = "atk_classifier"):
+        """
+        Initialize the sink.
+        
+        Args:
+            path: Destination .prom file
+            prefix: Metric name prefix
+        """
+        self.path = Path(path)
+        self.metric = f"{prefix}_stage_duration_seconds"
+    
+    def emit(self, snapshot: Snapshot) -> None:
+        """Write a metrics snapshot to the text file."""
+        lines = [
+            f"# HELP {self.metric} Inference stage latency in seconds.",
+            f"# TYPE {self.metric} summary"
+        ]
+        for stage, summary in sorted(snapshot.items()):
+            for quantile, key in (("0.5", "p50_ms"), ("0.95", "p95_ms"), ("0.99", "p99_ms")):
+                if summary[key] is not None:
+                    lines.append(f'{self.metric}{{stage="{stage}",quantile="{quantile}"}} {summary[key] / 1000:.9f}')
+            lines.append(f'{self.metric}_sum{{stage="{stage}"}} {summary["sum_sec"]:.9f}')
+            lines.append(f'{self.metric}_count{{stage="{stage}"}} {summary["count"]}')
+        
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_name(self.path.name + ".tmp")
+        tmp_path.write_text("\n".join(lines) + "\n")
+        os.replace(tmp_path, self.path)
+
+
+class MetricsRegistry:
+    """
+    Per-stage latency histograms with hooks and pluggable sinks.
+    
+    Disabled registries hand out a shared no-op context manager, so
+    instrumented code costs one attribute check per stage.
+    """
+    
+    def __init__(self, enabled: bool = False, window: int = 1024):
+        """
+        Initialize the registry.
+        
+        Args:
+            enabled: Record timings (False = timers are no-ops)
+            window: Observations kept per stage for percentiles
+        """
+        self.enabled = enabled
+        self.window = window
+        self._histograms: Dict[str, RollingHistogram] = {}
+        self._hooks: List[Callable[[str, float], None]] = []
+        self._sinks: List[Any] = []
+        self._lock = threading.Lock()
+        self._reporter: Optional[threading.Thread] = None
+        self._stop_reporter = threading.Event()
+    
+    def timer(self, stage: str) -> Any:
+        """
+        Time a block of code under a stage name.
+        
+        Args:
+            stage: Stage name (e.g. 'decode', 'forward')
+        
+        Returns:
+            Context manager recording the block's duration
+        """
+        if not self.enabled:
+            return _NULL_TIMER
+        return _Timer(self, stage)
+    
+    def observe(self, stage: str, seconds: float) -> None:
+        """
+        Record a duration and pass it to the hooks.
+        
+        Args:
+            stage: Stage name
+            seconds: Duration in seconds
+        """
+        histogram = self._histograms.get(stage)
+        if histogram is None:
+            with self._lock:
+                histogram = self._histograms.setdefault(stage, RollingHistogram(self.window))
+        histogram.observe(seconds)
+        for hook in self._hooks:
+            hook(stage, seconds)
+    
+    def add_hook(self, hook: Callable[[str, float], None]) -> None:
+        """Register a function called with (stage, seconds) on every observation."""
+        self._hooks = self._hooks + [hook]
+    
+    def add_sink(self, sink: Any) -> None:
+        """Register a sink, any object with an ``emit(snapshot)`` method."""
+        self._sinks = self._sinks + [sink]
+    
+    def snapshot(self) -> Snapshot:
+        """
+        Summarize every stage.
+        
+        Returns:
+            Mapping of stage name to RollingHistogram.snapshot()
+        """
+        with self._lock:
+            histograms = dict(self._histograms)
+        return {stage: histogram.snapshot() for stage, histogram in sorted(histograms.items())}
+    
+    def flush(self) -> None:
+        """Push the current snapshot to every sink."""
+        snapshot = self.snapshot()
+        for sink in self._sinks:
+            sink.emit(snapshot)
+    
+    def reset(self) -> None:
+        """Drop all recorded timings."""
+        with self._lock:
+            self._histograms = {}
+    
+    def start_reporter(self, interval_sec: float = 60.0) -> None:
+        """
+        Flush to the sinks every interval_sec on a daemon thread.
+        
+        Args:
+            interval_sec: Seconds between flushes
+        """
+        if self._reporter is not None and self._reporter.is_alive():
+            return
+        self._stop_reporter.clear()
+        
+        def report() -> None:
+            while not self._stop_reporter.wait(interval_sec):
+                try:
+                    self.flush()
+                except Exception as e:
+                    print(f"Metrics flush failed: {e}")
+        
+        self._reporter = threading.Thread(target=report, name="MetricsReporter", daemon=True)
+        self._reporter.start()
+    
+    def stop_reporter(self) -> None:
+        """Stop the reporter thread after a final flush."""
+        if self._reporter is None:
+            return
+        self._stop_reporter.set()
+        self._reporter.join()
+        self._reporter = None
+        self.flush()
+
+
+# Process-wide registry used by the preprocessing, prediction and pipeline stages
+metrics = MetricsRegistry()
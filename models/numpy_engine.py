@@ -0,0 +1,357 @@
+"""
+NumPy inference engine for ATK Classifier.
+Runs the ATKClassifier architecture without TensorFlow using im2col/GEMM
+convolutions, so the app can serve predictions from exported weights alone.
+"""
+from typing import Any, Dict, List, Tuple, Union
+from pathlib import Path
+import json
+import sys
+import os
+
+import numpy as np
+
+
+# Keras layer classes the engine knows how to run
+SUPPORTED_LAYERS = {
+    "InputLayer", "Rescaling", "Conv2D", "MaxPooling2D",
+    "Flatten", "Dense", "Dropout", "GlobalAveragePooling2D"
+}
+
+ARCHITECTURE_KEY = "__architecture__"
+
+# Architecture file inside a memory-mappable weight directory
+ARCHITECTURE_FILE = "architecture.json"
+
+
+def _collect_weights(model: Any) -> Tuple[Dict[str, Any], Dict[str, np.ndarray]]:
+    """
+    Describe a Keras model as an architecture dict plus named weight arrays.
+    
+    Args:
+        model: Keras Sequential model built by ATKClassifier/ATKModelTrainer
+    
+    Returns:
+        Tuple of (architecture, {weight name: float32 array})
+    """
+    layer_specs: List[Dict[str, Any]] = []
+    arrays: Dict[str, np.ndarray] = {}
+    
+    for i, layer in enumerate(model.layers):
+        layer_type = type(layer).__name__
+        if layer_type not in SUPPORTED_LAYERS:
+            raise ValueError(f"Unsupported layer for NumPy engine: {layer_type}")
+        
+        config = layer.get_config()
+        spec: Dict[str, Any] = {"type": layer_type, "name": layer.name}
+        
+        if layer_type == "Rescaling":
+            spec["scale"] = float(config["scale"])
+            spec["offset"] = float(config["offset"])
+        elif layer_type == "Conv2D":
+            spec["padding"] = config["padding"]
+            spec["strides"] = list(config["strides"])
+            spec["activation"] = config["activation"]
+        elif layer_type == "MaxPooling2D":
+            spec["pool_size"] = list(config["pool_size"])
+            spec["strides"] = list(config["strides"] or config["pool_size"])
+            spec["padding"] = config["padding"]
+        elif layer_type == "Dense":
+            spec["activation"] = config["activation"]
+        
+        if layer_type in ("Conv2D", "Dense"):
+            kernel, bias = layer.get_weights()
+            spec["kernel"] = f"layer{i}_kernel"
+            spec["bias"] = f"layer{i}_bias"
+            arrays[spec["kernel"]] = kernel.astype(np.float32)
+            arrays[spec["bias"]] = bias.astype(np.float32)
+        
+        layer_specs.append(spec)
+    
+    architecture = {
+        "input_shape": list(model.input_shape[1:]),
+        "layers": layer_specs
+    }
+    return architecture, arrays
+
+
+def export_weights(model: Any, output_path: Union[str, Path]) -> Path:
+    """
+    Export a Keras model's architecture and weights to a .npz file.
+    
+    Args:
+        model: Keras Sequential model built by ATKClassifier/ATKModelTrainer
+        output_path: Destination .npz path
+    
+    Returns:
+        Path of the written file
+    """
+    architecture, arrays = _collect_weights(model)
+    arrays[ARCHITECTURE_KEY] = np.array(json.dumps(architecture))
+    
+    output_path = Path(output_path)
+    np.savez(output_path, **arrays)
+    return output_path
+
+
+def export_weight_dir(model: Any, output_dir: Union[str, Path]) -> Path:
+    """
+    Export a Keras model to a weight directory that can be memory-mapped.
+    
+    Args:
+        model: Keras Sequential model built by ATKClassifier/ATKModelTrainer
+        output_dir: Destination directory (e.g. models/best_model.weights)
+    
+    Returns:
+        Path of the written directory
+    """
+    return write_weight_dir(*_collect_weights(model), output_dir)
+
+
+def write_weight_dir(
+    architecture: Dict[str, Any],
+    weights: Dict[str, np.ndarray],
+    output_dir: Union[str, Path]
+) -> Path:
+    """
+    Write an architecture and weights as architecture.json plus one .npy per array.
+    
+    Unlike .npz (a zip archive that has to be read into memory), plain .npy
+    files can be opened with ``mmap_mode='r'``, so every serving process maps
+    the same page-cache copy of the weights. Files are replaced atomically;
+    processes that still map the old files keep their old pages.
+    
+    Args:
+        architecture: Dict with 'input_shape' and 'layers'
+        weights: Mapping of weight names to arrays
+        output_dir: Destination directory
+    
+    Returns:
+        Path of the written directory
+    """
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    
+    for name, array in weights.items():
+        tmp_path = output_dir / f"{name}.npy.tmp"
+        with open(tmp_path, 'wb') as f:
+            np.save(f, np.ascontiguousarray(array, dtype=np.float32))
+        os.replace(tmp_path, output_dir / f"{name}.npy")
+    
+    # Written last: a directory without it is an incomplete export
+    tmp_path = output_dir / f"{ARCHITECTURE_FILE}.tmp"
+    with open(tmp_path, 'w') as f:
+        json.dump(architecture, f, indent=2)
+    os.replace(tmp_path, output_dir / ARCHITECTURE_FILE)
+    return output_dir
+
+
+def _activation(x: np.ndarray, name: str) -> np.ndarray:
+    """Apply a Keras activation by name."""
+    if name == "relu":
+        return np.maximum(x, 0, out=x)
+    if name == "softmax":
+        x = x - x.max(axis=-1, keepdims=True)
+        np.exp(x, out=x)
+        x /= x.sum(axis=-1, keepdims=True)
+        return x
+    if name == "linear":
+        return x
+    raise ValueError(f"Unsupported activation: {name}")
+
+
+def conv2d(
+    x: np.ndarray,
+    kernel: np.ndarray,
+    bias: np.ndarray,
+    strides: tuple = (1, 1),
+    padding: str = "same"
+) -> np.ndarray:
+    """
+    2D convolution via im2col and a single GEMM.
+    
+    Args:
+        x: Input with shape (N, H, W, C_in)
+        kernel: Keras kernel with shape (kh, kw, C_in, C_out)
+        bias: Bias with shape (C_out,)
+        strides: (stride_h, stride_w)
+        padding: 'same' or 'valid'
+    
+    Returns:
+        Output with shape (N, H_out, W_out, C_out)
+    """
+    kh, kw, c_in, c_out = kernel.shape
+    sh, sw = strides
+    
+    if padding == "same":
+        # Same split as TensorFlow: extra padding goes to the bottom/right
+        pad_h = max((-(-x.shape[1] // sh) - 1) * sh + kh - x.shape[1], 0)
+        pad_w = max((-(-x.shape[2] // sw) - 1) * sw + kw - x.shape[2], 0)
+        x = np.pad(x, (
+            (0, 0),
+            (pad_h // 2, pad_h - pad_h // 2),
+            (pad_w // 2, pad_w - pad_w // 2),
+            (0, 0)
+        ))
+    elif padding != "valid":
+        raise ValueError(f"Unsupported padding: {padding}")
+    
+    # (N, H_out, W_out, C_in, kh, kw) view, no copy yet
+    windows = np.lib.stride_tricks.sliding_window_view(x, (kh, kw), axis=(1, 2))
+    windows = windows[:, ::sh, ::sw]
+    n, h_out, w_out = windows.shape[:3]
+    
+    # Reorder kernel to (C_in, kh, kw) rows so the window view needs no transpose
+    cols = windows.reshape(n * h_out * w_out, c_in * kh * kw)
+    weights = kernel.transpose(2, 0, 1, 3).reshape(c_in * kh * kw, c_out)
+    
+    out = cols @ weights
+    out += bias
+    return out.reshape(n, h_out, w_out, c_out)
+
+
+def max_pool2d(x: np.ndarray, pool_size: tuple = (2, 2), strides: tuple = (2, 2), padding: str = "valid") -> np.ndarray:
+    """
+    Max pooling for non-overlapping windows (pool_size == strides, 'valid').
+    
+    Args:
+        x: Input with shape (N, H, W, C)
+        pool_size: (ph, pw)
+        strides: Must equal pool_size
+        padding: Must be 'valid'
+    
+    Returns:
+        Pooled output with shape (N, H // ph, W // pw, C)
+    """
+    ph, pw = pool_size
+    if tuple(strides) != (ph, pw) or padding != "valid":
+        raise ValueError("NumPy engine only supports non-overlapping 'valid' max pooling")
+    
+    n, h, w, c = x.shape
+    h_out, w_out = h // ph, w // pw
+    x = x[:, :h_out * ph, :w_out * pw]
+    return x.reshape(n, h_out, ph, w_out, pw, c).max(axis=(2, 4))
+
+
+class NumpyCNN:
+    """Vectorized NumPy forward pass for exported ATKClassifier weights."""
+    
+    def __init__(self, architecture: Dict[str, Any], weights: Dict[str, np.ndarray]):
+        """
+        Initialize engine from an architecture description and weight arrays.
+        
+        Args:
+            architecture: Dict with 'input_shape' and 'layers' (from export_weights)
+            weights: Mapping of weight names to arrays
+        """
+        self.input_shape = tuple(architecture["input_shape"])
+        self.layers = architecture["layers"]
+        self.weights = weights
+        
+        for spec in self.layers:
+            if spec["type"] not in SUPPORTED_LAYERS:
+                raise ValueError(f"Unsupported layer for NumPy engine: {spec['type']}")
+    
+    @classmethod
+    def load(cls, path: Union[str, Path], mmap: bool = True) -> "NumpyCNN":
+        """
+        Load an engine from a .npz file or a weight directory.
+        
+        Weight directories (written by export_weight_dir) are memory-mapped
+        read-only by default, so N serving processes share one copy of the
+        weights in the page cache instead of holding N private copies.
+        
+        Args:
+            path: Path to .npz weight file or weight directory
+            mmap: Memory-map .npy weights instead of reading them into memory
+        
+        Returns:
+            NumpyCNN instance
+        """
+        path = Path(path)
+        if path.is_dir():
+            with open(path / ARCHITECTURE_FILE, 'r') as f:
+                architecture = json.load(f)
+            mmap_mode = 'r' if mmap else None
+            weights = {
+                weight_path.stem: np.load(weight_path, mmap_mode=mmap_mode)
+                for weight_path in sorted(path.glob("*.npy"))
+            }
+            return cls(architecture, weights)
+        
+        with np.load(str(path)) as data:
+            architecture = json.loads(str(data[ARCHITECTURE_KEY]))
+            weights = {key: data[key] for key in data.files if key != ARCHITECTURE_KEY}
+        return cls(architecture, weights)
+    
+    @property
+    def architecture(self) -> Dict[str, Any]:
+        """Architecture dict in the format written by the exporters."""
+        return {"input_shape": list(self.input_shape), "layers": self.layers}
+    
+    def __call__(self, batch: np.ndarray) -> np.ndarray:
+        """
+        Run the forward pass.
+        
+        Args:
+            batch: Input with shape (N, H, W, 3), uint8 or float pixel values in [0, 255]
+        
+        Returns:
+            Output probabilities with shape (N, num_classes)
+        """
+        x = np.asarray(batch, dtype=np.float32)
+        
+        for spec in self.layers:
+            layer_type = spec["type"]
+            
+            if layer_type == "Rescaling":
+                x = x * np.float32(spec["scale"]) + np.float32(spec["offset"])
+            elif layer_type == "Conv2D":
+                x = conv2d(
+                    x,
+                    self.weights[spec["kernel"]],
+                    self.weights[spec["bias"]],
+                    strides=tuple(spec["strides"]),
+                    padding=spec["padding"]
+                )
+                x = _activation(x, spec["activation"])
+            elif layer_type == "MaxPooling2D":
+                x = max_pool2d(x, tuple(spec["pool_size"]), tuple(spec["strides"]), spec["padding"])
+            elif layer_type == "GlobalAveragePooling2D":
+                x = x.mean(axis=(1, 2))
+            elif layer_type == "Flatten":
+                x = x.reshape(len(x), -1)
+            elif layer_type == "Dense":
+                x = x @ self.weights[spec["kernel"]] + self.weights[spec["bias"]]
+                x = _activation(x, spec["activation"])
+            # InputLayer and Dropout are no-ops at inference time
+        
+        return x
+
+
+if __name__ == "__main__":
+    # Export a trained Keras model:  python -m models.numpy_engine models/best_model.keras [models/best_model.npz]
+    # Memory-mappable directory:     python -m models.numpy_engine models/best_model.keras models/best_model.weights
+    # Convert an existing .npz:      python -m models.numpy_engine models/best_model.npz [models/best_model.weights]
+    if len(sys.argv) < 2:
+        print("Usage: python -m models.numpy_engine <model.keras|model.npz> [output.npz|output_dir]")
+        sys.exit(1)
+    
+    source = Path(sys.argv[1])
+    default_suffix = ".weights" if source.suffix.lower() == ".npz" else ".npz"
+    target = Path(sys.argv[2]) if len(sys.argv) > 2 else source.with_suffix(default_suffix)
+    
+    if source.suffix.lower() == ".npz":
+        engine = NumpyCNN.load(source, mmap=False)
+        if target.suffix.lower() == ".npz":
+            raise SystemExit("Source is already a .npz file")
+        write_weight_dir(engine.architecture, engine.weights, target)
+    else:
+        from tensorflow import keras
+        
+        model = keras.models.load_model(str(source))
+        if target.suffix.lower() == ".npz":
+            export_weights(model, target)
+        else:
+            export_weight_dir(model, target)
+    print(f"Exported NumPy weights to: {target}")
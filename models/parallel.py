@@ -0,0 +1,159 @@
+"""
+Parallel preprocessing module for ATK Classifier.
+Decodes and resizes images on a worker pool while the predictor runs the
+previous batch, for scoring large image folders.
+"""
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+from concurrent.futures import ThreadPoolExecutor
+import itertools
+import threading
+import queue
+import os
+
+import numpy as np
+
+from models.preprocessing import ImagePreprocessor
+
+# Marks the end of the batch stream
+_DONE = object()
+
+
+class ParallelPreprocessor:
+    """
+    Preprocessing stage that fills batch buffers on a thread pool.
+    
+    PIL releases the GIL while decoding and resizing, so threads scale with
+    cores without pickling images between processes. A fixed ring of
+    ``prefetch_batches + 1`` uint8 buffers bounds memory: the producer blocks
+    until the consumer hands a buffer back by asking for the next batch.
+    """
+    
+    def __init__(
+        self,
+        preprocessor: ImagePreprocessor,
+        num_workers: Optional[int] = None,
+        prefetch_batches: int = 2
+    ):
+        """
+        Initialize the preprocessing stage.
+        
+        Args:
+            preprocessor: ImagePreprocessor used by every worker (normalize=False)
+            num_workers: Decode threads (None = os.cpu_count())
+            prefetch_batches: Batches decoded ahead of the consumer
+        """
+        self.preprocessor = preprocessor
+        self.num_workers = max(1, num_workers or os.cpu_count() or 1)
+        self.prefetch_batches = max(1, prefetch_batches)
+    
+    def iter_batches(
+        self,
+        image_sources: Iterable[Any],
+        batch_size: int = 16
+    ) -> Iterator[Tuple[List[Any], np.ndarray, Dict[int, Exception]]]:
+        """
+        Preprocess image sources into batches, decoding ahead of the consumer.
+        
+        A yielded batch is only valid until the next batch is requested, when
+        its buffer goes back to the producer.
+        
+        Args:
+            image_sources: Iterable of image sources (path, bytes, BytesIO, or PIL Image)
+            batch_size: Images per batch
+        
+        Yields:
+            Tuples of (sources, uint8 batch with shape (len(sources), H, W, 3),
+            {index in batch: exception} for images that failed to preprocess)
+        """
+        width, height = self.preprocessor.input_size
+        free_buffers: "queue.Queue[np.ndarray]" = queue.Queue()
+        for _ in range(self.prefetch_batches + 1):
+            free_buffers.put(np.empty((batch_size, height, width, 3), dtype=np.uint8))
+        ready: "queue.Queue[Any]" = queue.Queue(maxsize=self.prefetch_batches)
+        stop = threading.Event()
+        
+        producer = threading.Thread(
+            target=self._produce,
+            args=(iter(image_sources), batch_size, free_buffers, ready, stop),
+            name="ParallelPreprocessor",
+            daemon=True
+        )
+        producer.start()
+        
+        try:
+            while True:
+                item = ready.get()
+                if item is _DONE:
+                    break
+                if isinstance(item, BaseException):
+                    raise item
+                
+                sources, buffer, futures = item
+                errors = {}
+                for i, future in enumerate(futures):
+                    error = future.exception()
+                    if error is not None:
+                        errors[i] = error
+                
+                yield sources, buffer[:len(sources)], errors
+                free_buffers.put(buffer)
+        finally:
+            stop.set()
+            producer.join()
+    
+    def _produce(
+        self,
+        sources: Iterator[Any],
+        batch_size: int,
+        free_buffers: "queue.Queue[np.ndarray]",
+        ready: "queue.Queue[Any]",
+        stop: threading.Event
+    ) -> None:
+        """Producer thread: submit decode tasks batch by batch, bounded by free buffers."""
+        try:
+            with ThreadPoolExecutor(max_workers=self.num_workers, thread_name_prefix="preprocess") as executor:
+                while not stop.is_set():
+                    chunk = list(itertools.islice(sources, batch_size))
+                    if not chunk:
+                        break
+                    
+                    buffer = self._get(free_buffers, stop)
+                    if buffer is None:
+                        return
+                    
+                    futures = [
+                        executor.submit(self._preprocess_one, source, buffer, i)
+                        for i, source in enumerate(chunk)
+                    ]
+                    if not self._put(ready, (chunk, buffer, futures), stop):
+                        return
+        except Exception as e:
+            # Failures outside a single image (e.g. the source iterator) end the stream
+            self._put(ready, e, stop)
+        finally:
+            self._put(ready, _DONE, stop)
+    
+    def _preprocess_one(self, image_source: Any, buffer: np.ndarray, index: int) -> None:
+        """Decode and resize one image into its row of the batch buffer."""
+        self.preprocessor.preprocess_into([image_source], buffer[index:index + 1])
+    
+    @staticmethod
+    def _get(q: queue.Queue, stop: threading.Event) -> Any:
+        """Blocking get that gives up once the consumer has stopped."""
+        while not stop.is_set():
+            try:
+                return q.get(timeout=0.1)
+            except queue.Empty:
+                continue
+        return None
+    
+    @staticmethod
+    def _put(q: queue.Queue, item: Any, stop: threading.Event) -> bool:
+        """Blocking put that gives up once the consumer has stopped."""
+        while not stop.is_set():
+            try:
+                q.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
@@ -2,27 +2,65 @@
 Preprocessing module for ATK Classifier.
 Handles image loading, validation, resizing, and normalization.
 """
-from typing import Union, Dict, Any, Tuple, List
+from typing import Union, Dict, Any, Tuple, List, Iterable
 from pathlib import Path
 import io
+import threading
 
 import numpy as np
 from PIL import Image
 
+from models.metrics import metrics
+
+# Image file extensions read from dataset and batch folders
+IMAGE_EXTENSIONS = {".jpg", ".jpeg", ".png"}
+
 
 class ImagePreprocessor:
     """Handles image preprocessing for CNN model input."""
     
-    def __init__(self, input_size: Tuple[int, int] = (300, 300), normalize: bool = True):
+    # Fast decode keeps at least this many source pixels per target pixel
+    # before the final resample (same idea as Image.thumbnail's reducing_gap)
+    REDUCING_GAP = 2.0
+    
+    # Resampling filters selectable by name
+    RESAMPLE_FILTERS = {
+        "nearest": Image.Resampling.NEAREST,
+        "box": Image.Resampling.BOX,
+        "bilinear": Image.Resampling.BILINEAR,
+        "hamming": Image.Resampling.HAMMING,
+        "bicubic": Image.Resampling.BICUBIC,
+        "lanczos": Image.Resampling.LANCZOS,
+    }
+    
+    def __init__(
+        self,
+        input_size: Tuple[int, int] = (300, 300),
+        normalize: bool = True,
+        fast_decode: bool = False,
+        resample: str = "lanczos"
+    ):
         """
         Initialize preprocessor with target input size.
         
         Args:
             input_size: Target dimensions (width, height) for resizing
             normalize: Whether to normalize pixel values (set False if model has Rescaling layer)
+            fast_decode: Decode JPEGs at reduced size (DCT scaling via Image.draft) and
+                shrink other formats with reduce() before the final resample
+            resample: Resampling filter name (see RESAMPLE_FILTERS)
         """
+        if resample not in self.RESAMPLE_FILTERS:
+            raise ValueError(
+                f"Unknown resample filter: {resample}. Choose from: {', '.join(self.RESAMPLE_FILTERS)}"
+            )
+        
         self.input_size = input_size
         self.normalize = normalize
+        self.fast_decode = fast_decode
+        self.resample = resample
+        # Per-thread batch buffers reused across calls
+        self._local = threading.local()
     
     def load_image(self, image_source: Union[str, Path, bytes, io.BytesIO, Image.Image]) -> Image.Image:
         """
@@ -55,8 +93,39 @@ class ImagePreprocessor:
         Returns:
             Resized PIL Image
         """
-        return image.resize(self.input_size, Image.Resampling.LANCZOS)
-
+        # Pillow silently uses NEAREST for palette/bilevel images, so convert
+        # first to make the configured filter apply
+        if image.mode in ("P", "1"):
+            image = image.convert("RGBA" if "transparency" in image.info else "RGB")
+        
+        resample = self.RESAMPLE_FILTERS[self.resample]
+        if self.fast_decode:
+            return image.resize(self.input_size, resample, reducing_gap=self.REDUCING_GAP)
+        return image.resize(self.input_size, resample)
+    
+    def _load_resized(self, image_source: Union[str, Path, bytes, io.BytesIO, Image.Image]) -> Image.Image:
+        """
+        Load and resize an image, decoding JPEGs close to the target size in fast mode.
+        
+        Args:
+            image_source: Image source (path, bytes, BytesIO, or PIL Image)
+        
+        Returns:
+            Resized PIL Image
+        """
+        with metrics.timer("decode"):
+            image = self.load_image(image_source)
+        
+            # Only draft images we opened ourselves; drafting mutates the caller's Image
+            if self.fast_decode and not isinstance(image_source, Image.Image) and image.format == "JPEG":
+                width, height = self.input_size
+                image.draft(None, (int(width * self.REDUCING_GAP), int(height * self.REDUCING_GAP)))
+            # Decode now so the resize timing excludes it
+            image.load()
+        
+        with metrics.timer("resize"):
+            return self.resize_image(image)
+    
     def normalize_image(self, image: Image.Image) -> np.ndarray:
         """
         Convert image to RGB and optionally normalize pixel values to [0, 1] range.
@@ -91,19 +160,91 @@ class ImagePreprocessor:
         Returns:
             Preprocessed numpy array with shape (1, height, width, 3)
         """
-        # Load image
-        image = self.load_image(image_source)
+        return self.preprocess_batch([image_source])
+    
+    def preprocess_batch(
+        self,
+        image_sources: Iterable[Union[str, Path, bytes, io.BytesIO, Image.Image]]
+    ) -> np.ndarray:
+        """
+        Preprocess many images into a single batch array.
         
-        # Resize to target dimensions
-        image = self.resize_image(image)
+        Args:
+            image_sources: Iterable of image sources (path, bytes, BytesIO, or PIL Image)
+        
+        Returns:
+            Preprocessed numpy array with shape (N, height, width, 3)
+        """
+        image_sources = list(image_sources)
+        width, height = self.input_size
+        batch = np.empty((len(image_sources), height, width, 3), dtype=np.float32)
+        return self.preprocess_into(image_sources, batch)
+    
+    def preprocess_into(
+        self,
+        image_sources: Iterable[Union[str, Path, bytes, io.BytesIO, Image.Image]],
+        out: np.ndarray
+    ) -> np.ndarray:
+        """
+        Preprocess images straight into a caller-supplied batch buffer.
         
-        # Normalize and convert to RGB
-        img_array = self.normalize_image(image)
+        Resized pixels are copied (and cast) straight into ``out[i]``, so no
+        per-image float arrays are allocated.
         
-        # Add batch dimension
-        img_array = np.expand_dims(img_array, axis=0)
+        Args:
+            image_sources: Iterable of image sources (path, bytes, BytesIO, or PIL Image)
+            out: Buffer with shape (N, height, width, 3), dtype uint8 or float32
         
-        return img_array
+        Returns:
+            View of ``out`` holding the preprocessed images, shape (len(image_sources), height, width, 3)
+        """
+        width, height = self.input_size
+        if out.ndim != 4 or out.shape[1:] != (height, width, 3):
+            raise ValueError(f"Buffer shape {out.shape} does not match (N, {height}, {width}, 3)")
+        if out.dtype not in (np.uint8, np.float32):
+            raise ValueError(f"Unsupported buffer dtype: {out.dtype}")
+        if self.normalize and out.dtype == np.uint8:
+            raise ValueError("uint8 buffers cannot hold normalized pixels; use normalize=False")
+        
+        count = 0
+        for image_source in image_sources:
+            if count >= len(out):
+                raise ValueError(f"Buffer holds only {len(out)} images")
+            
+            image = self._load_resized(image_source)
+            with metrics.timer("to_array"):
+                if image.mode != 'RGB':
+                    image = image.convert('RGB')
+                target = out[count]
+                np.copyto(target, np.asarray(image), casting='unsafe')
+                if self.normalize:
+                    np.divide(target, 255.0, out=target)
+            count += 1
+        
+        return out[:count]
+    
+    def get_batch_buffer(self, batch_size: int, dtype: Any = np.uint8) -> np.ndarray:
+        """
+        Get a reusable per-thread batch buffer for preprocess_into.
+        
+        The buffer only grows, so steady-state serving allocates nothing. The
+        returned view is overwritten by the next call on the same thread.
+        
+        Args:
+            batch_size: Number of images the buffer must hold
+            dtype: Buffer dtype (uint8 or float32)
+        
+        Returns:
+            Buffer view with shape (batch_size, height, width, 3)
+        """
+        buffers = self._local.__dict__.setdefault('batch_buffers', {})
+        dtype = np.dtype(dtype)
+        buffer = buffers.get(dtype)
+        if buffer is None or len(buffer) < batch_size:
+            width, height = self.input_size
+            buffer = np.empty((max(batch_size, 1), height, width, 3), dtype=dtype)
+            buffers[dtype] = buffer
+        return buffer[:batch_size]
     
     def preprocess_for_model_with_rescaling(self, image_source: Union[str, Path, bytes, io.BytesIO, Image.Image]) -> np.ndarray:
         """
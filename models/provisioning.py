@@ -0,0 +1,426 @@
+"""
+Model provisioning for ATK Classifier.
+Fetches the model artifact (local file, HTTP(S) URL or Google Drive) as an
+explicit step that can run in the background and reports progress, so the
+app can start in demo mode and switch to the real model once it lands.
+When the model's sidecar metadata records a SHA-256, downloads resume after
+interruption, are verified against it, and can be shared through a
+content-addressed cache directory so replicas on one host download once.
+"""
+from typing import Callable, Iterator, List, Optional, Union
+from contextlib import contextmanager
+from dataclasses import dataclass, replace
+from pathlib import Path
+from urllib.error import HTTPError
+from urllib.parse import urlparse
+from urllib.request import Request, url2pathname, urlopen
+import http.client
+import threading
+import hashlib
+import shutil
+import json
+import time
+import os
+
+from models.numpy_engine import ARCHITECTURE_FILE
+
+try:
+    import fcntl
+except ImportError:  # Windows: no cross-process cache lock
+    fcntl = None
+
+CHUNK_SIZE = 1024 * 1024
+
+# Errors worth retrying with a resumed download (see is_transient)
+TRANSIENT_ERRORS = (OSError, http.client.HTTPException)
+
+# OSErrors of a local source that retrying cannot fix
+PERMANENT_OS_ERRORS = (FileNotFoundError, IsADirectoryError, NotADirectoryError, PermissionError)
+
+# Progress callback: (bytes_done, bytes_total or None)
+ProgressCallback = Callable[[int, Optional[int]], None]
+
+
+@dataclass
+class ProvisioningStatus:
+    """Snapshot of a provisioning run."""
+    state: str  # 'idle', 'downloading', 'ready' or 'failed'
+    path: str
+    bytes_done: int = 0
+    bytes_total: Optional[int] = None
+    error: Optional[str] = None
+    
+    @property
+    def progress(self) -> Optional[float]:
+        """Fraction downloaded in [0, 1], or None when the size is unknown."""
+        if self.state == "ready":
+            return 1.0
+        if not self.bytes_total:
+            return None
+        return min(self.bytes_done / self.bytes_total, 1.0)
+
+
+def is_google_drive(source: str) -> bool:
+    """Check whether a source points at Google Drive."""
+    return urlparse(source).netloc in ("drive.google.com", "drive.usercontent.google.com")
+
+
+def is_transient(error: BaseException) -> bool:
+    """
+    Check whether a fetch error is worth retrying.
+    
+    HTTP 4xx responses (except 408 and 429) and a missing or unreadable local
+    source fail the same way on every attempt, so they are permanent.
+    
+    Args:
+        error: Exception raised by the fetcher
+    
+    Returns:
+        True for connection drops, timeouts and server-side HTTP errors
+    """
+    if isinstance(error, HTTPError):
+        return error.code >= 500 or error.code in (408, 429)
+    if isinstance(error, PERMANENT_OS_ERRORS):
+        return False
+    return isinstance(error, TRANSIENT_ERRORS)
+
+
+def file_sha256(path: Union[str, Path]) -> str:
+    """
+    Compute the SHA-256 hex digest of a file.
+    
+    Args:
+        path: File to hash
+    
+    Returns:
+        Lowercase hex digest
+    """
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def read_expected_sha256(model_path: Union[str, Path]) -> Optional[str]:
+    """
+    Read the model checksum recorded in its sidecar .json metadata.
+    
+    Args:
+        model_path: Model file path (the metadata is <stem>.json next to it)
+    
+    Returns:
+        Hex digest, or None if the metadata or its 'sha256' key is missing
+    """
+    metadata_path = Path(model_path).with_suffix(".json")
+    if not metadata_path.exists():
+        return None
+    with open(metadata_path, "r") as f:
+        sha256 = json.load(f).get("sha256")
+    return sha256.lower() if sha256 else None
+
+
+def fetch(
+    source: str,
+    destination: Union[str, Path],
+    progress_callback: Optional[ProgressCallback] = None,
+    resume: bool = False
+) -> Path:
+    """
+    Copy or download source to destination in chunks.
+    
+    Args:
+        source: Local path, file:// URL, http(s):// URL or Google Drive URL
+        destination: Output file path
+        progress_callback: Called with (bytes_done, bytes_total) after every chunk
+        resume: Continue an existing partial destination (HTTP Range request
+            or seek for local files) instead of starting over
+    
+    Returns:
+        Destination path
+    """
+    destination = Path(destination)
+    progress_callback = progress_callback or (lambda done, total: None)
+    scheme = urlparse(source).scheme
+    offset = destination.stat().st_size if resume and destination.exists() else 0
+    
+    if is_google_drive(source):
+        # Drive needs gdown for its virus-scan confirmation page; no chunk progress
+        import gdown
+        gdown.download(source, str(destination), quiet=True, resume=resume)
+        if not destination.exists():
+            raise IOError(f"gdown did not write {destination}")
+        progress_callback(destination.stat().st_size, destination.stat().st_size)
+        return destination
+    
+    if scheme in ("http", "https"):
+        request = Request(source, headers={"Range": f"bytes={offset}-"} if offset else {})
+        try:
+            response = urlopen(request, timeout=30)
+        except HTTPError as e:
+            if e.code == 416 and offset:
+                # Range starts at the end: the partial file is already complete
+                progress_callback(offset, offset)
+                return destination
+            raise
+        if offset and response.status != 206:
+            offset = 0  # Server ignored the Range header, start over
+        length = response.headers.get("Content-Length")
+        total = offset + int(length) if length else None
+    elif scheme == "file" or len(scheme) <= 1:
+        # Plain path (single-letter schemes are Windows drive letters)
+        path = url2pathname(urlparse(source).path) if scheme == "file" else source
+        response = open(path, "rb")
+        total = os.fstat(response.fileno()).st_size
+        offset = min(offset, total)
+        response.seek(offset)
+    else:
+        raise ValueError(f"Unsupported model source: {source}")
+    
+    done = offset
+    with response, open(destination, "ab" if offset else "wb") as out:
+        progress_callback(done, total)
+        while True:
+            chunk = response.read(CHUNK_SIZE)
+            if not chunk:
+                break
+            out.write(chunk)
+            done += len(chunk)
+            progress_callback(done, total)
+    
+    # urllib returns a short body instead of raising when the connection drops
+    if total is not None and done < total:
+        raise IOError(f"Connection closed after {done} of {total} bytes")
+    
+    return destination
+
+
+class ModelProvisioner:
+    """
+    Makes sure the model file exists, downloading it if needed.
+    
+    Downloads go to a ``.part`` file that is renamed into place only once
+    complete and verified, so a loader never sees a half-written model.
+    With a known checksum, interrupted downloads resume from the ``.part``
+    file; without one they start over. With a known
+    checksum and a ``cache_dir``, the verified file is stored as
+    ``<cache_dir>/<sha256>`` under a file lock, and every replica on the
+    host copies it from there instead of downloading again.
+    ``start()`` runs the same work on a daemon thread; ``status()`` reports
+    progress and ready callbacks fire once the file is in place.
+    """
+    
+    def __init__(
+        self,
+        source: Optional[str],
+        destination: Union[str, Path],
+        min_size_bytes: int = 0,
+        expected_sha256: Optional[str] = None,
+        cache_dir: Optional[Union[str, Path]] = None,
+        retries: int = 3,
+        fetcher: Callable[..., Path] = fetch
+    ):
+        """
+        Initialize the provisioner.
+        
+        Args:
+            source: Where to fetch the model from (path or URL); None for an
+                artifact that is only produced locally and never downloaded
+            destination: Where the model should live
+            min_size_bytes: Smaller files are treated as missing/corrupt
+            expected_sha256: Required checksum (None = size check only)
+            cache_dir: Shared content-addressed cache (used when the checksum is known)
+            retries: Extra attempts after a transient error, each resuming the download
+            fetcher: Function (source, destination, progress_callback, resume=...) doing the transfer
+        """
+        self.source = source
+        self.destination = Path(destination)
+        self.min_size_bytes = min_size_bytes
+        self.expected_sha256 = expected_sha256.lower() if expected_sha256 else None
+        self.cache_dir = Path(cache_dir) if cache_dir else None
+        self.retries = retries
+        self.fetcher = fetcher
+        self._status = ProvisioningStatus(state="idle", path=str(self.destination))
+        self._callbacks: List[Callable[[Path], None]] = []
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._finished = threading.Event()
+    
+    def is_present(self) -> bool:
+        """Check whether a valid model file is already at the destination."""
+        return self._is_valid(self.destination)
+    
+    def _is_valid(self, path: Path) -> bool:
+        """Check size and, when known, checksum of a model file."""
+        if path.is_dir():
+            # Locally exported NumPy weight directory; nothing to download
+            return (path / ARCHITECTURE_FILE).exists()
+        if not path.exists() or path.stat().st_size < self.min_size_bytes:
+            return False
+        return self.expected_sha256 is None or file_sha256(path) == self.expected_sha256
+    
+    def status(self) -> ProvisioningStatus:
+        """Get a snapshot of the current provisioning status."""
+        with self._lock:
+            return replace(self._status)
+    
+    def add_ready_callback(self, callback: Callable[[Path], None]) -> None:
+        """
+        Register a function to call with the model path once it is ready.
+        
+        Args:
+            callback: Function taking the model path; called immediately if already ready
+        """
+        with self._lock:
+            if self._status.state != "ready":
+                self._callbacks.append(callback)
+                return
+        callback(self.destination)
+    
+    def provision(self) -> ProvisioningStatus:
+        """
+        Fetch the model if needed, blocking until done.
+        
+        Returns:
+            Final ProvisioningStatus ('ready' or 'failed')
+        """
+        try:
+            try:
+                if not self.is_present():
+                    if self.source is None:
+                        raise FileNotFoundError(
+                            f"Model not found at {self.destination} and it has no download source"
+                        )
+                    if self.expected_sha256 and self.cache_dir:
+                        self._provision_from_cache()
+                    else:
+                        self._download(self.destination)
+                size = self.destination.stat().st_size
+                self._update(state="ready", bytes_done=size, bytes_total=size, error=None)
+            except Exception as e:
+                print(f"Failed to provision model: {e}")
+                self._update(state="failed", error=str(e))
+            
+            # Callbacks run before wait() returns, so waiters see the model swapped in
+            if self.status().state == "ready":
+                self._fire_callbacks()
+        finally:
+            self._finished.set()
+        
+        return self.status()
+    
+    def start(self) -> "ModelProvisioner":
+        """
+        Run provision() on a background thread (no-op if already started).
+        
+        Returns:
+            self, for chaining
+        """
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self.provision, name="ModelProvisioner", daemon=True)
+                self._thread.start()
+        return self
+    
+    def wait(self, timeout: Optional[float] = None) -> ProvisioningStatus:
+        """
+        Wait for a background run (including ready callbacks) to finish.
+        
+        Args:
+            timeout: Maximum seconds to wait (None = forever)
+        
+        Returns:
+            Current ProvisioningStatus
+        """
+        self._finished.wait(timeout)
+        return self.status()
+    
+    def _provision_from_cache(self) -> None:
+        """Fill <cache_dir>/<sha256> once per host, then copy it to the destination."""
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        cached = self.cache_dir / self.expected_sha256
+        
+        # Replicas block here while one of them downloads
+        with self._cache_lock(cached):
+            if not self._is_valid(cached):
+                self._download(cached)
+        
+        self.destination.parent.mkdir(parents=True, exist_ok=True)
+        staging = self.destination.with_name(self.destination.name + ".tmp")
+        shutil.copyfile(cached, staging)
+        os.replace(staging, self.destination)
+    
+    @contextmanager
+    def _cache_lock(self, cached: Path) -> Iterator[None]:
+        """Exclusive cross-process lock for one cache entry (no-op without fcntl)."""
+        with open(cached.with_name(cached.name + ".lock"), "a") as lock_file:
+            if fcntl is not None:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+    
+    def _download(self, target: Path) -> None:
+        """
+        Fetch into <target>.part (resuming), verify it, then rename into place.
+        
+        Transient errors keep the partial file and retry with a resumed
+        request; a size or checksum mismatch deletes it. Without a known
+        checksum a spliced file could not be verified, so every attempt
+        starts over instead of resuming. Permanent errors (HTTP 4xx, missing
+        local source) are raised immediately.
+        """
+        target.parent.mkdir(parents=True, exist_ok=True)
+        partial = target.with_name(target.name + ".part")
+        resume = self.expected_sha256 is not None
+        if not resume and partial.exists():
+            partial.unlink()
+        self._update(state="downloading", bytes_done=0, bytes_total=None)
+        
+        for attempt in range(self.retries + 1):
+            try:
+                self.fetcher(self.source, partial, self._on_progress, resume=resume)
+                break
+            except TRANSIENT_ERRORS as e:
+                if attempt == self.retries or not is_transient(e):
+                    raise
+                print(f"Model download interrupted ({e}), resuming...")
+                time.sleep(min(2 ** attempt, 10) * 0.1)
+        
+        try:
+            size = partial.stat().st_size
+            if size < self.min_size_bytes:
+                raise IOError(
+                    f"Downloaded model is too small ({size} bytes < {self.min_size_bytes}); "
+                    "the source may have returned an error page"
+                )
+            if self.expected_sha256:
+                digest = file_sha256(partial)
+                if digest != self.expected_sha256:
+                    raise IOError(f"Checksum mismatch: expected {self.expected_sha256}, got {digest}")
+        except Exception:
+            partial.unlink()
+            raise
+        
+        os.replace(partial, target)
+    
+    def _on_progress(self, bytes_done: int, bytes_total: Optional[int]) -> None:
+        """Record fetch progress."""
+        self._update(bytes_done=bytes_done, bytes_total=bytes_total)
+    
+    def _update(self, **changes) -> None:
+        """Atomically update status fields."""
+        with self._lock:
+            self._status = replace(self._status, **changes)
+    
+    def _fire_callbacks(self) -> None:
+        """Call and clear ready callbacks; a failing callback does not block the rest."""
+        with self._lock:
+            callbacks, self._callbacks = self._callbacks, []
+        for callback in callbacks:
+            try:
+                callback(self.destination)
+            except Exception as e:
+                print(f"Model ready callback failed: {e}")
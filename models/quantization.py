@@ -0,0 +1,346 @@
+"""
+Post-training int8 quantization for ATK Classifier.
+Calibrates a full-integer TFLite model on dataset_alat_tulis and reports
+accuracy, size and latency against the float model.
+"""
+import sys
+import json
+import random
+import time
+from pathlib import Path
+from datetime import datetime
+from typing import Optional, Dict, Any, List, Tuple, Iterator
+from dataclasses import dataclass, asdict
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import numpy as np
+
+from models.preprocessing import IMAGE_EXTENSIONS, ImagePreprocessor
+from models.cnn_model import ModelPredictor
+from models.provisioning import file_sha256
+
+
+@dataclass
+class QuantizationReport:
+    """Comparison between the float model and its int8 counterpart."""
+    float_model_path: str
+    quantized_model_path: str
+    num_images: int
+    top1_agreement: float
+    float_accuracy: float
+    quantized_accuracy: float
+    per_class_accuracy: Dict[str, Dict[str, float]]
+    float_size_mb: float
+    quantized_size_mb: float
+    float_latency_ms: float
+    quantized_latency_ms: float
+    timestamp: str
+
+
+def list_labeled_images(
+    dataset_dir: str,
+    class_names: List[str],
+    max_per_class: Optional[int] = None,
+    seed: int = 123
+) -> List[Tuple[Path, int]]:
+    """
+    List (path, label) pairs from a class-per-folder dataset.
+    
+    Args:
+        dataset_dir: Dataset root with one sub-directory per class
+        class_names: Class names in label order
+        max_per_class: Random sample size per class (None = all images)
+        seed: Seed for the per-class sample
+    
+    Returns:
+        List of (image path, class index) tuples
+    """
+    rng = random.Random(seed)
+    samples = []
+    
+    for label, class_name in enumerate(class_names):
+        class_dir = Path(dataset_dir) / class_name
+        if not class_dir.is_dir():
+            continue
+        paths = sorted(p for p in class_dir.iterdir() if p.suffix.lower() in IMAGE_EXTENSIONS)
+        if max_per_class and len(paths) > max_per_class:
+            paths = sorted(rng.sample(paths, max_per_class))
+        samples.extend((path, label) for path in paths)
+    
+    return samples
+
+
+def representative_dataset(
+    image_paths: List[Path],
+    input_size: Tuple[int, int] = (300, 300),
+    resample: str = "nearest",
+    fast_decode: bool = True
+) -> Iterator[List[np.ndarray]]:
+    """
+    Yield calibration batches in the format the TFLite converter expects.
+    
+    Args:
+        image_paths: Calibration images
+        input_size: Model input size (width, height)
+        resample: Resampling filter name (default matches serving)
+        fast_decode: Decode large images close to input_size (default matches serving)
+    
+    Yields:
+        Single-element lists holding a (1, H, W, 3) float32 array in [0, 255]
+    """
+    preprocessor = ImagePreprocessor(
+        input_size=input_size, normalize=False, fast_decode=fast_decode, resample=resample
+    )
+    for path in image_paths:
+        yield [preprocessor.preprocess(path)]
+
+
+def quantize_int8(
+    model_path: str = "models/best_model.keras",
+    output_path: Optional[str] = None,
+    dataset_dir: str = "dataset_alat_tulis",
+    calibration_per_class: int = 30,
+    seed: int = 123,
+    resample: str = "nearest",
+    fast_decode: bool = True
+) -> Path:
+    """
+    Convert a Keras model to a full-integer (int8) TFLite model.
+    
+    Weights and activations are int8; the input is uint8 pixels (the Rescaling
+    layer is folded into the input quantization) and the output stays float32.
+    The calibration files are listed in the sidecar metadata so
+    evaluate_quantization can leave them out.
+    
+    Args:
+        model_path: Path to trained .keras model
+        output_path: Destination .tflite path (default: <stem>_int8.tflite)
+        dataset_dir: Dataset used for activation range calibration
+        calibration_per_class: Calibration images sampled per class
+        seed: Seed for the calibration sample
+        resample: Resampling filter name (default matches serving)
+        fast_decode: Decode large images close to the input size (default matches serving)
+    
+    Returns:
+        Path of the written .tflite file
+    """
+    import tensorflow as tf
+    
+    model_path = Path(model_path)
+    output_path = Path(output_path) if output_path else model_path.with_name(f"{model_path.stem}_int8.tflite")
+    
+    model = tf.keras.models.load_model(str(model_path))
+    input_size = (int(model.input_shape[2]), int(model.input_shape[1]))
+    class_names = _class_names_for(model_path, dataset_dir)
+    calibration = [path for path, _ in list_labeled_images(dataset_dir, class_names, calibration_per_class, seed)]
+    
+    converter = tf.lite.TFLiteConverter.from_keras_model(model)
+    converter.optimizations = [tf.lite.Optimize.DEFAULT]
+    converter.representative_dataset = lambda: representative_dataset(
+        calibration, input_size, resample, fast_decode
+    )
+    converter.target_spec.supported_ops = [tf.lite.OpsSet.TFLITE_BUILTINS_INT8]
+    converter.inference_input_type = tf.uint8
+    
+    output_path.write_bytes(converter.convert())
+    
+    # Sidecar metadata for the predictor
+    metadata = _load_metadata(model_path)
+    metadata.update({
+        'backend': 'tflite',
+        'quantization': 'int8',
+        'calibration_images': len(calibration),
+        'calibration_files': [path.relative_to(dataset_dir).as_posix() for path in calibration],
+        'source_model': model_path.name,
+        # The source checksum belongs to the .keras file; record this artifact's own
+        'sha256': file_sha256(output_path),
+        'timestamp': datetime.now().isoformat()
+    })
+    with open(output_path.with_suffix('.json'), 'w') as f:
+        json.dump(metadata, f, indent=2)
+    
+    return output_path
+
+
+def evaluate_quantization(
+    float_model_path: str,
+    quantized_model_path: str,
+    dataset_dir: str = "dataset_alat_tulis",
+    max_per_class: Optional[int] = None,
+    batch_size: int = 16,
+    latency_repeats: int = 20,
+    input_size: Tuple[int, int] = (300, 300),
+    resample: str = "nearest",
+    fast_decode: bool = True
+) -> QuantizationReport:
+    """
+    Compare a quantized model against the float model on the labeled dataset.
+    
+    Images listed as calibration files in the quantized model's metadata are
+    excluded, so accuracy is measured on data the quantizer never saw. Images
+    are preprocessed like serving (see app settings RESAMPLE_FILTER and
+    FAST_DECODE).
+    
+    Args:
+        float_model_path: Path to the float .keras model
+        quantized_model_path: Path to the quantized .tflite model
+        dataset_dir: Labeled dataset directory
+        max_per_class: Evaluation images sampled per class (None = all)
+        batch_size: Batch size used for evaluation
+        latency_repeats: Single-image predictions timed per model
+        input_size: Model input size (width, height)
+        resample: Resampling filter name
+        fast_decode: Decode large images close to input_size
+    
+    Returns:
+        QuantizationReport with agreement, per-class accuracy, size and latency
+    
+    Raises:
+        RuntimeError: If either model fails to load
+        ValueError: If no images are left after excluding the calibration set
+    """
+    float_predictor = ModelPredictor(model_path=float_model_path)
+    quant_predictor = ModelPredictor(model_path=quantized_model_path)
+    if float_predictor.is_demo_mode() or quant_predictor.is_demo_mode():
+        raise RuntimeError("Both models must load to build a quantization report")
+    
+    class_names = float_predictor.class_names
+    preprocessor = ImagePreprocessor(
+        input_size=input_size, normalize=False, fast_decode=fast_decode, resample=resample
+    )
+    calibration = set(_load_metadata(Path(quantized_model_path)).get('calibration_files', []))
+    samples = [
+        (path, label) for path, label in list_labeled_images(dataset_dir, class_names)
+        if path.relative_to(dataset_dir).as_posix() not in calibration
+    ]
+    if max_per_class:
+        rng = random.Random(123)
+        samples = [
+            sample for label in range(len(class_names))
+            for sample in _sample([s for s in samples if s[1] == label], max_per_class, rng)
+        ]
+    if not samples:
+        raise ValueError(f"No evaluation images left in {dataset_dir} after excluding calibration images")
+    labels = np.array([label for _, label in samples])
+    
+    def predict_labels(predictor: ModelPredictor, batch: np.ndarray) -> List[int]:
+        results = predictor.predict_batch(batch, top_k=1)
+        return [class_names.index(result.predicted_class) for result in results]
+    
+    float_preds, quant_preds = [], []
+    for start in range(0, len(samples), batch_size):
+        batch = preprocessor.preprocess_batch([path for path, _ in samples[start:start + batch_size]])
+        float_preds.extend(predict_labels(float_predictor, batch))
+        quant_preds.extend(predict_labels(quant_predictor, batch))
+    float_preds = np.array(float_preds)
+    quant_preds = np.array(quant_preds)
+    
+    per_class = {}
+    for label, class_name in enumerate(class_names):
+        mask = labels == label
+        if not mask.any():
+            continue
+        float_acc = float((float_preds[mask] == label).mean())
+        quant_acc = float((quant_preds[mask] == label).mean())
+        per_class[class_name] = {
+            "float": float_acc,
+            "int8": quant_acc,
+            "delta": quant_acc - float_acc
+        }
+    
+    single = preprocessor.preprocess_batch([samples[0][0]])
+    
+    return QuantizationReport(
+        float_model_path=str(float_model_path),
+        quantized_model_path=str(quantized_model_path),
+        num_images=len(samples),
+        top1_agreement=float((float_preds == quant_preds).mean()),
+        float_accuracy=float((float_preds == labels).mean()),
+        quantized_accuracy=float((quant_preds == labels).mean()),
+        per_class_accuracy=per_class,
+        float_size_mb=Path(float_model_path).stat().st_size / 1024 / 1024,
+        quantized_size_mb=Path(quantized_model_path).stat().st_size / 1024 / 1024,
+        float_latency_ms=_median_latency_ms(float_predictor, single, latency_repeats),
+        quantized_latency_ms=_median_latency_ms(quant_predictor, single, latency_repeats),
+        timestamp=datetime.now().isoformat()
+    )
+
+
+def _sample(samples: List[Tuple[Path, int]], count: int, rng: random.Random) -> List[Tuple[Path, int]]:
+    """Random subset of at most count samples, kept in path order."""
+    if len(samples) <= count:
+        return samples
+    return sorted(rng.sample(samples, count))
+
+
+def _median_latency_ms(predictor: ModelPredictor, batch: np.ndarray, repeats: int) -> float:
+    """Median single-batch latency after one warm-up call."""
+    predictor.predict_batch(batch, top_k=1)
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        predictor.predict_batch(batch, top_k=1)
+        timings.append(time.perf_counter() - start)
+    return float(np.median(timings) * 1000)
+
+
+def _load_metadata(model_path: Path) -> Dict[str, Any]:
+    """Read the model's sidecar metadata, or an empty dict."""
+    metadata_path = model_path.with_suffix('.json')
+    if metadata_path.exists():
+        with open(metadata_path, 'r') as f:
+            return json.load(f)
+    return {}
+
+
+def _class_names_for(model_path: Path, dataset_dir: str) -> List[str]:
+    """Class names from metadata, falling back to sorted dataset folders."""
+    metadata = _load_metadata(model_path)
+    if 'class_names' in metadata:
+        return metadata['class_names']
+    return sorted(p.name for p in Path(dataset_dir).iterdir() if p.is_dir())
+
+
+def print_report(report: QuantizationReport) -> None:
+    """Print a human-readable quantization report."""
+    print(f"Images evaluated : {report.num_images}")
+    print(f"Top-1 agreement  : {report.top1_agreement:.2%}")
+    print(f"Accuracy         : float {report.float_accuracy:.2%} -> int8 {report.quantized_accuracy:.2%}")
+    for class_name, acc in report.per_class_accuracy.items():
+        print(f"  {class_name:<8} float {acc['float']:.2%}  int8 {acc['int8']:.2%}  delta {acc['delta']:+.2%}")
+    print(f"File size        : {report.float_size_mb:.1f}MB -> {report.quantized_size_mb:.1f}MB")
+    print(f"Latency (1 img)  : {report.float_latency_ms:.1f}ms -> {report.quantized_latency_ms:.1f}ms")
+
+
+if __name__ == "__main__":
+    import argparse
+    
+    parser = argparse.ArgumentParser(description="Quantize the ATK Classifier model to int8 TFLite")
+    parser.add_argument("--model", default="models/best_model.keras", help="Float .keras model")
+    parser.add_argument("--output", default=None, help="Output .tflite path")
+    parser.add_argument("--dataset", default="dataset_alat_tulis", help="Calibration/evaluation dataset")
+    parser.add_argument("--calibration-per-class", type=int, default=30)
+    parser.add_argument("--eval-per-class", type=int, default=None, help="Evaluation images per class (default: all)")
+    parser.add_argument("--resample", default="nearest", help="Resampling filter (default: same as serving)")
+    parser.add_argument("--no-fast-decode", action="store_true", help="Decode images at full size")
+    args = parser.parse_args()
+    fast_decode = not args.no_fast_decode
+    
+    quantized_path = quantize_int8(
+        args.model, args.output, args.dataset, args.calibration_per_class,
+        resample=args.resample, fast_decode=fast_decode
+    )
+    print(f"Int8 model saved to: {quantized_path}")
+    
+    report = evaluate_quantization(
+        args.model, str(quantized_path), args.dataset, args.eval_per_class,
+        resample=args.resample, fast_decode=fast_decode
+    )
+    print_report(report)
+    
+    report_path = quantized_path.with_name(f"{quantized_path.stem}_report.json")
+    with open(report_path, 'w') as f:
+        json.dump(asdict(report), f, indent=2)
+    print(f"Report saved to: {report_path}")
@@ -0,0 +1,487 @@
+"""
+Hyperparameter sweep module for ATK Classifier.
+Runs grid or random searches over TrainingConfig fields in a process pool,
+with successive halving and median-rule pruning, records every trial in a
+JSONL results store, and promotes the best trial to best_model.keras.
+"""
+from typing import Any, Callable, Dict, List, Optional, Union
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import asdict, fields
+from datetime import datetime
+from pathlib import Path
+import multiprocessing
+import itertools
+import random
+import shutil
+import json
+import time
+import sys
+import os
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import numpy as np
+
+from models.train_model import TrainingConfig
+
+# Field -> candidate values
+SearchSpace = Dict[str, List[Any]]
+
+DEFAULT_SEARCH_SPACE: SearchSpace = {
+    "conv1_filters": [16, 32],
+    "conv2_filters": [32, 64],
+    "conv3_filters": [64, 128],
+    "dense_units": [64, 128, 256],
+    "dropout_rate": [0.3, 0.5],
+    "learning_rate": [0.0003, 0.001, 0.003],
+    "batch_size": [15, 32],
+}
+
+
+class SweepStore:
+    """
+    Append-only JSONL store with one record per finished trial.
+    
+    Only the sweep's parent process writes; trial processes read it for
+    the pruning rule.
+    """
+    
+    def __init__(self, path: Union[str, Path]):
+        self.path = Path(path)
+    
+    def append(self, record: Dict[str, Any]) -> None:
+        """Append one trial record."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.path, 'a') as f:
+            f.write(json.dumps(record) + "\n")
+    
+    def load(self) -> List[Dict[str, Any]]:
+        """
+        Read every record.
+        
+        Returns:
+            Trial records in completion order (empty if the store does not exist)
+        """
+        if not self.path.exists():
+            return []
+        with open(self.path, 'r') as f:
+            return [json.loads(line) for line in f if line.strip()]
+
+
+def grid_configs(space: SearchSpace) -> List[Dict[str, Any]]:
+    """
+    Every combination of the search space values.
+    
+    Args:
+        space: Field -> candidate values
+    
+    Returns:
+        List of parameter dictionaries (cartesian product, in field order)
+    """
+    names = list(space)
+    return [dict(zip(names, values)) for values in itertools.product(*(space[name] for name in names))]
+
+
+def random_configs(space: SearchSpace, num_trials: int, seed: int = 0) -> List[Dict[str, Any]]:
+    """
+    Sample distinct parameter combinations uniformly.
+    
+    Args:
+        space: Field -> candidate values
+        num_trials: Number of combinations (capped at the grid size)
+        seed: Sampling seed
+    
+    Returns:
+        List of parameter dictionaries
+    """
+    grid = grid_configs(space)
+    return random.Random(seed).sample(grid, min(num_trials, len(grid)))
+
+
+def select_survivors(records: List[Dict[str, Any]], keep: int) -> List[Dict[str, Any]]:
+    """
+    Best completed trials of a rung by validation accuracy.
+    
+    Args:
+        records: Trial records of one rung
+        keep: Number of trials to keep
+    
+    Returns:
+        Up to ``keep`` completed records, best first (ties: lower val_loss first)
+    """
+    completed = [r for r in records if r["status"] == "completed"]
+    completed.sort(key=lambda r: (-r["val_accuracy"], r["val_loss"]))
+    return completed[:keep]
+
+
+def should_prune(
+    val_accuracy: float,
+    epoch: int,
+    peers: List[Dict[str, Any]],
+    min_peers: int = 3,
+    warmup_epochs: int = 1
+) -> bool:
+    """
+    Median stopping rule.
+    
+    A trial is stopped when its validation accuracy after ``epoch`` epochs is
+    below the median of finished trials with the same budget at that epoch.
+    
+    Args:
+        val_accuracy: Current trial's validation accuracy
+        epoch: Epochs completed by the current trial (1-based)
+        peers: Finished trial records with the same epoch budget
+        min_peers: Finished trials needed before pruning starts
+        warmup_epochs: Epochs always run before pruning is considered
+    
+    Returns:
+        True if the trial should stop
+    """
+    if epoch <= warmup_epochs:
+        return False
+    reference = [
+        r["history"]["val_accuracy"][epoch - 1] for r in peers
+        if len(r.get("history", {}).get("val_accuracy", [])) >= epoch
+    ]
+    if len(reference) < min_peers:
+        return False
+    return val_accuracy < float(np.median(reference))
+
+
+def _limit_threads(threads: int) -> None:
+    """Pool initializer: cap BLAS/TensorFlow threads before TensorFlow is imported."""
+    for name in ("OMP_NUM_THREADS", "TF_NUM_INTRAOP_THREADS", "TF_NUM_INTEROP_THREADS"):
+        os.environ[name] = str(threads)
+    import tensorflow as tf
+    
+    tf.config.threading.set_intra_op_parallelism_threads(threads)
+    tf.config.threading.set_inter_op_parallelism_threads(threads)
+
+
+def run_trial(
+    trial_id: str,
+    rung: int,
+    dataset_dir: str,
+    config: Dict[str, Any],
+    output_dir: str,
+    store_path: Optional[str],
+    use_cache: bool = True
+) -> Dict[str, Any]:
+    """
+    Train one configuration (runs inside a pool worker).
+    
+    Args:
+        trial_id: Unique trial name
+        rung: Successive-halving rung (0 without halving)
+        dataset_dir: Dataset directory
+        config: TrainingConfig fields
+        output_dir: Directory for this trial's model and metadata
+        store_path: Results store consulted by the pruning rule (None = no pruning)
+        use_cache: Train from the tensor cache
+    
+    Returns:
+        Trial record with config, metrics, per-epoch history, wall time and status
+    """
+    from models.train_model import ATKModelTrainer, DatasetManager
+    import tensorflow as tf
+    
+    start = time.perf_counter()
+    record = {
+        "trial_id": trial_id,
+        "rung": rung,
+        "config": config,
+        "status": "completed",
+        "error": None,
+        "model_path": None,
+        "pid": os.getpid(),
+    }
+    try:
+        training_config = TrainingConfig(**config)
+        tf.keras.utils.set_random_seed(training_config.seed)
+        train_ds, val_ds, class_names = DatasetManager(dataset_dir).load_dataset(training_config, use_cache)
+        
+        trainer = ATKModelTrainer(training_config)
+        trainer.build_model(len(class_names))
+        pruned = []
+        
+        def prune_check(epoch: int, logs: Optional[Dict[str, float]]) -> None:
+            if store_path is None or not logs:
+                return
+            peers = [
+                r for r in SweepStore(store_path).load()
+                if r["status"] in ("completed", "pruned") and r["config"]["epochs"] == training_config.epochs
+            ]
+            if should_prune(logs["val_accuracy"], epoch, peers):
+                pruned.append(epoch)
+                trainer.model.stop_training = True
+        
+        model_path = Path(output_dir) / "model.keras"
+        model_path.parent.mkdir(parents=True, exist_ok=True)
+        result = trainer.train(train_ds, val_ds, class_names, str(model_path), prune_check, verbose=0)
+        
+        record.update(
+            status="pruned" if pruned else "completed",
+            model_path=str(model_path),
+            # Best epoch, matching the checkpoint ModelCheckpoint kept
+            val_accuracy=max(result.history["val_accuracy"]),
+            val_loss=min(result.history["val_loss"]),
+            accuracy=result.accuracy,
+            epochs_trained=result.epochs_trained,
+            history=result.history
+        )
+    except Exception as e:
+        record.update(status="failed", error=f"{type(e).__name__}: {e}")
+    
+    record["wall_time_sec"] = time.perf_counter() - start
+    record["finished_at"] = datetime.now().isoformat()
+    return record
+
+
+class SweepRunner:
+    """
+    Hyperparameter sweep over TrainingConfig fields.
+    
+    Trials run in a spawned process pool with ``threads_per_worker`` threads
+    each, so workers do not oversubscribe the CPU. With ``halving`` the
+    sweep uses successive halving: every rung trains the surviving configs
+    for ``eta`` times more epochs and keeps the best 1/eta.
+    """
+    
+    def __init__(
+        self,
+        dataset_dir: str = "dataset_alat_tulis",
+        output_dir: Optional[str] = None,
+        space: Optional[SearchSpace] = None,
+        base_config: Optional[TrainingConfig] = None,
+        strategy: str = "random",
+        num_trials: int = 8,
+        max_workers: int = 1,
+        threads_per_worker: Optional[int] = None,
+        halving: bool = False,
+        min_epochs: int = 2,
+        eta: int = 2,
+        prune: bool = True,
+        use_cache: bool = True,
+        seed: int = 0
+    ):
+        """
+        Initialize the sweep.
+        
+        Args:
+            dataset_dir: Dataset directory
+            output_dir: Where trial models and results.jsonl go (default: sweeps/<timestamp>)
+            space: Field -> candidate values (default: DEFAULT_SEARCH_SPACE)
+            base_config: Values for fields outside the space; its epochs is the maximum budget
+            strategy: 'grid' (every combination) or 'random' (num_trials samples)
+            num_trials: Random samples
+            max_workers: Parallel trial processes (0 = run in this process)
+            threads_per_worker: TensorFlow threads per worker (None = cpu_count // max_workers)
+            halving: Use successive halving starting at min_epochs
+            min_epochs: Epoch budget of the first rung
+            eta: Halving factor
+            prune: Stop trials early with the median rule
+            use_cache: Train from the tensor cache (built once before the trials start)
+            seed: Random-search seed
+        """
+        if strategy not in ("grid", "random"):
+            raise ValueError(f"Unknown strategy: {strategy}. Choose from: grid, random")
+        valid_fields = {f.name for f in fields(TrainingConfig)}
+        unknown = set(space or {}) - valid_fields
+        if unknown:
+            raise ValueError(f"Unknown TrainingConfig fields: {', '.join(sorted(unknown))}")
+        
+        self.dataset_dir = dataset_dir
+        self.output_dir = Path(output_dir or Path("sweeps") / datetime.now().strftime("%Y%m%d-%H%M%S"))
+        self.space = space or DEFAULT_SEARCH_SPACE
+        self.base_config = base_config or TrainingConfig()
+        self.strategy = strategy
+        self.num_trials = num_trials
+        self.max_workers = max(0, max_workers)
+        self.threads_per_worker = threads_per_worker or max(1, (os.cpu_count() or 1) // max(1, self.max_workers))
+        self.halving = halving
+        self.min_epochs = min_epochs
+        self.eta = max(2, eta)
+        self.prune = prune
+        self.use_cache = use_cache
+        self.seed = seed
+        self.store = SweepStore(self.output_dir / "results.jsonl")
+    
+    def candidates(self) -> List[Dict[str, Any]]:
+        """Parameter dictionaries for the first rung."""
+        if self.strategy == "grid":
+            return grid_configs(self.space)
+        return random_configs(self.space, self.num_trials, self.seed)
+    
+    def run(self, progress_callback: Optional[Callable[[Dict[str, Any]], None]] = None) -> List[Dict[str, Any]]:
+        """
+        Run every rung of the sweep.
+        
+        Args:
+            progress_callback: Called with each finished trial record
+        
+        Returns:
+            All trial records
+        """
+        if self.use_cache:
+            from models.tensor_cache import TensorCache
+            
+            TensorCache(
+                self.dataset_dir,
+                img_size=(self.base_config.img_height, self.base_config.img_width)
+            ).build()
+        
+        max_epochs = self.base_config.epochs
+        budget = min(self.min_epochs, max_epochs) if self.halving else max_epochs
+        params_list = self.candidates()
+        records: List[Dict[str, Any]] = []
+        rung = 0
+        while params_list:
+            rung_records = self._run_rung(rung, params_list, budget, progress_callback)
+            records.extend(rung_records)
+            if not self.halving or budget >= max_epochs:
+                break
+            survivors = select_survivors(rung_records, len(params_list) // self.eta)
+            if len(survivors) < 1 or len(params_list) == 1:
+                break
+            params_list = [{k: r["config"][k] for k in self.space} for r in survivors]
+            budget = min(budget * self.eta, max_epochs)
+            rung += 1
+        return records
+    
+    def _run_rung(
+        self,
+        rung: int,
+        params_list: List[Dict[str, Any]],
+        epochs: int,
+        progress_callback: Optional[Callable[[Dict[str, Any]], None]]
+    ) -> List[Dict[str, Any]]:
+        """Train every configuration of one rung and store the records."""
+        jobs = []
+        for index, params in enumerate(params_list):
+            trial_id = f"r{rung}-t{index:03d}"
+            config = {**asdict(self.base_config), **params, "epochs": epochs}
+            jobs.append((
+                trial_id, rung, str(self.dataset_dir), config,
+                str(self.output_dir / "trials" / trial_id),
+                str(self.store.path) if self.prune else None,
+                self.use_cache
+            ))
+        
+        records = []
+        
+        def finish(record: Dict[str, Any]) -> None:
+            self.store.append(record)
+            records.append(record)
+            if progress_callback:
+                progress_callback(record)
+        
+        if self.max_workers == 0:
+            for job in jobs:
+                finish(run_trial(*job))
+            return records
+        
+        with ProcessPoolExecutor(
+            max_workers=self.max_workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_limit_threads,
+            initargs=(self.threads_per_worker,)
+        ) as executor:
+            futures = [executor.submit(run_trial, *job) for job in jobs]
+            for future in as_completed(futures):
+                finish(future.result())
+        return records
+
+
+def promote_best(
+    records: List[Dict[str, Any]],
+    model_path: str = "models/best_model.keras",
+    store_path: Optional[str] = None
+) -> Dict[str, Any]:
+    """
+    Copy the best trial's model and metadata to the serving location.
+    
+    Records from the highest rung win, since they trained the longest.
+    Both files are replaced atomically.
+    
+    Args:
+        records: Trial records (e.g. SweepStore.load())
+        model_path: Destination .keras path; metadata goes next to it as .json
+        store_path: Results store recorded in the metadata
+    
+    Returns:
+        The promoted trial record
+    """
+    top_rung = max((r["rung"] for r in records if r["status"] == "completed"), default=None)
+    if top_rung is None:
+        raise RuntimeError("No completed trials to promote")
+    best = select_survivors([r for r in records if r["rung"] == top_rung], 1)[0]
+    
+    source = Path(best["model_path"])
+    target = Path(model_path)
+    target.parent.mkdir(parents=True, exist_ok=True)
+    
+    with open(source.with_suffix('.json'), 'r') as f:
+        metadata = json.load(f)
+    metadata['sweep'] = {
+        'trial_id': best['trial_id'],
+        'val_accuracy': best['val_accuracy'],
+        'results': str(store_path) if store_path else None,
+        'promoted_at': datetime.now().isoformat()
+    }
+    
+    tmp_model = target.with_name(target.name + ".tmp")
+    shutil.copyfile(source, tmp_model)
+    os.replace(tmp_model, target)
+    tmp_metadata = target.with_suffix('.json.tmp')
+    with open(tmp_metadata, 'w') as f:
+        json.dump(metadata, f, indent=2)
+    os.replace(tmp_metadata, target.with_suffix('.json'))
+    return best
+
+
+if __name__ == "__main__":
+    import argparse
+    
+    parser = argparse.ArgumentParser(description="Hyperparameter sweep for the ATK Classifier")
+    parser.add_argument("--dataset", default="dataset_alat_tulis")
+    parser.add_argument("--output", default=None, help="Sweep directory (default: sweeps/<timestamp>)")
+    parser.add_argument("--strategy", choices=["grid", "random"], default="random")
+    parser.add_argument("--trials", type=int, default=8, help="Random-search samples")
+    parser.add_argument("--workers", type=int, default=1, help="Parallel trial processes (0 = in-process)")
+    parser.add_argument("--threads-per-worker", type=int, default=None)
+    parser.add_argument("--epochs", type=int, default=15, help="Maximum epochs per trial")
+    parser.add_argument("--halving", action="store_true", help="Successive halving from --min-epochs")
+    parser.add_argument("--min-epochs", type=int, default=2)
+    parser.add_argument("--eta", type=int, default=2)
+    parser.add_argument("--no-prune", action="store_true", help="Disable median-rule pruning")
+    parser.add_argument("--no-cache", action="store_true", help="Decode images instead of using the tensor cache")
+    parser.add_argument("--promote", action="store_true", help="Copy the best trial to models/best_model.keras")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    
+    runner = SweepRunner(
+        dataset_dir=args.dataset,
+        output_dir=args.output,
+        base_config=TrainingConfig(epochs=args.epochs),
+        strategy=args.strategy,
+        num_trials=args.trials,
+        max_workers=args.workers,
+        threads_per_worker=args.threads_per_worker,
+        halving=args.halving,
+        min_epochs=args.min_epochs,
+        eta=args.eta,
+        prune=not args.no_prune,
+        use_cache=not args.no_cache,
+        seed=args.seed
+    )
+    print(f"Sweep results: {runner.store.path}")
+    records = runner.run(lambda r: print(
+        f"{r['trial_id']} {r['status']:<9} val_acc={r.get('val_accuracy', float('nan')):.4f} "
+        f"epochs={r.get('epochs_trained', 0)} {r['wall_time_sec']:.1f}s"
+        + (f" {r['error']}" if r['error'] else "")
+    ))
+    
+    if args.promote:
+        best = promote_best(records, store_path=str(runner.store.path))
+        print(f"Promoted {best['trial_id']} (val_accuracy={best['val_accuracy']:.4f}) to models/best_model.keras")
@@ -0,0 +1,300 @@
+"""
+Preprocessed tensor cache for ATK Classifier training.
+Decodes and resizes the dataset once into a memory-mappable uint8 array
+plus a labels/index file, so repeated training and evaluation runs skip
+JPEG/PNG decoding entirely.
+"""
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple, Union
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+import hashlib
+import shutil
+import json
+import os
+
+import numpy as np
+
+from models.dataset_validation import DatasetValidator, ImageRecord
+
+CACHE_VERSION = 2
+
+IMAGES_FILE = "images.npy"
+LABELS_FILE = "labels.npy"
+# Written last: a cache directory without it is incomplete
+INDEX_FILE = "index.json"
+
+
+def manifest_hash(records: Dict[str, ImageRecord]) -> str:
+    """
+    Hash the valid files of a validation manifest.
+    
+    Args:
+        records: Manifest records from DatasetValidator.load_manifest()
+    
+    Returns:
+        SHA-256 hex digest over the sorted (path, sha256) pairs of valid files
+    """
+    digest = hashlib.sha256()
+    for key, record in sorted(records.items()):
+        if record.status == "valid":
+            digest.update(f"{key}\0{record.sha256}\n".encode("utf-8"))
+    return digest.hexdigest()
+
+
+@dataclass
+class CachedDataset:
+    """Memory-mapped view of a built tensor cache."""
+    images: np.ndarray  # (N, height, width, 3) uint8, read-only memmap
+    labels: np.ndarray  # (N,) int32 class indices
+    class_names: List[str]
+    paths: List[str]  # dataset-relative path of each row
+    source_hash: str
+    
+    def __len__(self) -> int:
+        return len(self.labels)
+    
+    def iter_batches(
+        self,
+        batch_size: int = 32,
+        indices: Optional[np.ndarray] = None
+    ) -> Iterator[Tuple[np.ndarray, np.ndarray]]:
+        """
+        Yield (images, labels) batches as NumPy arrays.
+        
+        Args:
+            batch_size: Rows per batch
+            indices: Rows to read, in order (None = all rows)
+        
+        Yields:
+            Tuples of (uint8 images, int32 labels)
+        """
+        indices = np.arange(len(self)) if indices is None else np.asarray(indices)
+        for start in range(0, len(indices), batch_size):
+            rows = indices[start:start + batch_size]
+            yield self.images[rows], self.labels[rows]
+    
+    def as_tf_dataset(
+        self,
+        indices: Optional[np.ndarray] = None,
+        batch_size: int = 32,
+        shuffle: bool = False,
+        seed: Optional[int] = None
+    ) -> Any:
+        """
+        Stream rows from the memmap as a batched tf.data.Dataset.
+        
+        Only row indices go through tf.data; each batch is gathered from the
+        memmap in one fancy-indexing read. Images are float32 in [0, 255],
+        the same as image_dataset_from_directory.
+        
+        Args:
+            indices: Rows to include (None = all rows)
+            batch_size: Rows per batch
+            shuffle: Reshuffle the rows every epoch
+            seed: Shuffle seed
+        
+        Returns:
+            tf.data.Dataset of (images, labels) batches
+        """
+        import tensorflow as tf
+        
+        indices = np.arange(len(self)) if indices is None else np.asarray(indices)
+        height, width = self.images.shape[1:3]
+        
+        def gather(rows: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+            # Sorted reads keep memmap access sequential; order within a batch does not matter
+            rows = np.sort(rows)
+            return self.images[rows], self.labels[rows]
+        
+        def load(rows: Any) -> Tuple[Any, Any]:
+            images, labels = tf.numpy_function(gather, [rows], (tf.uint8, tf.int32))
+            images = tf.ensure_shape(images, (None, height, width, 3))
+            labels = tf.ensure_shape(labels, (None,))
+            return tf.cast(images, tf.float32), labels
+        
+        dataset = tf.data.Dataset.from_tensor_slices(indices.astype(np.int64))
+        if shuffle:
+            dataset = dataset.shuffle(len(indices), seed=seed, reshuffle_each_iteration=True)
+        dataset = dataset.batch(batch_size).map(load, num_parallel_calls=tf.data.AUTOTUNE)
+        return dataset.prefetch(tf.data.AUTOTUNE)
+
+
+class TensorCache:
+    """
+    On-disk cache of the resized dataset, keyed by input size and content.
+    
+    Each cache lives in ``cache_dir/<height>x<width>_<hash>/``, where the
+    hash covers the SHA-256 of every valid file in the validation manifest.
+    Adding, changing or quarantining an image therefore selects a new cache
+    instead of serving stale tensors. Rows are produced by
+    input_pipeline.load_image, the same decode and resize as the uncached
+    training pipeline.
+    """
+    
+    def __init__(
+        self,
+        dataset_dir: Union[str, Path],
+        cache_dir: Optional[Union[str, Path]] = None,
+        img_size: Tuple[int, int] = (300, 300),
+        num_workers: Optional[int] = None
+    ):
+        """
+        Initialize the cache.
+        
+        Args:
+            dataset_dir: Dataset root with one sub-directory per class
+            cache_dir: Where caches are stored (default: sibling <dataset_dir>_cache,
+                outside the dataset so it is never a class)
+            img_size: (height, width) images are resized to
+            num_workers: Decode threads used while building (None = os.cpu_count())
+        """
+        self.dataset_dir = Path(dataset_dir)
+        self.cache_dir = (
+            Path(cache_dir) if cache_dir
+            else self.dataset_dir.with_name(self.dataset_dir.name + "_cache")
+        )
+        self.img_size = tuple(img_size)
+        self.num_workers = max(1, num_workers or os.cpu_count() or 1)
+        self.validator = DatasetValidator(self.dataset_dir, num_workers=self.num_workers)
+    
+    def cache_path(self, source_hash: str) -> Path:
+        """Directory of the cache for a given manifest hash."""
+        height, width = self.img_size
+        return self.cache_dir / f"{height}x{width}_{source_hash[:16]}"
+    
+    def build(self, force: bool = False, progress_callback: Optional[Callable[[int], None]] = None) -> Path:
+        """
+        Validate the dataset and build the cache if it does not exist yet.
+        
+        Args:
+            force: Rebuild even if a complete cache exists
+            progress_callback: Called with the number of images written so far
+        
+        Returns:
+            Path of the cache directory
+        """
+        self.validator.validate()
+        records = self.validator.load_manifest()
+        source_hash = manifest_hash(records)
+        path = self.cache_path(source_hash)
+        if (path / INDEX_FILE).exists() and not force:
+            return path
+        
+        keys = sorted(key for key, record in records.items() if record.status == "valid")
+        class_names = sorted({key.split("/", 1)[0] for key in keys})
+        labels = np.array([class_names.index(key.split("/", 1)[0]) for key in keys], dtype=np.int32)
+        
+        height, width = self.img_size
+        tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        shutil.rmtree(tmp_path, ignore_errors=True)
+        tmp_path.mkdir(parents=True)
+        images = np.lib.format.open_memmap(
+            tmp_path / IMAGES_FILE, mode="w+", dtype=np.uint8, shape=(len(keys), height, width, 3)
+        )
+        self._write_rows(images, [str(self.dataset_dir / key) for key in keys], progress_callback)
+        images.flush()
+        del images
+        np.save(tmp_path / LABELS_FILE, labels)
+        
+        index = {
+            "version": CACHE_VERSION,
+            "source_hash": source_hash,
+            "dataset_dir": str(self.dataset_dir),
+            "img_size": [height, width],
+            "class_names": class_names,
+            "paths": keys,
+            "created_at": datetime.now().isoformat()
+        }
+        with open(tmp_path / INDEX_FILE, "w") as f:
+            json.dump(index, f, indent=1)
+        
+        if (path / INDEX_FILE).exists() and not force:
+            # Another process finished the same cache first
+            shutil.rmtree(tmp_path, ignore_errors=True)
+            return path
+        shutil.rmtree(path, ignore_errors=True)
+        os.replace(tmp_path, path)
+        return path
+    
+    def _write_rows(
+        self,
+        images: np.ndarray,
+        files: List[str],
+        progress_callback: Optional[Callable[[int], None]] = None
+    ) -> None:
+        """Decode files in parallel with load_image and write them into images in order."""
+        import tensorflow as tf
+        from models.input_pipeline import load_image
+        
+        dataset = tf.data.Dataset.from_tensor_slices(tf.constant(files, dtype=tf.string))
+        dataset = dataset.map(
+            lambda path: load_image(path, self.img_size),
+            num_parallel_calls=self.num_workers
+        ).batch(64)
+        row = 0
+        for batch in dataset.as_numpy_iterator():
+            images[row:row + len(batch)] = batch
+            row += len(batch)
+            if progress_callback:
+                progress_callback(row)
+    
+    def open(self, build: bool = True) -> CachedDataset:
+        """
+        Memory-map the cache for the current dataset contents.
+        
+        Args:
+            build: Build the cache if it is missing (False = raise instead)
+        
+        Returns:
+            CachedDataset backed by the cache files
+        """
+        if build:
+            path = self.build()
+        else:
+            path = self.cache_path(manifest_hash(self.validator.load_manifest()))
+        return load_cache(path)
+
+
+def load_cache(path: Union[str, Path]) -> CachedDataset:
+    """
+    Memory-map a cache directory.
+    
+    Args:
+        path: Cache directory written by TensorCache.build()
+    
+    Returns:
+        CachedDataset backed by the cache files
+    """
+    path = Path(path)
+    index_path = path / INDEX_FILE
+    if not index_path.exists():
+        raise FileNotFoundError(f"Tensor cache not found or incomplete: {path}")
+    with open(index_path, "r") as f:
+        index = json.load(f)
+    if index.get("version") != CACHE_VERSION:
+        raise ValueError(f"Unsupported tensor cache version: {index.get('version')}")
+    
+    return CachedDataset(
+        images=np.load(path / IMAGES_FILE, mmap_mode="r"),
+        labels=np.load(path / LABELS_FILE),
+        class_names=index["class_names"],
+        paths=index["paths"],
+        source_hash=index["source_hash"]
+    )
+
+
+if __name__ == "__main__":
+    import argparse
+    
+    parser = argparse.ArgumentParser(description="Build the preprocessed tensor cache for training")
+    parser.add_argument("--dataset", default="dataset_alat_tulis", help="Dataset directory")
+    parser.add_argument("--cache-dir", default=None, help="Cache root (default: <dataset>_cache)")
+    parser.add_argument("--size", type=int, nargs=2, default=[300, 300], metavar=("HEIGHT", "WIDTH"))
+    parser.add_argument("--force", action="store_true", help="Rebuild even if the cache exists")
+    args = parser.parse_args()
+    
+    cache = TensorCache(args.dataset, args.cache_dir, tuple(args.size))
+    cache_path = cache.build(force=args.force)
+    size_mb = (cache_path / IMAGES_FILE).stat().st_size / 1024 / 1024
+    print(f"Tensor cache: {cache_path} ({len(load_cache(cache_path))} images, {size_mb:.1f}MB)")
@@ -0,0 +1,140 @@
+"""
+TFLite inference engine for ATK Classifier.
+Runs exported .tflite artifacts through the lightest available interpreter
+(ai_edge_litert, tflite_runtime, or tensorflow.lite as a fallback).
+"""
+from typing import Any, Dict, List, Optional, Union
+from pathlib import Path
+import threading
+
+import numpy as np
+
+
+def load_interpreter_class() -> Any:
+    """
+    Find a TFLite interpreter class, preferring standalone runtimes.
+    
+    Returns:
+        Interpreter class
+    
+    Raises:
+        ImportError: If no TFLite runtime is installed
+    """
+    try:
+        from ai_edge_litert.interpreter import Interpreter
+        return Interpreter
+    except ImportError:
+        pass
+    
+    try:
+        from tflite_runtime.interpreter import Interpreter
+        return Interpreter
+    except ImportError:
+        pass
+    
+    try:
+        import tensorflow as tf
+        return tf.lite.Interpreter
+    except ImportError:
+        raise ImportError(
+            "No TFLite runtime available. Install ai-edge-litert, tflite-runtime or tensorflow."
+        )
+
+
+class TFLiteModel:
+    """
+    Callable wrapper around TFLite interpreters with dynamic batch size.
+    
+    Resizing an interpreter's input re-plans and re-allocates every tensor,
+    which costs more than a single-image forward pass. Each batch size
+    therefore gets its own interpreter, created on first use and kept, so
+    alternating micro-batch sizes run at steady-state latency once warmed up.
+    The interpreters load the same model file, whose buffer is memory-mapped
+    and shared.
+    """
+    
+    def __init__(self, model_path: Union[str, Path], num_threads: Optional[int] = None):
+        """
+        Load a .tflite model.
+        
+        Args:
+            model_path: Path to .tflite file
+            num_threads: Interpreter CPU threads (None = runtime default)
+        """
+        self._interpreter_class = load_interpreter_class()
+        self.model_path = Path(model_path)
+        self.num_threads = num_threads
+        interpreter = self._create_interpreter()
+        # Input/output dtype and quantization are the same for every batch size
+        self._input = interpreter.get_input_details()[0]
+        self._output = interpreter.get_output_details()[0]
+        self._interpreters: Dict[int, Any] = {int(self._input["shape"][0]): interpreter}
+        # Interpreter tensors are shared state, so calls must not overlap
+        self._lock = threading.Lock()
+    
+    @property
+    def input_shape(self) -> tuple:
+        """Input shape without the batch dimension."""
+        return tuple(int(d) for d in self._input["shape"][1:])
+    
+    @property
+    def batch_sizes(self) -> List[int]:
+        """Batch sizes that already have an allocated interpreter."""
+        return sorted(self._interpreters)
+    
+    def _create_interpreter(self, batch_size: Optional[int] = None) -> Any:
+        """Load and allocate an interpreter, optionally resized to a batch size."""
+        interpreter = self._interpreter_class(model_path=str(self.model_path), num_threads=self.num_threads)
+        if batch_size is not None:
+            input_index = interpreter.get_input_details()[0]["index"]
+            interpreter.resize_tensor_input(input_index, [batch_size, *self.input_shape])
+        interpreter.allocate_tensors()
+        return interpreter
+    
+    def _interpreter_for(self, batch_size: int) -> Any:
+        """Interpreter allocated for batch_size, created on first use."""
+        interpreter = self._interpreters.get(batch_size)
+        if interpreter is None:
+            interpreter = self._create_interpreter(batch_size)
+            self._interpreters[batch_size] = interpreter
+        return interpreter
+    
+    def __call__(self, batch: np.ndarray) -> np.ndarray:
+        """
+        Run the forward pass.
+        
+        Args:
+            batch: Input with shape (N, H, W, 3), uint8 or float pixel values in [0, 255]
+        
+        Returns:
+            Output probabilities with shape (N, num_classes)
+        """
+        with self._lock:
+            interpreter = self._interpreter_for(len(batch))
+            interpreter.set_tensor(self._input["index"], self._quantize_input(batch))
+            interpreter.invoke()
+            return self._dequantize_output(interpreter.get_tensor(self._output["index"]))
+    
+    def _quantize_input(self, batch: np.ndarray) -> np.ndarray:
+        """Map float pixels to the input tensor dtype (identity for float models)."""
+        dtype = self._input["dtype"]
+        if not np.issubdtype(dtype, np.integer):
+            return np.asarray(batch, dtype=dtype)
+        
+        scale, zero_point = self._input["quantization"]
+        # uint8 pixels already match an identity-quantized uint8 input
+        if batch.dtype == dtype and scale == 1.0 and zero_point == 0:
+            return batch
+        batch = np.asarray(batch, dtype=np.float32)
+        if scale:
+            batch = np.round(batch / scale + zero_point)
+        info = np.iinfo(dtype)
+        return np.clip(batch, info.min, info.max).astype(dtype)
+    
+    def _dequantize_output(self, output: np.ndarray) -> np.ndarray:
+        """Map integer outputs back to float probabilities."""
+        if not np.issubdtype(output.dtype, np.integer):
+            return np.array(output)
+        
+        scale, zero_point = self._output["quantization"]
+        return (output.astype(np.float32) - zero_point) * scale
@@ -6,6 +6,7 @@ import os
 import sys
 import json
 import shutil
+import importlib.util
 from pathlib import Path
 from datetime import datetime
 from typing import Optional, Dict, Any, Tuple, List, Callable
@@ -16,22 +17,13 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 
 import numpy as np
 
-try:
-    import tensorflow as tf
-    from tensorflow.keras import layers, models, optimizers
-    from tensorflow.keras.callbacks import EarlyStopping, ModelCheckpoint
-    keras = tf.keras
-    TENSORFLOW_AVAILABLE = True
-except ImportError:
-    TENSORFLOW_AVAILABLE = False
-    keras = None
+from models.provisioning import file_sha256
+from models.dataset_validation import DatasetValidator
+from models.input_pipeline import DatasetSplits, build_splits
 
-try:
-    import cv2
-    import imghdr
-    CV2_AVAILABLE = True
-except ImportError:
-    CV2_AVAILABLE = False
+# TensorFlow is imported inside the functions that need it, so importing
+# this module (e.g. for TrainingConfig) stays cheap
+TENSORFLOW_AVAILABLE = importlib.util.find_spec("tensorflow") is not None
 
 
 @dataclass
@@ -42,6 +34,9 @@ class TrainingConfig:
     batch_size: int = 15
     epochs: int = 15
     validation_split: float = 0.1
+    test_split: float = 0.0
+    seed: int = 123
+    augment: bool = False
     learning_rate: float = 0.001
     early_stopping_patience: int = 3
     
@@ -51,6 +46,80 @@ class TrainingConfig:
     conv3_filters: int = 128
     dense_units: int = 128
     dropout_rate: float = 0.5
+    head: str = "flatten"  # 'flatten' or 'gap' (global average pooling)
+    
+    # Runtime params
+    precision: str = "float32"  # 'float32', 'mixed_bfloat16', 'mixed_float16' or 'auto'
+    intra_op_threads: int = 0  # 0 = TensorFlow default
+    inter_op_threads: int = 0  # 0 = TensorFlow default
+    jit_compile: bool = False  # XLA-compile the training step
+
+
+PRECISION_POLICIES = ("float32", "mixed_bfloat16", "mixed_float16")
+
+
+def cpu_supports_bfloat16() -> bool:
+    """Whether the CPU has native bfloat16 math (AVX512-BF16 or AMX-BF16)."""
+    try:
+        with open("/proc/cpuinfo", "r") as f:
+            flags = f.read()
+    except OSError:
+        return False
+    return "avx512_bf16" in flags or "amx_bf16" in flags
+
+
+def resolve_precision(precision: str) -> str:
+    """
+    Map a TrainingConfig.precision value to a Keras dtype policy name.
+    
+    'auto' picks mixed_bfloat16 on CPUs with native bfloat16 support and
+    float32 elsewhere (float16 has no fast CPU kernels).
+    
+    Args:
+        precision: 'float32', 'mixed_bfloat16', 'mixed_float16' or 'auto'
+    
+    Returns:
+        Keras dtype policy name
+    """
+    if precision == "auto":
+        return "mixed_bfloat16" if cpu_supports_bfloat16() else "float32"
+    if precision not in PRECISION_POLICIES:
+        raise ValueError(f"Unknown precision: {precision}. Choose from: auto, {', '.join(PRECISION_POLICIES)}")
+    return precision
+
+
+def configure_threads(config: TrainingConfig) -> Dict[str, int]:
+    """
+    Apply TrainingConfig thread pool sizes to TensorFlow.
+    
+    Thread pools can only be sized before TensorFlow runs its first op, so
+    call this before building datasets or models. Later calls with
+    different sizes print a warning and keep the current pools.
+    
+    Args:
+        config: Training configuration
+    
+    Returns:
+        Dictionary with the intra_op and inter_op sizes in effect (0 = default)
+    """
+    import tensorflow as tf
+    
+    threading = tf.config.threading
+    for name, wanted, getter, setter in (
+        ("intra_op", config.intra_op_threads, threading.get_intra_op_parallelism_threads,
+         threading.set_intra_op_parallelism_threads),
+        ("inter_op", config.inter_op_threads, threading.get_inter_op_parallelism_threads,
+         threading.set_inter_op_parallelism_threads),
+    ):
+        if wanted and getter() != wanted:
+            try:
+                setter(wanted)
+            except RuntimeError:
+                print(f"Warning: TensorFlow already initialized, {name} threads stay at {getter() or 'default'}")
+    return {
+        "intra_op": threading.get_intra_op_parallelism_threads(),
+        "inter_op": threading.get_inter_op_parallelism_threads()
+    }
 
 
 @dataclass
@@ -66,6 +135,8 @@ class TrainingResult:
     config: Dict[str, Any]
     history: Dict[str, List[float]]
     timestamp: str
+    test_accuracy: Optional[float] = None
+    test_loss: Optional[float] = None
 
 
 class DatasetManager:
@@ -79,58 +150,54 @@ class DatasetManager:
     
     def validate_and_clean_images(self, progress_callback: Optional[Callable] = None) -> Dict[str, int]:
         """
-        Validate images and remove corrupted files.
+        Validate images and quarantine corrupted files.
+        
+        Runs DatasetValidator: files are decoded in parallel, unchanged files
+        are skipped using the manifest from the previous run, and bad files are
+        moved to <dataset_dir>_quarantine instead of being deleted.
         
         Returns:
-            Dictionary with counts of valid, removed, and total images
+            Dictionary with counts of valid, removed (quarantined), total,
+            checked and reused images
         """
-        if not CV2_AVAILABLE:
-            return {"valid": 0, "removed": 0, "total": 0, "error": "OpenCV not available"}
-        
-        stats = {"valid": 0, "removed": 0, "total": 0}
+        return DatasetValidator(self.dataset_dir).validate(progress_callback)
+    
+    def load_dataset(
+        self,
+        config: Optional[TrainingConfig] = None,
+        use_cache: bool = False
+    ) -> Tuple[Any, Any, List[str]]:
+        """
+        Load the training and validation pipelines.
         
-        if not self.dataset_dir.exists():
-            return {"valid": 0, "removed": 0, "total": 0, "error": "Dataset directory not found"}
+        Args:
+            config: Training configuration (default: TrainingConfig with this manager's img_size)
+            use_cache: Stream from the preprocessed tensor cache (built on first use)
+                instead of decoding every image again
         
-        for class_dir in self.dataset_dir.iterdir():
-            if not class_dir.is_dir():
-                continue
-                
-            for image_path in class_dir.iterdir():
-                stats["total"] += 1
-                try:
-                    img = cv2.imread(str(image_path))
-                    if img is None:
-                        image_path.unlink()
-                        stats["removed"] += 1
-                        continue
-                    
-                    tip = imghdr.what(str(image_path))
-                    if tip not in self.VALID_EXTENSIONS:
-                        image_path.unlink()
-                        stats["removed"] += 1
-                        continue
-                    
-                    stats["valid"] += 1
-                    
-                except Exception:
-                    try:
-                        image_path.unlink()
-                    except:
-                        pass
-                    stats["removed"] += 1
-                
-                if progress_callback:
-                    progress_callback(stats["total"])
-        
-        return stats
-    
-    def load_dataset(self) -> Tuple[Any, Any, List[str]]:
+        Returns:
+            Tuple of (train_ds, val_ds, class_names)
+        """
+        splits = self.load_splits(config, use_cache)
+        return splits.train, splits.validation, splits.class_names
+    
+    def load_splits(
+        self,
+        config: Optional[TrainingConfig] = None,
+        use_cache: bool = False
+    ) -> DatasetSplits:
         """
-        Load dataset using TensorFlow image_dataset_from_directory.
+        Load stratified train/validation/test pipelines driven by a TrainingConfig.
+        
+        Files are listed once and split per class with config.seed, so the
+        split is the same on every run and for both sources.
+        
+        Args:
+            config: Training configuration (default: TrainingConfig with this manager's img_size)
+            use_cache: Stream from the preprocessed tensor cache (built on first use)
         
         Returns:
-            Tuple of (train_ds, val_ds, class_names)
+            DatasetSplits with batched, prefetched pipelines
         """
         if not TENSORFLOW_AVAILABLE:
             raise RuntimeError("TensorFlow not available")
@@ -138,34 +205,8 @@ class DatasetManager:
         if not self.dataset_dir.exists():
             raise FileNotFoundError(f"Dataset directory not found: {self.dataset_dir}")
         
-        # Training set
-        train_ds = tf.keras.utils.image_dataset_from_directory(
-            str(self.dataset_dir),
-            validation_split=0.1,
-            subset="training",
-            seed=123,
-            image_size=self.img_size,
-            batch_size=15
-        )
-        
-        # Validation set
-        val_ds = tf.keras.utils.image_dataset_from_directory(
-            str(self.dataset_dir),
-            validation_split=0.1,
-            subset="validation",
-            seed=123,
-            image_size=self.img_size,
-            batch_size=15
-        )
-        
-        class_names = train_ds.class_names
-        
-        # Optimize performance
-        AUTOTUNE = tf.data.AUTOTUNE
-        train_ds = train_ds.cache().shuffle(1000).prefetch(buffer_size=AUTOTUNE)
-        val_ds = val_ds.cache().prefetch(buffer_size=AUTOTUNE)
-        
-        return train_ds, val_ds, class_names
+        config = config or TrainingConfig(img_height=self.img_size[0], img_width=self.img_size[1])
+        return build_splits(self.dataset_dir, config, use_cache)
     
     def get_dataset_info(self) -> Dict[str, Any]:
         """Get information about the dataset."""
@@ -198,11 +239,15 @@ class ATKModelTrainer:
         self.model = None
         self.history = None
         self.class_names = []
+        self.precision = resolve_precision(self.config.precision)
     
     def build_model(self, num_classes: int):
         """
         Build CNN model architecture matching the notebook.
         
+        Uses the config's precision policy; the output softmax always
+        runs in float32.
+        
         Args:
             num_classes: Number of output classes
             
@@ -212,7 +257,39 @@ class ATKModelTrainer:
         if not TENSORFLOW_AVAILABLE:
             raise RuntimeError("TensorFlow not available")
         
-        model = models.Sequential([
+        configure_threads(self.config)
+        self.model = self._build(num_classes, self.precision)
+        return self.model
+    
+    def _build(self, num_classes: int, policy: str):
+        """Build and compile the architecture under a Keras dtype policy."""
+        import tensorflow as tf
+        from tensorflow.keras import layers, models, optimizers, mixed_precision
+        
+        # Layers capture the global policy when constructed; restore it afterwards
+        previous_policy = mixed_precision.global_policy()
+        mixed_precision.set_global_policy(policy)
+        try:
+            model = self._layers(num_classes)
+        finally:
+            mixed_precision.set_global_policy(previous_policy)
+        
+        model.compile(
+            optimizer=optimizers.Adam(learning_rate=self.config.learning_rate),
+            loss=tf.keras.losses.SparseCategoricalCrossentropy(from_logits=False),
+            metrics=['accuracy'],
+            jit_compile=self.config.jit_compile
+        )
+        return model
+    
+    def _layers(self, num_classes: int):
+        """Sequential model matching the notebook architecture."""
+        from tensorflow.keras import layers, models
+        from models.cnn_model import pooling_layer
+        
+        features = pooling_layer(self.config.head)
+        
+        return models.Sequential([
             # Rescaling layer (normalization)
             layers.Rescaling(1./255, input_shape=(self.config.img_height, self.config.img_width, 3)),
             
@@ -229,22 +306,13 @@ class ATKModelTrainer:
             layers.MaxPooling2D(),
             
             # Dense layers
-            layers.Flatten(),
+            features,
             layers.Dense(self.config.dense_units, activation='relu'),
             layers.Dropout(self.config.dropout_rate),
             
-            # Output
-            layers.Dense(num_classes, activation='softmax')
+            # Output (float32 softmax keeps mixed-precision probabilities stable)
+            layers.Dense(num_classes, activation='softmax', dtype='float32')
         ])
-        
-        model.compile(
-            optimizer=optimizers.Adam(learning_rate=self.config.learning_rate),
-            loss=tf.keras.losses.SparseCategoricalCrossentropy(from_logits=False),
-            metrics=['accuracy']
-        )
-        
-        self.model = model
-        return model
     
     def train(
         self,
@@ -252,7 +320,8 @@ class ATKModelTrainer:
         val_ds,
         class_names: List[str],
         model_save_path: str = "models/best_model.keras",
-        progress_callback: Optional[Callable] = None
+        progress_callback: Optional[Callable] = None,
+        verbose: Any = "auto"
     ) -> TrainingResult:
         """
         Train the model.
@@ -263,6 +332,7 @@ class ATKModelTrainer:
             class_names: List of class names
             model_save_path: Path to save the trained model
             progress_callback: Optional callback for progress updates
+            verbose: Keras fit() verbosity (0 = silent)
             
         Returns:
             TrainingResult with training metrics
@@ -274,6 +344,9 @@ class ATKModelTrainer:
         if self.model is None:
             self.build_model(num_classes)
         
+        from tensorflow import keras
+        from tensorflow.keras.callbacks import EarlyStopping, ModelCheckpoint
+        
         # Callbacks
         callbacks = [
             EarlyStopping(
@@ -301,11 +374,15 @@ class ATKModelTrainer:
             train_ds,
             validation_data=val_ds,
             epochs=self.config.epochs,
-            callbacks=callbacks
+            callbacks=callbacks,
+            verbose=verbose
         )
         
         self.history = history
         
+        if self.precision != "float32":
+            self._save_float32(num_classes, model_save_path)
+        
         # Get final metrics
         final_metrics = {
             'accuracy': history.history['accuracy'][-1],
@@ -318,9 +395,14 @@ class ATKModelTrainer:
         metadata = {
             'class_names': class_names,
             'config': asdict(self.config),
+            'training_precision': self.precision,
+            'head': self.config.head,
             'final_metrics': final_metrics,
             'timestamp': datetime.now().isoformat()
         }
+        # Checksum lets the app verify downloaded copies of this model
+        if Path(model_save_path).exists():
+            metadata['sha256'] = file_sha256(model_save_path)
         
         metadata_path = Path(model_save_path).with_suffix('.json')
         with open(metadata_path, 'w') as f:
@@ -339,12 +421,28 @@ class ATKModelTrainer:
             timestamp=datetime.now().isoformat()
         )
 
+    def _save_float32(self, num_classes: int, model_save_path: str) -> None:
+        """
+        Re-save the best checkpoint of a mixed-precision run as a float32 model.
+        
+        Mixed-precision models keep float32 variables but would also serve in
+        reduced precision; serving always gets a float32 model.
+        """
+        from tensorflow import keras
+        
+        path = Path(model_save_path)
+        trained = keras.models.load_model(str(path), compile=False) if path.exists() else self.model
+        float_model = self._build(num_classes, "float32")
+        float_model.set_weights(trained.get_weights())
+        float_model.save(str(path))
+
 
 def train_model_from_dataset(
     dataset_dir: str = "dataset_alat_tulis",
     model_save_path: str = "models/best_model.keras",
     config: Optional[TrainingConfig] = None,
-    progress_callback: Optional[Callable] = None
+    progress_callback: Optional[Callable] = None,
+    use_cache: bool = False
 ) -> TrainingResult:
     """
     Complete training pipeline.
@@ -354,12 +452,17 @@ def train_model_from_dataset(
         model_save_path: Path to save trained model
         config: Training configuration
         progress_callback: Optional progress callback
+        use_cache: Train from the preprocessed tensor cache (see models.tensor_cache)
         
     Returns:
         TrainingResult with training metrics
     """
     config = config or TrainingConfig()
     
+    # Thread pools must be sized before the input pipeline starts TensorFlow
+    if TENSORFLOW_AVAILABLE:
+        configure_threads(config)
+    
     # Initialize dataset manager
     dataset_manager = DatasetManager(
         dataset_dir,
@@ -369,32 +472,115 @@ def train_model_from_dataset(
     # Validate and clean images
     print("Validating images...")
     stats = dataset_manager.validate_and_clean_images()
-    print(f"Valid: {stats['valid']}, Removed: {stats['removed']}")
+    print(f"Valid: {stats['valid']}, Quarantined: {stats['removed']}, Re-checked: {stats.get('checked', 0)}")
     
     # Load dataset
     print("Loading dataset...")
-    train_ds, val_ds, class_names = dataset_manager.load_dataset()
-    print(f"Classes: {class_names}")
+    splits = dataset_manager.load_splits(config, use_cache=use_cache)
+    print(f"Classes: {splits.class_names}, split sizes: {splits.counts}")
     
     # Train model
     print("Training model...")
     trainer = ATKModelTrainer(config)
     result = trainer.train(
-        train_ds,
-        val_ds,
-        class_names,
+        splits.train,
+        splits.validation,
+        splits.class_names,
         model_save_path,
         progress_callback
     )
     
+    # Held-out test set
+    if splits.test is not None:
+        result.test_loss, result.test_accuracy = [float(v) for v in trainer.model.evaluate(splits.test, verbose=0)]
+        print(f"Test Accuracy: {result.test_accuracy:.4f}")
+    
     print(f"Training complete! Accuracy: {result.accuracy:.4f}, Val Accuracy: {result.val_accuracy:.4f}")
     
     return result
 
 
+def export_tflite(
+    model_path: str = "models/best_model.keras",
+    output_path: Optional[str] = None,
+    quantize: bool = False
+) -> Path:
+    """
+    Export a trained Keras model to a TFLite inference artifact.
+    
+    A sidecar .json is written next to the artifact with the source metadata
+    plus 'backend' and 'quantization', so ModelPredictor can load it directly.
+    
+    Args:
+        model_path: Path to trained .keras model
+        output_path: Destination .tflite path (default: <stem>_<quantization>.tflite)
+        quantize: Apply dynamic-range (int8 weight) quantization
+        
+    Returns:
+        Path of the written .tflite file
+    """
+    if not TENSORFLOW_AVAILABLE:
+        raise RuntimeError("TensorFlow not available")
+    
+    import tensorflow as tf
+    from tensorflow import keras
+    
+    model_path = Path(model_path)
+    quantization = "dynamic_range" if quantize else "float32"
+    output_path = Path(output_path) if output_path else model_path.with_name(
+        f"{model_path.stem}_{quantization}.tflite"
+    )
+    
+    model = keras.models.load_model(str(model_path))
+    converter = tf.lite.TFLiteConverter.from_keras_model(model)
+    if quantize:
+        converter.optimizations = [tf.lite.Optimize.DEFAULT]
+    
+    output_path.write_bytes(converter.convert())
+    
+    # Sidecar metadata for the predictor
+    metadata = {}
+    source_metadata_path = model_path.with_suffix('.json')
+    if source_metadata_path.exists():
+        with open(source_metadata_path, 'r') as f:
+            metadata = json.load(f)
+    metadata.update({
+        'backend': 'tflite',
+        'quantization': quantization,
+        'source_model': model_path.name,
+        # The source checksum belongs to the .keras file; record this artifact's own
+        'sha256': file_sha256(output_path),
+        'timestamp': datetime.now().isoformat()
+    })
+    
+    metadata_path = output_path.with_suffix('.json')
+    if metadata_path != source_metadata_path:
+        with open(metadata_path, 'w') as f:
+            json.dump(metadata, f, indent=2)
+    
+    return output_path
+
+
 if __name__ == "__main__":
-    # Run training from command line
-    result = train_model_from_dataset()
-    print(f"\nModel saved to: {result.model_path}")
-    print(f"Final accuracy: {result.accuracy:.4f}")
-    print(f"Final val_accuracy: {result.val_accuracy:.4f}")
+    import argparse
+    
+    parser = argparse.ArgumentParser(description="Train the ATK Classifier model")
+    parser.add_argument("--skip-training", action="store_true", help="Only run export steps on an existing model")
+    parser.add_argument("--export-tflite", action="store_true", help="Export a .tflite inference artifact")
+    parser.add_argument("--quantize", action="store_true", help="Use dynamic-range quantization for the TFLite export")
+    parser.add_argument("--use-cache", action="store_true", help="Train from the preprocessed tensor cache")
+    args = parser.parse_args()
+    
+    model_path = "models/best_model.keras"
+    
+    if not args.skip_training:
+        # Run training from command line
+        result = train_model_from_dataset(model_save_path=model_path, use_cache=args.use_cache)
+        print(f"\nModel saved to: {result.model_path}")
+        print(f"Final accuracy: {result.accuracy:.4f}")
+        print(f"Final val_accuracy: {result.val_accuracy:.4f}")
+    
+    if args.export_tflite:
+        tflite_path = export_tflite(model_path, quantize=args.quantize)
+        size_mb = tflite_path.stat().st_size / 1024 / 1024
+        print(f"TFLite model saved to: {tflite_path} ({size_mb:.1f}MB)")
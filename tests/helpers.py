@@ -0,0 +1,13 @@
+"""
+Shared helpers for the test suite.
+"""
+import io
+
+from PIL import Image
+
+
+def encode_png(color, size=(24, 24)) -> bytes:
+    """Encode a small solid-color PNG."""
+    buffer = io.BytesIO()
+    Image.new("RGB", size, color=color).save(buffer, format="PNG")
+    return buffer.getvalue()
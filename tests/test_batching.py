@@ -0,0 +1,140 @@
+"""
+Tests for the micro-batching module.
+Uses Hypothesis library for property-based testing.
+"""
+import threading
+
+import numpy as np
+import pytest
+from PIL import Image
+from hypothesis import given, strategies as st, settings
+
+from models.batching import MicroBatcher
+from models.inference import InferencePipeline
+
+
+class RecordingPipeline:
+    """Pipeline stand-in that records the size of every batch it receives."""
+    
+    def __init__(self):
+        self.inner = InferencePipeline(model_path=None, input_size=(16, 16))
+        self.batch_sizes = []
+    
+    def predict_batch(self, image_sources, top_k=3):
+        self.batch_sizes.append(len(image_sources))
+        if any(source == b"corrupt" for source in image_sources):
+            raise ValueError("cannot decode image")
+        return self.inner.predict_batch(image_sources, top_k=top_k)
+
+
+# **Feature: atk-classifier-mlops, Property 9: Micro-batching Coalescing**
+# **Validates: Dynamic micro-batching**
+class TestMicroBatcher:
+    """Tests for request coalescing in MicroBatcher."""
+    
+    @given(num_requests=st.integers(min_value=1, max_value=12))
+    @settings(max_examples=10, deadline=None)
+    def test_every_request_gets_its_own_result(self, num_requests):
+        """
+        For any number of queued requests, each future SHALL resolve to one result
+        and no forward pass SHALL exceed max_batch_size.
+        """
+        pipeline = RecordingPipeline()
+        batcher = MicroBatcher(pipeline, max_batch_size=4, max_wait_ms=50)
+        image = Image.new("RGB", (20, 20), color=(10, 20, 30))
+        
+        futures = [batcher.submit(image, top_k=3) for _ in range(num_requests)]
+        results = [future.result(timeout=10) for future in futures]
+        batcher.close(timeout=10)
+        
+        assert len(results) == num_requests
+        assert sum(pipeline.batch_sizes) == num_requests
+        assert max(pipeline.batch_sizes) <= 4
+    
+    def test_requests_are_coalesced(self):
+        """Requests queued inside the wait window SHALL share one forward pass."""
+        pipeline = RecordingPipeline()
+        batcher = MicroBatcher(pipeline, max_batch_size=8, max_wait_ms=500)
+        image = Image.new("RGB", (20, 20))
+        
+        futures = [batcher.submit(image) for _ in range(8)]
+        for future in futures:
+            future.result(timeout=10)
+        batcher.close(timeout=10)
+        
+        assert pipeline.batch_sizes == [8]
+        stats = batcher.get_stats()
+        assert stats["requests"] == 8
+        assert stats["batches"] == 1
+        assert stats["latency_p50_ms"] <= stats["latency_p99_ms"]
+    
+    def test_top_k_trimmed_per_request(self):
+        """Each caller SHALL receive exactly its own requested top_k."""
+        batcher = MicroBatcher(RecordingPipeline(), max_batch_size=8, max_wait_ms=200)
+        image = Image.new("RGB", (20, 20))
+        
+        small = batcher.submit(image, top_k=1)
+        large = batcher.submit(image, top_k=3)
+        
+        assert len(small.result(timeout=10).top_predictions) == 1
+        assert len(large.result(timeout=10).top_predictions) == 3
+        batcher.close(timeout=10)
+    
+    def test_bad_image_only_fails_its_own_request(self):
+        """A failing image SHALL NOT fail the other requests in its batch."""
+        batcher = MicroBatcher(RecordingPipeline(), max_batch_size=8, max_wait_ms=200)
+        good = batcher.submit(Image.new("RGB", (20, 20)))
+        bad = batcher.submit(b"corrupt")
+        
+        assert good.result(timeout=10).predicted_class in ["eraser", "kertas", "pensil"]
+        assert isinstance(bad.exception(timeout=10), ValueError)
+        batcher.close(timeout=10)
+    
+    def test_close_resolves_every_accepted_request(self):
+        """Requests racing close() SHALL either be rejected or resolve, never hang."""
+        batcher = MicroBatcher(RecordingPipeline(), max_batch_size=4, max_wait_ms=1)
+        image = Image.new("RGB", (20, 20))
+        futures = []
+        
+        def submit_many():
+            for _ in range(50):
+                try:
+                    futures.append(batcher.submit(image))
+                except RuntimeError:
+                    break
+        
+        threads = [threading.Thread(target=submit_many) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        batcher.close(timeout=10)
+        for thread in threads:
+            thread.join()
+        
+        for future in futures:
+            assert future.result(timeout=10).predicted_class in ["eraser", "kertas", "pensil"]
+        with pytest.raises(RuntimeError):
+            batcher.submit(image)
+    
+    def test_result_count_mismatch_fails_requests(self):
+        """A pipeline returning the wrong number of results SHALL fail requests instead of dropping them."""
+        class ShortPipeline(RecordingPipeline):
+            def predict_batch(self, image_sources, top_k=3):
+                return super().predict_batch(image_sources, top_k=top_k)[1:]
+        
+        batcher = MicroBatcher(ShortPipeline(), max_batch_size=8, max_wait_ms=200)
+        futures = [batcher.submit(Image.new("RGB", (20, 20))) for _ in range(3)]
+        
+        for future in futures:
+            assert isinstance(future.exception(timeout=10), RuntimeError)
+        batcher.close(timeout=10)
+    
+    def test_cancelled_request_does_not_break_batch(self):
+        """A request cancelled while queued SHALL NOT stop the rest of its batch."""
+        batcher = MicroBatcher(RecordingPipeline(), max_batch_size=8, max_wait_ms=300)
+        image = Image.new("RGB", (20, 20))
+        cancelled = batcher.submit(image)
+        kept = batcher.submit(image)
+        
+        assert cancelled.cancel()
+        assert kept.result(timeout=10).predicted_class in ["eraser", "kertas", "pensil"]
+        batcher.close(timeout=10)
@@ -0,0 +1,126 @@
+"""
+Tests for the offline bulk classification CLI.
+Uses Hypothesis library for property-based testing.
+"""
+import csv
+import json
+
+from PIL import Image
+from hypothesis import given, strategies as st, settings, HealthCheck
+
+from models.classify import classify, iter_image_paths, main
+from models.inference import InferencePipeline
+
+
+def make_tree(root, num_images):
+    """Write num_images small PNGs into two nested folders plus one corrupt file."""
+    for i in range(num_images):
+        folder = root / ("a" if i % 2 else "b") / "nested"
+        folder.mkdir(parents=True, exist_ok=True)
+        Image.new("RGB", (20, 20), color=(i, i, i)).save(folder / f"img_{i:03d}.png")
+    (root / "broken.jpg").write_bytes(b"not an image")
+    (root / "notes.txt").write_text("ignored")
+
+
+# **Feature: atk-classifier-mlops, Property 11: Bulk Classification Resume**
+# **Validates: Offline bulk classification CLI**
+class TestBulkClassification:
+    """Property tests for streaming output and resume."""
+    
+    @given(num_images=st.integers(min_value=1, max_value=12), done_count=st.integers(min_value=0, max_value=12))
+    @settings(max_examples=10, deadline=None, suppress_health_check=[HealthCheck.function_scoped_fixture])
+    def test_resume_processes_each_file_once(self, tmp_path_factory, num_images, done_count):
+        """
+        For any manifest of already-processed files, a resumed run SHALL only
+        process the remaining files, so every image appears exactly once.
+        """
+        root = tmp_path_factory.mktemp("images")
+        make_tree(root, num_images)
+        paths = list(iter_image_paths(str(root)))
+        output = root / "results.jsonl"
+        
+        # Simulate a run that crashed after done_count files
+        done = paths[:min(done_count, len(paths))]
+        output.write_text("".join(json.dumps({"path": p}) + "\n" for p in done))
+        (root / "results.jsonl.manifest").write_text("".join(p + "\n" for p in done))
+        
+        summary = classify(str(root), str(output), model_path=str(root / "missing.keras"), demo=True, resume=True, batch_size=4)
+        
+        rows = [json.loads(line) for line in output.read_text().splitlines()]
+        assert sorted(row["path"] for row in rows) == sorted(paths)
+        assert summary["skipped"] == len(done)
+        assert summary["processed"] == len(paths) - len(done)
+    
+    @given(
+        num_images=st.integers(min_value=2, max_value=12),
+        fail_after=st.integers(min_value=0, max_value=12),
+        batch_size=st.integers(min_value=1, max_value=5),
+        output_format=st.sampled_from(["jsonl", "csv"])
+    )
+    @settings(max_examples=15, deadline=None, suppress_health_check=[HealthCheck.function_scoped_fixture])
+    def test_resume_after_interrupt_writes_each_file_once(
+        self, tmp_path_factory, monkeypatch, num_images, fail_after, batch_size, output_format
+    ):
+        """
+        For any run interrupted mid-batch, a resumed run SHALL leave exactly
+        one row per image in the output, with no partial or duplicate rows.
+        """
+        root = tmp_path_factory.mktemp("images")
+        make_tree(root, num_images)
+        paths = list(iter_image_paths(str(root)))
+        output = root / f"results.{output_format}"
+        model_path = str(root / "missing.keras")
+        original = InferencePipeline.predict_stream
+        
+        def interrupted(self, *args, **kwargs):
+            for i, item in enumerate(original(self, *args, **kwargs)):
+                if i == fail_after:
+                    raise KeyboardInterrupt
+                yield item
+        
+        with monkeypatch.context() as m:
+            m.setattr(InferencePipeline, "predict_stream", interrupted)
+            try:
+                classify(str(root), str(output), model_path=model_path, demo=True, batch_size=batch_size)
+            except KeyboardInterrupt:
+                pass
+        classify(str(root), str(output), model_path=model_path, demo=True, resume=True, batch_size=batch_size)
+        
+        if output_format == "csv":
+            with open(output, newline="") as f:
+                rows = list(csv.DictReader(f))
+        else:
+            rows = [json.loads(line) for line in output.read_text().splitlines()]
+        assert sorted(row["path"] for row in rows) == sorted(paths)
+    
+    def test_csv_output_records_failures(self, tmp_path):
+        """Corrupt images SHALL be reported as error rows without stopping the run."""
+        make_tree(tmp_path, 3)
+        output = tmp_path / "results.csv"
+        
+        summary = classify(str(tmp_path), str(output), model_path=str(tmp_path / "missing.keras"), demo=True)
+        
+        with open(output, newline="") as f:
+            rows = list(csv.DictReader(f))
+        assert len(rows) == 4
+        assert summary["failed"] == 1
+        assert [row["path"] for row in rows if row["error"]] == [str(tmp_path / "broken.jpg")]
+    
+    def test_missing_model_exits_without_output(self, tmp_path):
+        """Without --demo, a model that cannot load SHALL exit non-zero and write nothing."""
+        make_tree(tmp_path, 2)
+        output = tmp_path / "results.jsonl"
+        
+        status = main([str(tmp_path), "-o", str(output), "--model", str(tmp_path / "missing.keras")])
+        
+        assert status == 1
+        assert not output.exists()
+        assert not (tmp_path / "results.jsonl.manifest").exists()
+    
+    def test_glob_target(self, tmp_path):
+        """A glob target SHALL only match image files."""
+        make_tree(tmp_path, 4)
+        
+        paths = list(iter_image_paths(str(tmp_path / "**" / "*.png")))
+        
+        assert len(paths) == 4
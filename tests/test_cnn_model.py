@@ -2,6 +2,9 @@
 Property-based tests for the CNN model module.
 Uses Hypothesis library for property-based testing.
 """
+import json
+from pathlib import Path
+
 import numpy as np
 from hypothesis import given, strategies as st, settings, assume
 
@@ -211,3 +214,224 @@ class TestTopKExceedsClassCount:
         # Should return exactly 3 predictions (capped at class count)
         assert len(result.top_predictions) == 3, \
             f"Expected 3 predictions, got {len(result.top_predictions)}"
+
+
+# **Feature: atk-classifier-mlops, Property 7: Batch Prediction Consistency**
+# **Validates: Batched prediction API**
+class TestBatchPrediction:
+    """Property tests for batched prediction."""
+    
+    SMALL_CLASS_NAMES = ["eraser", "kertas", "pensil"]
+    
+    @given(
+        seed=st.integers(min_value=0, max_value=10000),
+        batch_size=st.integers(min_value=1, max_value=16)
+    )
+    @settings(max_examples=50)
+    def test_predict_batch_returns_one_result_per_image(self, seed, batch_size):
+        """
+        For any batch of N preprocessed images, predict_batch SHALL return
+        exactly N valid PredictionResults in input order.
+        """
+        np.random.seed(seed)
+        
+        test_batch = np.random.rand(batch_size, 32, 32, 3).astype(np.float32)
+        
+        predictor = ModelPredictor(
+            model_path=None,
+            class_names=self.SMALL_CLASS_NAMES
+        )
+        
+        results = predictor.predict_batch(test_batch, top_k=3)
+        
+        assert len(results) == batch_size, \
+            f"Expected {batch_size} results, got {len(results)}"
+        
+        for result in results:
+            assert isinstance(result, PredictionResult)
+            assert result.predicted_class in self.SMALL_CLASS_NAMES
+            assert 0.0 <= result.confidence <= 1.0
+    
+    def test_predict_batch_empty(self):
+        """An empty batch SHALL return an empty list without running the model."""
+        predictor = ModelPredictor(model_path=None, class_names=self.SMALL_CLASS_NAMES)
+        
+        results = predictor.predict_batch(np.empty((0, 32, 32, 3), dtype=np.float32))
+        
+        assert results == []
+
+
+# **Feature: atk-classifier-mlops, Property 8: Backend Selection**
+# **Validates: Alternative runtime backends**
+class TestBackendSelection:
+    """Tests for picking the inference backend from suffix or metadata."""
+    
+    @given(suffix=st.sampled_from([".keras", ".h5", ".npz", ".tflite"]))
+    @settings(max_examples=10)
+    def test_known_suffix_wins_over_metadata(self, suffix):
+        """A known file suffix SHALL decide the backend even if metadata disagrees."""
+        predictor = ModelPredictor(model_path=None)
+        predictor.model_path = Path(f"model{suffix}")
+        
+        assert predictor._resolve_backend({"backend": "something-else"}) == ModelPredictor.BACKEND_BY_SUFFIX[suffix]
+    
+    def test_metadata_backend_for_unknown_suffix(self, tmp_path):
+        """An unknown suffix SHALL fall back to the sidecar metadata 'backend' key."""
+        model_path = tmp_path / "model.bin"
+        model_path.write_bytes(b"not a real model")
+        metadata = {"backend": "tflite", "class_names": ["a", "b"]}
+        (tmp_path / "model.json").write_text(json.dumps(metadata))
+        
+        predictor = ModelPredictor(model_path=str(model_path))
+        
+        assert predictor._resolve_backend(metadata) == "tflite"
+        # Corrupt artifact falls back to demo mode with the default classes instead of raising
+        assert predictor.is_demo_mode()
+        assert predictor.class_names == ModelPredictor.DEFAULT_CLASS_NAMES
+        assert predictor.get_model_info() == {"mode": "demo", "model_loaded": False}
+
+
+# **Feature: atk-classifier-mlops, Property 22: Head Variants Load Transparently**
+# **Validates: Global-average-pooling head option**
+class TestHeadVariants:
+    """Tests for the flatten and GAP classifier heads."""
+    
+    @given(head=st.sampled_from(["flatten", "gap"]))
+    @settings(max_examples=4, deadline=None)
+    def test_every_backend_loads_either_head(self, head):
+        """Keras, .npz and weight-directory artifacts of either head SHALL load and match Keras."""
+        import tempfile
+        from models.cnn_model import ATKClassifier
+        from models.numpy_engine import export_weight_dir, export_weights
+        
+        model = ATKClassifier.build_model(input_shape=(24, 24, 3), dense_units=8, head=head)
+        batch = np.random.default_rng(0).integers(0, 256, (2, 24, 24, 3)).astype(np.uint8)
+        expected = model(batch.astype(np.float32), training=False).numpy()
+        
+        with tempfile.TemporaryDirectory() as tmp:
+            keras_path = Path(tmp) / "model.keras"
+            model.save(str(keras_path))
+            artifacts = [keras_path, export_weights(model, Path(tmp) / "model.npz"),
+                         export_weight_dir(model, Path(tmp) / "model.weights")]
+            for artifact in artifacts:
+                predictor = ModelPredictor(model_path=str(artifact))
+                assert not predictor.is_demo_mode()
+                assert predictor.head == head
+                np.testing.assert_allclose(predictor._predict_probabilities(batch), expected, rtol=1e-4, atol=1e-5)
+    
+    def test_gap_head_shrinks_dense_layer(self):
+        """At 300x300 the GAP head SHALL cut the first Dense layer from ~22M to conv3_filters x dense_units weights."""
+        from models.cnn_model import ATKClassifier
+        
+        flatten = ATKClassifier.build_model(head="flatten")
+        gap = ATKClassifier.build_model(head="gap")
+        
+        assert flatten.layers[8].count_params() == 37 * 37 * 128 * 128 + 128
+        assert gap.layers[8].count_params() == 128 * 128 + 128
+    
+    def test_head_from_metadata_wins(self):
+        """A 'head' key in the sidecar metadata SHALL be reported for artifacts without layer info."""
+        predictor = ModelPredictor(model_path=None)
+        predictor._model_metadata = {"head": "gap"}
+        predictor.backend = "tflite"
+        assert predictor._resolve_head() == "gap"
+
+
+# **Feature: atk-classifier-mlops, Property 24: TFLite Export Round Trip**
+# **Validates: TFLite export and runtime backend**
+class TestTFLiteExport:
+    """Round-trip tests from ATKClassifier through export_tflite to ModelPredictor."""
+    
+    @given(quantize=st.booleans())
+    @settings(max_examples=2, deadline=None)
+    def test_exported_model_matches_keras(self, quantize):
+        """A float32 or dynamic-range export SHALL load as TFLite and match Keras probabilities."""
+        import tempfile
+        from models.cnn_model import ATKClassifier
+        from models.provisioning import file_sha256
+        from models.train_model import export_tflite
+        
+        model = ATKClassifier.build_model(input_shape=(24, 24, 3), dense_units=8)
+        batch = np.random.default_rng(0).integers(0, 256, (3, 24, 24, 3)).astype(np.uint8)
+        expected = model(batch.astype(np.float32), training=False).numpy()
+        
+        with tempfile.TemporaryDirectory() as tmp:
+            keras_path = Path(tmp) / "model.keras"
+            model.save(str(keras_path))
+            (Path(tmp) / "model.json").write_text(json.dumps({"class_names": ["a", "b", "c"], "sha256": "0" * 64}))
+            tflite_path = export_tflite(str(keras_path), quantize=quantize)
+            
+            predictor = ModelPredictor(model_path=str(tflite_path))
+            metadata = json.loads(tflite_path.with_suffix(".json").read_text())
+            
+            assert not predictor.is_demo_mode()
+            assert predictor.backend == "tflite"
+            assert predictor.class_names == ["a", "b", "c"]
+            assert metadata["quantization"] == ("dynamic_range" if quantize else "float32")
+            assert metadata["sha256"] == file_sha256(tflite_path)
+            # Dynamic-range int8 weights cost a little accuracy
+            atol = 2e-2 if quantize else 1e-5
+            for dtype in (np.uint8, np.float32):
+                probabilities = predictor._predict_probabilities(batch.astype(dtype))
+                np.testing.assert_allclose(probabilities, expected, rtol=1e-4, atol=atol)
+    
+    def test_interpreter_kept_per_batch_size(self):
+        """Alternating batch sizes SHALL reuse one interpreter per size and match single-image calls."""
+        import tempfile
+        from models.cnn_model import ATKClassifier
+        from models.tflite_engine import TFLiteModel
+        from models.train_model import export_tflite
+        
+        model = ATKClassifier.build_model(input_shape=(24, 24, 3), dense_units=8)
+        batch = np.random.default_rng(1).integers(0, 256, (2, 24, 24, 3)).astype(np.float32)
+        
+        with tempfile.TemporaryDirectory() as tmp:
+            keras_path = Path(tmp) / "model.keras"
+            model.save(str(keras_path))
+            (Path(tmp) / "model.json").write_text(json.dumps({"class_names": ["a", "b", "c"]}))
+            engine = TFLiteModel(export_tflite(str(keras_path)))
+            
+            singles = [engine(batch[i:i + 1]) for i in range(2)]
+            pair = engine(batch)
+            interpreters = dict(engine._interpreters)
+            for _ in range(2):
+                np.testing.assert_allclose(engine(batch), pair)
+                np.testing.assert_allclose(engine(batch[:1]), singles[0])
+            
+            assert engine.batch_sizes == [1, 2]
+            assert engine._interpreters == interpreters
+            np.testing.assert_allclose(pair, np.concatenate(singles), rtol=1e-5, atol=1e-6)
+
+
+# **Feature: atk-classifier-mlops, Property 25: Traced Forward Parity**
+# **Validates: Traced forward pass**
+class TestTracedForward:
+    """Tests for the tf.function forward pass used instead of model.predict."""
+    
+    def test_forward_matches_predict_without_retracing(self):
+        """
+        For uint8 and float32 batches of any size, the traced forward pass SHALL
+        match model.predict and trace once per dtype.
+        """
+        from models.cnn_model import ATKClassifier
+        
+        model = ATKClassifier.build_model(input_shape=(24, 24, 3), dense_units=8)
+        
+        class CountingModel:
+            """Model proxy counting Python-level calls, i.e. traces."""
+            input_shape = model.input_shape
+            calls = 0
+            
+            def __call__(self, batch, training):
+                CountingModel.calls += 1
+                return model(batch, training=training)
+        
+        forward = ModelPredictor._build_forward(CountingModel())
+        rng = np.random.default_rng(0)
+        for batch_size in (1, 3, 8, 3, 1):
+            batch = rng.integers(0, 256, (batch_size, 24, 24, 3)).astype(np.uint8)
+            expected = model.predict(batch.astype(np.float32), verbose=0)
+            for dtype in (np.uint8, np.float32):
+                np.testing.assert_allclose(np.asarray(forward(batch.astype(dtype))), expected, rtol=1e-5, atol=1e-6)
+        
+        assert CountingModel.calls == 2
@@ -0,0 +1,75 @@
+"""
+Tests for the dataset validation module.
+Uses Hypothesis library for property-based testing.
+"""
+import io
+import os
+
+from PIL import Image
+from hypothesis import given, strategies as st, settings, HealthCheck
+
+from models.dataset_validation import DatasetValidator
+
+
+def write_image(path, image_format="JPEG", size=(12, 10)):
+    """Write a small solid-color image and return its bytes."""
+    buffer = io.BytesIO()
+    Image.new("RGB", size, (90, 30, 160)).save(buffer, format=image_format)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(buffer.getvalue())
+    return buffer.getvalue()
+
+
+# **Feature: atk-classifier-mlops, Property 17: Non-destructive Dataset Validation**
+# **Validates: Parallel dataset validation with manifest**
+class TestDatasetValidator:
+    """Tests for DatasetValidator."""
+    
+    @given(
+        kinds=st.lists(st.sampled_from(["jpeg", "png", "truncated", "garbage", "gif"]), min_size=1, max_size=8),
+        num_workers=st.integers(min_value=1, max_value=4)
+    )
+    @settings(max_examples=15, deadline=None, suppress_health_check=[HealthCheck.function_scoped_fixture])
+    def test_bad_files_are_quarantined_not_deleted(self, tmp_path_factory, kinds, num_workers):
+        """Every file SHALL end up either valid in the dataset or in quarantine; none SHALL be deleted."""
+        root = tmp_path_factory.mktemp("data")
+        dataset = root / "dataset"
+        for i, kind in enumerate(kinds):
+            path = dataset / f"class{i % 2}" / f"img{i}.{'png' if kind == 'png' else 'jpg'}"
+            if kind in ("jpeg", "png", "gif"):
+                write_image(path, {"jpeg": "JPEG", "png": "PNG", "gif": "GIF"}[kind])
+            elif kind == "truncated":
+                path.write_bytes(write_image(path)[:-40])
+            else:
+                path.parent.mkdir(parents=True, exist_ok=True)
+                path.write_bytes(b"not an image")
+        
+        stats = DatasetValidator(dataset, num_workers=num_workers).validate()
+        
+        bad = sum(kind not in ("jpeg", "png") for kind in kinds)
+        assert stats["total"] == len(kinds)
+        assert stats["removed"] == bad
+        assert stats["valid"] == len(kinds) - bad
+        remaining = sum(len(files) for _, _, files in os.walk(dataset / "class0")) + \
+            sum(len(files) for _, _, files in os.walk(dataset / "class1"))
+        quarantined = sum(len(files) for _, _, files in os.walk(root / "dataset_quarantine"))
+        assert remaining == len(kinds) - bad
+        assert quarantined == bad
+    
+    def test_rerun_only_checks_changed_files(self, tmp_path):
+        """A second run SHALL reuse unchanged files and re-check only modified ones."""
+        dataset = tmp_path / "dataset"
+        for i in range(3):
+            write_image(dataset / "pensil" / f"img{i}.jpg")
+        validator = DatasetValidator(dataset)
+        
+        assert validator.validate()["checked"] == 3
+        assert validator.validate() == {"valid": 3, "removed": 0, "total": 3, "checked": 0, "reused": 3}
+        
+        write_image(dataset / "pensil" / "img1.jpg", size=(30, 20))
+        stats = validator.validate()
+        assert (stats["checked"], stats["reused"]) == (1, 2)
+        
+        record = validator.load_manifest()["pensil/img1.jpg"]
+        assert (record.format, record.width, record.height, record.status) == ("JPEG", 30, 20, "valid")
+        assert len(record.sha256) == 64
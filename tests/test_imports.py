@@ -0,0 +1,22 @@
+"""
+Tests for import-time behaviour of the models package.
+"""
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT_DIR = Path(__file__).parent.parent
+
+
+# **Feature: atk-classifier-mlops, Property 12: Lazy TensorFlow Import**
+# **Validates: Fast app cold start**
+@pytest.mark.parametrize("module", ["models", "models.preprocessing", "models.inference", "models.train_model"])
+def test_import_does_not_load_tensorflow(module):
+    """Importing the models package SHALL NOT import TensorFlow."""
+    code = f"import sys, {module}; sys.exit('tensorflow' in sys.modules)"
+    
+    result = subprocess.run([sys.executable, "-c", code], cwd=str(ROOT_DIR))
+    
+    assert result.returncode == 0
@@ -0,0 +1,141 @@
+"""
+Tests for the inference pipeline module.
+Uses Hypothesis library for property-based testing.
+"""
+import io
+import tempfile
+from pathlib import Path
+
+import numpy as np
+from hypothesis import given, strategies as st, settings
+
+from models.inference import InferencePipeline, PredictionCache
+from models.numpy_engine import write_weight_dir
+from tests.helpers import encode_png
+
+
+# **Feature: atk-classifier-mlops, Property 11: Prediction Cache**
+# **Validates: Content-hash prediction cache**
+class TestPredictionCache:
+    """Tests for the content-hash prediction cache."""
+    
+    @given(repeats=st.integers(min_value=1, max_value=5))
+    @settings(max_examples=10, deadline=None)
+    def test_identical_input_hits_cache(self, repeats):
+        """
+        For any number of repeated predictions on the same bytes, only the
+        first SHALL miss and every result SHALL be identical.
+        """
+        pipeline = InferencePipeline(model_path=None, input_size=(16, 16))
+        image_bytes = encode_png((200, 10, 10))
+        
+        results = [pipeline.predict(image_bytes) for _ in range(repeats + 1)]
+        
+        assert pipeline.cache_info()["misses"] == 1
+        assert pipeline.cache_info()["hits"] == repeats
+        assert all(result == results[0] for result in results)
+    
+    def test_bytes_and_bytesio_share_entry(self):
+        """Raw bytes and a BytesIO with the same content SHALL map to one entry."""
+        pipeline = InferencePipeline(model_path=None, input_size=(16, 16))
+        image_bytes = encode_png((1, 2, 3))
+        
+        pipeline.predict(image_bytes)
+        pipeline.predict(io.BytesIO(image_bytes))
+        
+        assert pipeline.cache_info() == {"hits": 1, "misses": 1, "size": 1, "maxsize": 128}
+    
+    def test_top_k_and_model_version_are_part_of_key(self):
+        """A different top_k or model version SHALL NOT reuse a cached result."""
+        pipeline = InferencePipeline(model_path=None, input_size=(16, 16))
+        image_bytes = encode_png((9, 9, 9))
+        
+        pipeline.predict(image_bytes, top_k=3)
+        pipeline.predict(image_bytes, top_k=1)
+        key_a = pipeline._cache_key(image_bytes, "keras:a.keras:1:1", 3)
+        key_b = pipeline._cache_key(image_bytes, "keras:a.keras:1:2", 3)
+        
+        assert pipeline.cache_info()["misses"] == 2
+        assert key_a != key_b
+    
+    def test_batch_only_predicts_misses(self):
+        """predict_batch SHALL send only uncached images through the model."""
+        pipeline = InferencePipeline(model_path=None, input_size=(16, 16))
+        cached, fresh = encode_png((10, 10, 10)), encode_png((20, 20, 20))
+        pipeline.predict(cached)
+        
+        seen = []
+        original = pipeline.predictor.predict_batch
+        pipeline.predictor.predict_batch = lambda batch, top_k=3: seen.append(len(batch)) or original(batch, top_k)
+        results = pipeline.predict_batch([cached, fresh, cached])
+        
+        assert seen == [1]
+        assert len(results) == 3
+        assert results[0] == results[2]
+    
+    @given(maxsize=st.integers(min_value=1, max_value=5), inserts=st.integers(min_value=0, max_value=10))
+    @settings(max_examples=30)
+    def test_lru_is_bounded(self, maxsize, inserts):
+        """For any sequence of inserts, the cache SHALL hold at most maxsize entries."""
+        cache = PredictionCache(maxsize=maxsize)
+        for i in range(inserts):
+            cache.put(str(i), object())
+        
+        assert cache.info()["size"] == min(maxsize, inserts)
+        if inserts > maxsize:
+            assert cache.get("0") is None
+            assert cache.get(str(inserts - 1)) is not None
+
+
+def write_dense_model(path, input_size=(8, 8)):
+    """Write a Flatten -> Dense softmax NumPy weight directory with random weights."""
+    width, height = input_size
+    architecture = {
+        "input_shape": [height, width, 3],
+        "layers": [
+            {"type": "Rescaling", "name": "rescale", "scale": 1 / 255.0, "offset": 0.0},
+            {"type": "Flatten", "name": "flatten"},
+            {"type": "Dense", "name": "dense", "activation": "softmax", "kernel": "kernel", "bias": "bias"}
+        ]
+    }
+    rng = np.random.default_rng(0)
+    weights = {
+        "kernel": rng.normal(size=(height * width * 3, 3)).astype(np.float32),
+        "bias": np.zeros(3, dtype=np.float32)
+    }
+    return write_weight_dir(architecture, weights, path)
+
+
+# **Feature: atk-classifier-mlops, Property 15: Warm-up Readiness**
+# **Validates: Warm-up and readiness probing**
+class TestWarmupReadiness:
+    """Tests for model warm-up and the readiness report."""
+    
+    @given(batch_sizes=st.lists(st.integers(min_value=1, max_value=6), min_size=1, max_size=4))
+    @settings(max_examples=10, deadline=None)
+    def test_warmup_runs_each_batch_size_once(self, batch_sizes):
+        """Warm-up SHALL run one forward pass per distinct batch size before reporting ready."""
+        with tempfile.TemporaryDirectory() as tmp:
+            pipeline = InferencePipeline(model_path=str(write_dense_model(Path(tmp) / "m.weights")), input_size=(8, 8))
+            seen = []
+            forward = pipeline.predictor._forward
+            pipeline.predictor._forward = lambda batch: seen.append(batch.shape) or forward(batch)
+            
+            assert pipeline.readiness().load_time_sec is not None
+            pipeline.warmup(batch_sizes)
+            
+            assert seen == [(n, 8, 8, 3) for n in sorted(set(batch_sizes))]
+            readiness = pipeline.readiness()
+            assert readiness.ready and readiness.warmup_time_sec is not None
+            assert readiness.warmup_batch_sizes == sorted(set(batch_sizes))
+    
+    def test_demo_mode_is_not_ready_until_reload(self, tmp_path):
+        """A demo pipeline SHALL not be ready; a reloaded model SHALL be warmed up before the swap."""
+        pipeline = InferencePipeline(model_path=str(tmp_path / "missing.weights"), input_size=(8, 8))
+        assert pipeline.warmup([1, 2]) == 0.0
+        assert not pipeline.readiness().ready
+        
+        assert pipeline.reload_model(str(write_dense_model(tmp_path / "missing.weights")))
+        readiness = pipeline.readiness()
+        assert readiness.ready and readiness.backend == "numpy"
+        assert readiness.warmup_time_sec is not None
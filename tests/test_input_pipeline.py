@@ -0,0 +1,96 @@
+"""
+Tests for the training input pipeline.
+Uses Hypothesis library for property-based testing.
+"""
+import io
+
+import numpy as np
+import pytest
+from PIL import Image
+from hypothesis import given, strategies as st, settings
+
+from models.input_pipeline import build_splits, stratified_split
+from models.train_model import TrainingConfig
+
+
+def write_dataset(root, counts, size=(20, 16)):
+    """Write a class-per-folder dataset of small solid-color JPEGs."""
+    for label, count in enumerate(counts):
+        for i in range(count):
+            buffer = io.BytesIO()
+            Image.new("RGB", size, (10 * i, 60 * label, 90)).save(buffer, format="JPEG")
+            path = root / f"class{label}" / f"img{i}.jpg"
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_bytes(buffer.getvalue())
+    return root
+
+
+# **Feature: atk-classifier-mlops, Property 19: Stratified Reproducible Splits**
+# **Validates: Split-aware training input pipeline**
+class TestStratifiedSplit:
+    """Property tests for stratified_split."""
+    
+    @given(
+        counts=st.lists(st.integers(min_value=1, max_value=60), min_size=1, max_size=5),
+        validation_split=st.floats(min_value=0.0, max_value=0.45),
+        test_split=st.floats(min_value=0.0, max_value=0.45),
+        seed=st.integers(min_value=0, max_value=2**31)
+    )
+    @settings(max_examples=100)
+    def test_split_is_a_stratified_partition(self, counts, validation_split, test_split, seed):
+        """Splits SHALL partition the rows, keep per-class fractions and repeat for the same seed."""
+        labels = np.repeat(np.arange(len(counts)), counts)
+        np.random.default_rng(seed).shuffle(labels)
+        
+        splits = stratified_split(labels, validation_split, test_split, seed)
+        
+        assert np.array_equal(np.sort(np.concatenate(list(splits.values()))), np.arange(len(labels)))
+        for label, count in enumerate(counts):
+            assert np.sum(labels[splits["validation"]] == label) == int(round(validation_split * count))
+            assert np.sum(labels[splits["test"]] == label) == int(round(test_split * count))
+        again = stratified_split(labels, validation_split, test_split, seed)
+        assert all(np.array_equal(splits[name], again[name]) for name in splits)
+    
+    def test_invalid_fractions_raise(self):
+        """Fractions leaving no training data SHALL raise ValueError."""
+        with pytest.raises(ValueError):
+            stratified_split([0, 1], 0.5, 0.5)
+
+
+class TestBuildSplits:
+    """Tests for the tf.data pipelines."""
+    
+    def test_pipelines_follow_training_config(self, tmp_path):
+        """Batch size, split sizes and image size SHALL come from TrainingConfig for both sources."""
+        dataset = write_dataset(tmp_path / "dataset", [10, 10])
+        config = TrainingConfig(img_height=12, img_width=8, batch_size=4, validation_split=0.2, test_split=0.1, augment=True)
+        
+        for use_cache in (False, True):
+            splits = build_splits(dataset, config, use_cache=use_cache)
+            assert splits.counts == {"train": 14, "validation": 4, "test": 2}
+            batches = list(splits.train)
+            assert [int(labels.shape[0]) for _, labels in batches] == [4, 4, 4, 2]
+            assert tuple(batches[0][0].shape) == (4, 12, 8, 3)
+            assert float(np.max([images.numpy().max() for images, _ in batches])) <= 255.0
+            labels = sorted(np.concatenate([labels.numpy() for _, labels in splits.validation]).tolist())
+            assert labels == [0, 0, 1, 1]
+    
+    def test_cache_and_decode_sources_match(self, tmp_path):
+        """Both sources SHALL yield identical tensors, including for RGBA PNGs."""
+        dataset = write_dataset(tmp_path / "dataset", [4, 3], size=(37, 29))
+        rgba = np.random.default_rng(0).integers(0, 256, (29, 37, 4), dtype=np.uint8)
+        Image.fromarray(rgba, "RGBA").save(dataset / "class0" / "alpha.png")
+        config = TrainingConfig(img_height=12, img_width=10, batch_size=3, validation_split=0.4)
+        
+        decoded, cached = (build_splits(dataset, config, use_cache=use_cache) for use_cache in (False, True))
+        
+        for split in ("validation", "train"):
+            decoded_batches = list(getattr(decoded, split))
+            cached_batches = list(getattr(cached, split))
+            decoded_images = np.concatenate([images.numpy() for images, _ in decoded_batches])
+            cached_images = np.concatenate([images.numpy() for images, _ in cached_batches])
+            decoded_labels = np.concatenate([labels.numpy() for _, labels in decoded_batches])
+            cached_labels = np.concatenate([labels.numpy() for _, labels in cached_batches])
+            # Rows are shuffled independently per source; compare them as sorted sets
+            key = lambda images, labels: sorted(zip(labels.tolist(), (image.tobytes() for image in images)))
+            assert key(decoded_images, decoded_labels) == key(cached_images, cached_labels)
@@ -0,0 +1,100 @@
+"""
+Tests for the latency metrics module.
+Uses Hypothesis library for property-based testing.
+"""
+import io
+
+import numpy as np
+import pytest
+from PIL import Image
+from hypothesis import given, strategies as st, settings
+
+from models.metrics import MetricsRegistry, RollingHistogram, PrometheusTextfileSink, metrics
+from models.inference import InferencePipeline
+
+
+@pytest.fixture
+def enabled_metrics():
+    """Enable the process-wide registry for one test, then restore it."""
+    was_enabled = metrics.enabled
+    metrics.reset()
+    metrics.enabled = True
+    yield metrics
+    metrics.enabled = was_enabled
+    metrics.reset()
+
+
+def encode_jpeg(size=(64, 48)) -> bytes:
+    """Encode a solid-color JPEG."""
+    buffer = io.BytesIO()
+    Image.new("RGB", size, (120, 60, 30)).save(buffer, format="JPEG")
+    return buffer.getvalue()
+
+
+# **Feature: atk-classifier-mlops, Property 16: Rolling Latency Histograms**
+# **Validates: Inference latency instrumentation**
+class TestRollingHistogram:
+    """Property tests for RollingHistogram."""
+    
+    @given(
+        values=st.lists(st.floats(min_value=0, max_value=10, allow_nan=False), min_size=1, max_size=200),
+        window=st.integers(min_value=1, max_value=50)
+    )
+    @settings(max_examples=50)
+    def test_percentiles_cover_window_and_count_is_cumulative(self, values, window):
+        """Percentiles SHALL cover the last `window` values; count and sum SHALL cover all of them."""
+        histogram = RollingHistogram(window=window)
+        for value in values:
+            histogram.observe(value)
+        
+        summary = histogram.snapshot()
+        recent = np.array(values[-window:])
+        assert summary["count"] == len(values)
+        assert summary["sum_sec"] == pytest.approx(sum(values))
+        assert summary["p50_ms"] == pytest.approx(np.percentile(recent, 50) * 1000)
+        assert summary["p99_ms"] == pytest.approx(np.percentile(recent, 99) * 1000)
+        assert summary["p50_ms"] <= summary["p95_ms"] <= summary["p99_ms"]
+
+
+class TestMetricsRegistry:
+    """Tests for stage timers, hooks and sinks."""
+    
+    def test_disabled_registry_records_nothing(self):
+        """A disabled registry SHALL hand out a shared no-op timer and record nothing."""
+        registry = MetricsRegistry(enabled=False)
+        assert registry.timer("decode") is registry.timer("forward")
+        with registry.timer("decode"):
+            pass
+        assert registry.snapshot() == {}
+    
+    def test_pipeline_records_every_stage(self, enabled_metrics):
+        """An enabled pipeline prediction SHALL record decode, resize, to_array, forward, postprocess and pipeline."""
+        seen = []
+        registry = MetricsRegistry(enabled=True)
+        registry.add_hook(lambda stage, seconds: seen.append(stage))
+        enabled_metrics.add_hook(registry.observe)
+        try:
+            pipeline = InferencePipeline(model_path=None, input_size=(16, 16), cache_size=0)
+            pipeline.predict_batch([encode_jpeg(), encode_jpeg((20, 20))])
+        finally:
+            enabled_metrics._hooks = []
+        
+        stats = enabled_metrics.snapshot()
+        assert set(stats) == {"decode", "resize", "to_array", "forward", "postprocess", "pipeline"}
+        assert stats["decode"]["count"] == 2
+        assert stats["forward"]["count"] == 1
+        assert sorted(set(seen)) == sorted(stats)
+    
+    def test_prometheus_sink_writes_summary(self, tmp_path):
+        """The Prometheus sink SHALL write quantile, sum and count series per stage."""
+        registry = MetricsRegistry(enabled=True)
+        for seconds in (0.01, 0.02, 0.03):
+            registry.observe("forward", seconds)
+        registry.add_sink(PrometheusTextfileSink(tmp_path / "atk.prom"))
+        registry.flush()
+        
+        lines = (tmp_path / "atk.prom").read_text().splitlines()
+        assert "# TYPE atk_classifier_stage_duration_seconds summary" in lines
+        assert 'atk_classifier_stage_duration_seconds{stage="forward",quantile="0.5"} 0.020000000' in lines
+        assert 'atk_classifier_stage_duration_seconds_count{stage="forward"} 3' in lines
+        assert not (tmp_path / "atk.prom.tmp").exists()
@@ -0,0 +1,141 @@
+"""
+Tests for the NumPy inference engine.
+Uses Hypothesis library for property-based testing.
+"""
+import numpy as np
+import pytest
+from hypothesis import given, strategies as st, settings
+
+from models.numpy_engine import NumpyCNN, conv2d, max_pool2d, export_weights, write_weight_dir
+from models.cnn_model import ModelPredictor
+
+
+def naive_conv2d_same(x, kernel, bias):
+    """Reference 'same' convolution with explicit loops (odd kernels, stride 1)."""
+    kh, kw, _, c_out = kernel.shape
+    n, h, w, _ = x.shape
+    padded = np.pad(x, ((0, 0), (kh // 2, kh // 2), (kw // 2, kw // 2), (0, 0)))
+    out = np.zeros((n, h, w, c_out), dtype=np.float64)
+    for i in range(h):
+        for j in range(w):
+            patch = padded[:, i:i + kh, j:j + kw, :]
+            out[:, i, j, :] = np.tensordot(patch, kernel, axes=([1, 2, 3], [0, 1, 2]))
+    return out + bias
+
+
+# **Feature: atk-classifier-mlops, Property 10: im2col Convolution Correctness**
+# **Validates: NumPy inference engine**
+class TestNumpyLayers:
+    """Property tests for the NumPy layer implementations."""
+    
+    @given(
+        seed=st.integers(min_value=0, max_value=10000),
+        size=st.integers(min_value=1, max_value=9),
+        c_in=st.integers(min_value=1, max_value=4),
+        c_out=st.integers(min_value=1, max_value=4)
+    )
+    @settings(max_examples=50, deadline=None)
+    def test_conv2d_matches_naive(self, seed, size, c_in, c_out):
+        """
+        For any input and 3x3 kernel, the im2col convolution SHALL match
+        a direct loop implementation.
+        """
+        rng = np.random.default_rng(seed)
+        x = rng.standard_normal((2, size, size + 1, c_in)).astype(np.float32)
+        kernel = rng.standard_normal((3, 3, c_in, c_out)).astype(np.float32)
+        bias = rng.standard_normal(c_out).astype(np.float32)
+        
+        np.testing.assert_allclose(
+            conv2d(x, kernel, bias), naive_conv2d_same(x, kernel, bias), rtol=1e-4, atol=1e-4
+        )
+    
+    @given(
+        seed=st.integers(min_value=0, max_value=10000),
+        height=st.integers(min_value=2, max_value=11),
+        width=st.integers(min_value=2, max_value=11)
+    )
+    @settings(max_examples=50)
+    def test_max_pool_floors_odd_sizes(self, seed, height, width):
+        """For any H x W input, 2x2 max pooling SHALL output (H // 2, W // 2)."""
+        x = np.random.default_rng(seed).standard_normal((1, height, width, 2)).astype(np.float32)
+        
+        pooled = max_pool2d(x)
+        
+        assert pooled.shape == (1, height // 2, width // 2, 2)
+        assert pooled[0, 0, 0, 0] == x[0, :2, :2, 0].max()
+
+
+class TestKerasParity:
+    """Parity tests between the NumPy engine and Keras (skipped without TensorFlow)."""
+    
+    def test_exported_model_matches_keras(self, tmp_path):
+        """The NumPy forward pass SHALL match Keras within float32 tolerance."""
+        pytest.importorskip("tensorflow")
+        from models.cnn_model import ATKClassifier
+        
+        model = ATKClassifier.build_model(input_shape=(32, 32, 3), dense_units=16)
+        npz_path = export_weights(model, tmp_path / "model.npz")
+        
+        batch = np.random.default_rng(0).uniform(0, 255, (4, 32, 32, 3)).astype(np.float32)
+        expected = model(batch, training=False).numpy()
+        
+        np.testing.assert_allclose(NumpyCNN.load(npz_path)(batch), expected, rtol=1e-4, atol=1e-5)
+        
+        predictor = ModelPredictor(model_path=str(npz_path))
+        assert predictor.backend == "numpy"
+        assert not predictor.is_demo_mode()
+
+
+def tiny_engine(seed=0):
+    """Conv -> pool -> dense engine on 8x8 inputs with random weights."""
+    rng = np.random.default_rng(seed)
+    architecture = {
+        "input_shape": [8, 8, 3],
+        "layers": [
+            {"type": "Rescaling", "name": "rescale", "scale": 1 / 255.0, "offset": 0.0},
+            {"type": "Conv2D", "name": "conv", "padding": "same", "strides": [1, 1],
+             "activation": "relu", "kernel": "conv_kernel", "bias": "conv_bias"},
+            {"type": "MaxPooling2D", "name": "pool", "pool_size": [2, 2], "strides": [2, 2], "padding": "valid"},
+            {"type": "Flatten", "name": "flatten"},
+            {"type": "Dense", "name": "dense", "activation": "softmax", "kernel": "dense_kernel", "bias": "dense_bias"}
+        ]
+    }
+    weights = {
+        "conv_kernel": rng.normal(size=(3, 3, 3, 4)).astype(np.float32),
+        "conv_bias": rng.normal(size=4).astype(np.float32),
+        "dense_kernel": rng.normal(size=(64, 3)).astype(np.float32),
+        "dense_bias": rng.normal(size=3).astype(np.float32)
+    }
+    return NumpyCNN(architecture, weights)
+
+
+# **Feature: atk-classifier-mlops, Property 14: Memory-Mapped Weight Equivalence**
+# **Validates: Memory-mapped weight loading**
+class TestWeightDirectory:
+    """Tests for the memory-mappable weight directory format."""
+    
+    @settings(max_examples=10, deadline=None)
+    @given(seed=st.integers(0, 1000))
+    def test_mmap_matches_in_memory(self, tmp_path_factory, seed):
+        """Memory-mapped weights SHALL give the same output as in-memory weights."""
+        engine = tiny_engine(seed)
+        weight_dir = write_weight_dir(engine.architecture, engine.weights, tmp_path_factory.mktemp("w") / "m.weights")
+        mapped = NumpyCNN.load(weight_dir)
+        
+        batch = np.random.default_rng(seed).integers(0, 256, (2, 8, 8, 3), dtype=np.uint8)
+        np.testing.assert_array_equal(mapped(batch), engine(batch))
+    
+    def test_weights_are_read_only_maps(self, tmp_path):
+        """Weights from a directory SHALL be read-only memory maps shared through the page cache."""
+        engine = tiny_engine()
+        weight_dir = write_weight_dir(engine.architecture, engine.weights, tmp_path / "m.weights")
+        
+        mapped = NumpyCNN.load(weight_dir)
+        for array in mapped.weights.values():
+            assert isinstance(array, np.memmap)
+            assert not array.flags.writeable
+        assert not any(isinstance(a, np.memmap) for a in NumpyCNN.load(weight_dir, mmap=False).weights.values())
+        
+        predictor = ModelPredictor(model_path=str(weight_dir))
+        assert predictor.backend == "numpy"
+        assert not predictor.is_demo_mode()
@@ -0,0 +1,55 @@
+"""
+Tests for the parallel preprocessing module.
+Uses Hypothesis library for property-based testing.
+"""
+from hypothesis import given, strategies as st, settings
+
+from models.inference import InferencePipeline
+from models.parallel import ParallelPreprocessor
+from tests.helpers import encode_png
+
+
+# **Feature: atk-classifier-mlops, Property 10: Parallel Preprocessing Order**
+# **Validates: Parallel batch and folder inference**
+class TestParallelPreprocessing:
+    """Property tests for the threaded preprocessing stage."""
+    
+    @given(
+        flags=st.lists(st.booleans(), min_size=1, max_size=20),
+        batch_size=st.integers(min_value=1, max_value=6),
+        num_workers=st.integers(min_value=1, max_value=4)
+    )
+    @settings(max_examples=15, deadline=None)
+    def test_stream_preserves_order_and_isolates_failures(self, flags, batch_size, num_workers):
+        """
+        For any mix of valid and corrupt images, predict_stream SHALL yield one
+        item per input in input order, with exceptions only for corrupt images.
+        """
+        sources = [encode_png((i, 0, 0)) if ok else b"corrupt-%d" % i for i, ok in enumerate(flags)]
+        pipeline = InferencePipeline(model_path=None, input_size=(16, 16))
+        
+        results = list(pipeline.predict_stream(sources, batch_size=batch_size, num_workers=num_workers))
+        
+        assert [source for source, _ in results] == sources
+        for ok, (_, result) in zip(flags, results):
+            assert isinstance(result, Exception) != ok
+    
+    def test_batches_hold_decoded_pixels(self):
+        """Each yielded batch row SHALL hold the pixels of its own source image."""
+        sources = [encode_png((i * 10, 5, 7)) for i in range(7)]
+        stage = ParallelPreprocessor(InferencePipeline(input_size=(8, 8)).preprocessor, num_workers=3)
+        
+        rows = []
+        for batch_sources, batch, errors in stage.iter_batches(sources, batch_size=3):
+            assert not errors
+            rows.extend(int(batch[i, 0, 0, 0]) for i in range(len(batch_sources)))
+        
+        assert rows == [i * 10 for i in range(7)]
+    
+    def test_early_close_stops_producer(self):
+        """Closing the stream early SHALL NOT hang or leak the producer thread."""
+        sources = [encode_png((1, 2, 3))] * 50
+        stream = InferencePipeline(input_size=(8, 8)).predict_stream(sources, batch_size=2, prefetch_batches=1)
+        
+        next(stream)
+        stream.close()
@@ -2,7 +2,11 @@
 Property-based tests for the preprocessing module.
 Uses Hypothesis library for property-based testing.
 """
+import io
+import tracemalloc
+
 import numpy as np
+import pytest
 from PIL import Image
 from hypothesis import given, strategies as st, settings, HealthCheck
 
@@ -54,6 +58,164 @@ class TestResizeOutputDimensions:
             f"Expected shape (1, 224, 224, 3), got {result.shape}"
 
 
+# **Feature: atk-classifier-mlops, Property 6b: Batch Output Dimensions**
+# **Validates: Batched prediction API**
+class TestBatchOutputDimensions:
+    """Property tests for batch preprocessing output dimensions."""
+    
+    @given(images=st.lists(random_image(), min_size=1, max_size=5))
+    @settings(max_examples=30, suppress_health_check=[HealthCheck.too_slow])
+    def test_preprocess_batch_matches_single(self, images):
+        """
+        For any list of N images, preprocess_batch SHALL return shape
+        (N, 64, 64, 3) with each row equal to the single-image preprocess output.
+        """
+        preprocessor = ImagePreprocessor(input_size=(64, 64))
+        batch = preprocessor.preprocess_batch(images)
+        
+        assert batch.shape == (len(images), 64, 64, 3), \
+            f"Expected shape ({len(images)}, 64, 64, 3), got {batch.shape}"
+        
+        for i, image in enumerate(images):
+            np.testing.assert_array_equal(batch[i], preprocessor.preprocess(image)[0])
+
+
+# **Feature: atk-classifier-mlops, Property 6c: Fast Decode Fidelity**
+# **Validates: Fast decode path**
+class TestFastDecode:
+    """Property tests for reduced-size JPEG decoding."""
+    
+    @given(
+        width=st.integers(min_value=64, max_value=1200),
+        height=st.integers(min_value=64, max_value=1200),
+        seed=st.integers(min_value=0, max_value=1000)
+    )
+    @settings(max_examples=20, deadline=None)
+    def test_fast_decode_close_to_full_decode(self, width, height, seed):
+        """
+        For any JPEG, fast decode SHALL produce the same shape as full decode
+        with only a small mean pixel drift.
+        """
+        rng = np.random.default_rng(seed)
+        # Smooth gradient image so the comparison is not dominated by JPEG noise
+        gradient = np.linspace(0, 255, width, dtype=np.float32)[None, :, None]
+        pixels = np.broadcast_to(gradient, (height, width, 3)) * rng.uniform(0.3, 1.0, 3)
+        buffer = io.BytesIO()
+        Image.fromarray(pixels.astype(np.uint8)).save(buffer, format="JPEG", quality=90)
+        data = buffer.getvalue()
+        
+        full = ImagePreprocessor(input_size=(64, 64), normalize=False).preprocess(data)
+        fast = ImagePreprocessor(input_size=(64, 64), normalize=False, fast_decode=True).preprocess(data)
+        
+        assert fast.shape == full.shape == (1, 64, 64, 3)
+        assert np.abs(fast - full).mean() < 4.0
+    
+    def test_fast_decode_does_not_mutate_caller_image(self):
+        """Fast decode SHALL NOT draft a PIL Image owned by the caller."""
+        buffer = io.BytesIO()
+        Image.new("RGB", (800, 600), color=(1, 2, 3)).save(buffer, format="JPEG")
+        image = Image.open(io.BytesIO(buffer.getvalue()))
+        
+        ImagePreprocessor(input_size=(64, 64), fast_decode=True).preprocess(image)
+        
+        assert image.size == (800, 600)
+
+
+class TestResampleFilter:
+    """Tests for the configurable resampling filter."""
+    
+    @given(name=st.sampled_from(sorted(ImagePreprocessor.RESAMPLE_FILTERS)))
+    @settings(max_examples=10, deadline=None)
+    def test_every_filter_resizes_to_target(self, name):
+        """For any supported filter, the output SHALL have the target dimensions."""
+        image = Image.new("P", (120, 80))
+        
+        result = ImagePreprocessor(input_size=(32, 24), resample=name).preprocess(image)
+        
+        assert result.shape == (1, 24, 32, 3)
+    
+    @given(name=st.sampled_from(sorted(ImagePreprocessor.RESAMPLE_FILTERS)))
+    @settings(max_examples=10, deadline=None)
+    def test_filter_matches_pil_resize(self, name):
+        """For any supported filter, the pixels SHALL equal PIL's resize with that filter."""
+        pixels = np.random.default_rng(0).integers(0, 256, (80, 120, 3), dtype=np.uint8)
+        image = Image.fromarray(pixels)
+        
+        result = ImagePreprocessor(input_size=(32, 24), normalize=False, resample=name).preprocess(image)
+        
+        expected = image.resize((32, 24), ImagePreprocessor.RESAMPLE_FILTERS[name])
+        np.testing.assert_array_equal(result[0], np.asarray(expected, dtype=np.float32))
+    
+    def test_filters_produce_different_pixels(self):
+        """Downscaling the same image with different filters SHALL give different pixels."""
+        pixels = np.random.default_rng(0).integers(0, 256, (80, 120, 3), dtype=np.uint8)
+        image = Image.fromarray(pixels)
+        
+        outputs = {
+            name: ImagePreprocessor(input_size=(32, 24), normalize=False, resample=name).preprocess(image).tobytes()
+            for name in ImagePreprocessor.RESAMPLE_FILTERS
+        }
+        
+        assert len(set(outputs.values())) == len(outputs)
+    
+    def test_unknown_filter_rejected(self):
+        """An unknown filter name SHALL raise ValueError."""
+        with pytest.raises(ValueError):
+            ImagePreprocessor(resample="sinc")
+
+
+class TestPreprocessInto:
+    """Tests for preprocessing into a caller-supplied buffer."""
+    
+    @given(
+        batch_size=st.integers(min_value=1, max_value=6),
+        dtype=st.sampled_from([np.uint8, np.float32]),
+        seed=st.integers(min_value=0, max_value=1000)
+    )
+    @settings(max_examples=20, deadline=None)
+    def test_buffer_matches_preprocess_batch(self, batch_size, dtype, seed):
+        """
+        For any batch, preprocess_into SHALL write the same pixels as
+        preprocess_batch and return a view of the caller's buffer.
+        """
+        rng = np.random.default_rng(seed)
+        images = [
+            Image.fromarray(rng.integers(0, 256, (40, 50, 3), dtype=np.uint8))
+            for _ in range(batch_size)
+        ]
+        preprocessor = ImagePreprocessor(input_size=(24, 16), normalize=False)
+        buffer = np.zeros((8, 16, 24, 3), dtype=dtype)
+        
+        result = preprocessor.preprocess_into(images, buffer)
+        
+        assert result.shape == (batch_size, 16, 24, 3)
+        assert np.shares_memory(result, buffer)
+        np.testing.assert_array_equal(result, preprocessor.preprocess_batch(images))
+    
+    def test_no_per_image_allocations(self):
+        """Steady-state preprocess_into SHALL NOT allocate per-image float arrays."""
+        images = [Image.new("RGB", (200, 150), color=(i, 2 * i, 3 * i)) for i in range(16)]
+        preprocessor = ImagePreprocessor(input_size=(128, 128), normalize=False)
+        buffer = preprocessor.get_batch_buffer(len(images), dtype=np.float32)
+        preprocessor.preprocess_into(images, buffer)
+        
+        tracemalloc.start()
+        try:
+            preprocessor.preprocess_into(images, buffer)
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        
+        # Only the transient uint8 pixels of one resized image may be live
+        assert peak < 128 * 128 * 3 * np.dtype(np.float32).itemsize
+    
+    def test_uint8_buffer_rejected_when_normalizing(self):
+        """A uint8 buffer SHALL be rejected when normalize=True."""
+        preprocessor = ImagePreprocessor(input_size=(8, 8), normalize=True)
+        with pytest.raises(ValueError):
+            preprocessor.preprocess_into([Image.new("RGB", (8, 8))], np.zeros((1, 8, 8, 3), dtype=np.uint8))
+
+
 # **Feature: atk-classifier-mlops, Property 7: Normalization Range**
 # **Validates: Requirements 3.2**
 class TestNormalizationRange:
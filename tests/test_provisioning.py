@@ -0,0 +1,309 @@
+"""
+Tests for background model provisioning.
+Uses a local file and a local HTTP server as stand-ins for the model host.
+"""
+import functools
+import hashlib
+import http.server
+import json
+import threading
+from urllib.error import HTTPError
+
+import numpy as np
+import pytest
+from PIL import Image
+
+from models.inference import InferencePipeline
+from models.numpy_engine import ARCHITECTURE_KEY
+from models.provisioning import ModelProvisioner, read_expected_sha256
+
+
+@pytest.fixture
+def http_root(tmp_path):
+    """Serve tmp_path/served over HTTP on a free local port."""
+    root = tmp_path / "served"
+    root.mkdir()
+    handler = functools.partial(http.server.SimpleHTTPRequestHandler, directory=str(root))
+    handler.log_message = lambda *args: None
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield root, f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+
+
+class RangeHandler(http.server.BaseHTTPRequestHandler):
+    """Serves one payload with Range support; can drop the first response midway."""
+    
+    payload = b""
+    drop_first_after = None
+    requests = []
+    
+    def do_GET(self):
+        cls = type(self)
+        cls.requests.append(self.headers.get("Range"))
+        start = int(self.headers["Range"].split("=")[1].split("-")[0]) if self.headers.get("Range") else 0
+        body = cls.payload[start:]
+        
+        self.send_response(206 if start else 200)
+        if start:
+            self.send_header("Content-Range", f"bytes {start}-{len(cls.payload) - 1}/{len(cls.payload)}")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        
+        if cls.drop_first_after is not None and len(cls.requests) == 1:
+            self.wfile.write(body[:cls.drop_first_after])
+            self.wfile.flush()
+            self.close_connection = True
+            return
+        self.wfile.write(body)
+    
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def range_server():
+    """Start a RangeHandler server; yields (handler class, url)."""
+    handler = type("Handler", (RangeHandler,), {"payload": b"", "drop_first_after": None, "requests": []})
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield handler, f"http://127.0.0.1:{server.server_address[1]}/model.keras"
+    server.shutdown()
+
+
+def write_tiny_model(path):
+    """Write a Flatten -> Dense NumPy model (8x8 input, 3 classes)."""
+    architecture = {
+        "input_shape": [8, 8, 3],
+        "layers": [
+            {"type": "Flatten", "name": "flatten"},
+            {"type": "Dense", "name": "out", "activation": "softmax", "kernel": "k", "bias": "b"}
+        ]
+    }
+    rng = np.random.default_rng(0)
+    np.savez(
+        path,
+        k=rng.standard_normal((192, 3)).astype(np.float32),
+        b=np.zeros(3, dtype=np.float32),
+        **{ARCHITECTURE_KEY: np.array(json.dumps(architecture))}
+    )
+
+
+# **Feature: atk-classifier-mlops, Property 13: Background Model Provisioning**
+# **Validates: Non-blocking model download**
+class TestModelProvisioner:
+    """Tests for ModelProvisioner against local stand-ins."""
+    
+    def test_http_download_reports_progress(self, tmp_path, http_root):
+        """An HTTP download SHALL report byte progress and end in the ready state."""
+        root, base_url = http_root
+        payload = bytes(range(256)) * 10000
+        (root / "model.bin").write_bytes(payload)
+        seen = []
+        destination = tmp_path / "models" / "model.bin"
+        
+        provisioner = ModelProvisioner(f"{base_url}/model.bin", destination)
+        provisioner.add_ready_callback(seen.append)
+        status = provisioner.start().wait(timeout=30)
+        
+        assert status.state == "ready"
+        assert status.bytes_total == len(payload)
+        assert status.progress == 1.0
+        assert destination.read_bytes() == payload
+        assert seen == [destination]
+    
+    def test_too_small_download_fails_without_leaving_files(self, tmp_path, http_root):
+        """A download below min_size_bytes SHALL fail and leave no model or .part file."""
+        root, base_url = http_root
+        (root / "error.html").write_text("<html>quota exceeded</html>")
+        destination = tmp_path / "model.keras"
+        
+        status = ModelProvisioner(f"{base_url}/error.html", destination, min_size_bytes=1024).provision()
+        
+        assert status.state == "failed"
+        assert list(tmp_path.iterdir()) == [root.parent / "served"]
+    
+    def test_existing_model_is_not_refetched(self, tmp_path):
+        """A valid model already in place SHALL be ready without calling the fetcher."""
+        destination = tmp_path / "model.keras"
+        destination.write_bytes(b"x" * 100)
+        
+        def fail_fetch(*args):
+            raise AssertionError("fetcher should not run")
+        
+        status = ModelProvisioner("unused", destination, min_size_bytes=10, fetcher=fail_fetch).provision()
+        
+        assert status.state == "ready"
+    
+    def test_pipeline_switches_from_demo_to_real_model(self, tmp_path):
+        """A pipeline started in demo mode SHALL serve the real model once provisioning finishes."""
+        source = tmp_path / "source.npz"
+        write_tiny_model(source)
+        destination = tmp_path / "models" / "model.npz"
+        pipeline = InferencePipeline(model_path=str(destination), input_size=(8, 8), cache_size=0)
+        assert pipeline.is_demo_mode()
+        
+        provisioner = ModelProvisioner(str(source), destination)
+        provisioner.add_ready_callback(lambda path: pipeline.reload_model(str(path)))
+        provisioner.start().wait(timeout=30)
+        
+        assert not pipeline.is_demo_mode()
+        assert not pipeline.predict(Image.new("RGB", (8, 8))).is_demo
+
+
+class TestResumableFetch:
+    """Tests for resume, checksum verification and the shared cache."""
+    
+    def test_interrupted_download_resumes_with_range(self, tmp_path, range_server):
+        """A dropped connection SHALL be resumed with a Range request, not restarted."""
+        handler, url = range_server
+        handler.payload = bytes(range(256)) * 4000
+        handler.drop_first_after = 300000
+        destination = tmp_path / "model.keras"
+        
+        status = ModelProvisioner(
+            url, destination, expected_sha256=hashlib.sha256(handler.payload).hexdigest()
+        ).provision()
+        
+        assert status.state == "ready"
+        assert destination.read_bytes() == handler.payload
+        assert handler.requests == [None, "bytes=300000-"]
+    
+    def test_checksum_mismatch_rejected(self, tmp_path, range_server):
+        """A download whose SHA-256 differs SHALL fail and leave no model or partial file."""
+        handler, url = range_server
+        handler.payload = b"tampered" * 1000
+        destination = tmp_path / "model.keras"
+        
+        status = ModelProvisioner(url, destination, expected_sha256="0" * 64).provision()
+        
+        assert status.state == "failed"
+        assert "Checksum mismatch" in status.error
+        assert list(tmp_path.iterdir()) == []
+    
+    def test_partial_file_discarded_without_checksum(self, tmp_path):
+        """Without a known checksum, a stale .part SHALL be discarded instead of resumed."""
+        source = tmp_path / "source.keras"
+        source.write_bytes(b"fresh model" * 100)
+        destination = tmp_path / "models" / "model.keras"
+        destination.parent.mkdir()
+        (destination.parent / "model.keras.part").write_bytes(b"stale bytes from another version")
+        
+        status = ModelProvisioner(str(source), destination).provision()
+        
+        assert status.state == "ready"
+        assert destination.read_bytes() == source.read_bytes()
+    
+    @pytest.mark.parametrize("error, attempts", [
+        (HTTPError("http://host/model.keras", 404, "Not Found", None, None), 1),
+        (HTTPError("http://host/model.keras", 403, "Forbidden", None, None), 1),
+        (FileNotFoundError("missing.keras"), 1),
+        (HTTPError("http://host/model.keras", 503, "Unavailable", None, None), 3),
+        (ConnectionResetError("reset"), 3),
+    ])
+    def test_only_transient_errors_are_retried(self, tmp_path, error, attempts):
+        """HTTP 4xx and missing local sources SHALL fail at once; transient errors SHALL be retried."""
+        calls = []
+        
+        def failing_fetch(source, destination, progress_callback, resume=False):
+            calls.append(resume)
+            raise error
+        
+        status = ModelProvisioner("unused", tmp_path / "model.keras", retries=2, fetcher=failing_fetch).provision()
+        
+        assert status.state == "failed"
+        assert len(calls) == attempts
+    
+    def test_cache_shared_between_replicas(self, tmp_path, range_server):
+        """Replicas sharing a cache directory SHALL download the model only once."""
+        handler, url = range_server
+        handler.payload = b"model-bytes" * 5000
+        sha256 = hashlib.sha256(handler.payload).hexdigest()
+        cache_dir = tmp_path / "cache"
+        
+        replicas = [
+            ModelProvisioner(url, tmp_path / f"replica{i}" / "model.keras", expected_sha256=sha256, cache_dir=cache_dir)
+            for i in range(3)
+        ]
+        for replica in replicas:
+            replica.start()
+        statuses = [replica.wait(timeout=30) for replica in replicas]
+        
+        assert [status.state for status in statuses] == ["ready"] * 3
+        assert len(handler.requests) == 1
+        assert (cache_dir / sha256).read_bytes() == handler.payload
+        for replica in replicas:
+            assert replica.destination.read_bytes() == handler.payload
+    
+    def test_expected_checksum_read_from_metadata(self, tmp_path):
+        """The expected checksum SHALL come from the model's sidecar .json."""
+        (tmp_path / "best_model.json").write_text(json.dumps({"sha256": "ABC123"}))
+        
+        assert read_expected_sha256(tmp_path / "best_model.keras") == "abc123"
+        assert read_expected_sha256(tmp_path / "other.keras") is None
+
+
+class TestProvisioningScope:
+    """Only the artifact MODEL_SOURCE serves SHALL be downloaded."""
+    
+    @pytest.mark.parametrize("model_path, backend, expected", [
+        ("models/best_model.keras", None, True),
+        ("models/best_model.keras", "keras", True),
+        ("models/best_model.npz", None, False),
+        ("models/best_model.weights", None, False),
+        ("models/best_model_int8.tflite", None, False),
+        ("models/best_model.keras", "numpy", False),
+    ])
+    def test_model_source_serves(self, model_path, backend, expected):
+        """Only a .keras MODEL_PATH on the Keras backend SHALL come from MODEL_SOURCE."""
+        from pathlib import Path
+        from app.config import model_source_serves
+        
+        assert model_source_serves(Path(model_path), backend) is expected
+    
+    def test_local_artifact_is_never_overwritten(self, tmp_path, monkeypatch):
+        """A .npz sharing the .keras sidecar SHALL stay untouched instead of being replaced by the download."""
+        from app.config import create_model_provisioner, settings
+        
+        keras_bytes = b"keras zip" * 100
+        source = tmp_path / "served.keras"
+        source.write_bytes(keras_bytes)
+        npz_path = tmp_path / "best_model.npz"
+        write_tiny_model(npz_path)
+        npz_bytes = npz_path.read_bytes()
+        (tmp_path / "best_model.json").write_text(json.dumps({"sha256": hashlib.sha256(keras_bytes).hexdigest()}))
+        monkeypatch.setattr(settings, "MODEL_SOURCE", str(source))
+        monkeypatch.setattr(settings, "MODEL_PATH", npz_path)
+        monkeypatch.setattr(settings, "MODEL_CACHE_DIR", tmp_path / "cache")
+        
+        status = create_model_provisioner().provision()
+        
+        assert status.state == "ready"
+        assert npz_path.read_bytes() == npz_bytes
+        assert not (tmp_path / "cache").exists()
+    
+    def test_missing_local_artifact_fails_without_download(self, tmp_path):
+        """A provisioner without a source SHALL report a missing model as failed."""
+        status = ModelProvisioner(None, tmp_path / "best_model.npz").provision()
+        
+        assert status.state == "failed"
+        assert "no download source" in status.error
+    
+    def test_small_model_with_checksum_is_kept(self, tmp_path, monkeypatch):
+        """A small (GAP-head) model matching its recorded checksum SHALL be ready without a download."""
+        from app.config import create_model_provisioner, settings
+        
+        model_path = tmp_path / "best_model.keras"
+        model_path.write_bytes(b"gap model" * 1000)
+        (tmp_path / "best_model.json").write_text(json.dumps({
+            "head": "gap", "sha256": hashlib.sha256(model_path.read_bytes()).hexdigest()
+        }))
+        monkeypatch.setattr(settings, "MODEL_SOURCE", str(tmp_path / "unreachable.keras"))
+        monkeypatch.setattr(settings, "MODEL_PATH", model_path)
+        
+        provisioner = create_model_provisioner()
+        
+        assert provisioner.is_present()
+        assert provisioner.provision().state == "ready"
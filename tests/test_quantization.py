@@ -0,0 +1,105 @@
+"""
+Tests for post-training int8 quantization.
+Builds a tiny model so conversion and evaluation run in seconds.
+"""
+import json
+
+import numpy as np
+import pytest
+from PIL import Image
+
+from models.cnn_model import ATKClassifier, ModelPredictor, TENSORFLOW_AVAILABLE
+from models.preprocessing import ImagePreprocessor
+from models.provisioning import file_sha256
+
+pytestmark = pytest.mark.skipif(not TENSORFLOW_AVAILABLE, reason="TensorFlow not installed")
+
+CLASS_NAMES = ["eraser", "kertas", "pensil"]
+INPUT_SIZE = (16, 16)
+
+
+@pytest.fixture(scope="module")
+def quantized(tmp_path_factory):
+    """A tiny float model, a 3-class dataset and its int8 conversion."""
+    import tensorflow as tf
+    from models.quantization import quantize_int8
+    
+    root = tmp_path_factory.mktemp("quantization")
+    rng = np.random.default_rng(0)
+    dataset_dir = root / "dataset"
+    for label, class_name in enumerate(CLASS_NAMES):
+        (dataset_dir / class_name).mkdir(parents=True)
+        for i in range(6):
+            pixels = rng.integers(0, 60, (20, 24, 3)) + 90 * label
+            Image.fromarray(pixels.astype(np.uint8)).save(dataset_dir / class_name / f"img{i}.png")
+    
+    tf.keras.utils.set_random_seed(0)
+    model = ATKClassifier.build_model(
+        input_shape=(*INPUT_SIZE, 3), conv1_filters=4, conv2_filters=4, conv3_filters=4, dense_units=8
+    )
+    model_path = root / "model.keras"
+    model.save(model_path)
+    model_path.with_suffix(".json").write_text(json.dumps({"class_names": CLASS_NAMES, "sha256": "0" * 64}))
+    
+    quantized_path = quantize_int8(str(model_path), dataset_dir=str(dataset_dir), calibration_per_class=2)
+    return model_path, quantized_path, dataset_dir
+
+
+# **Feature: atk-classifier-mlops, Property 23: Int8 Quantization Report**
+# **Validates: Post-training int8 quantization**
+class TestQuantization:
+    """Tests for quantize_int8 and evaluate_quantization."""
+    
+    def test_int8_model_serves_uint8_and_float_input(self, quantized):
+        """The int8 artifact SHALL load as TFLite and track the float model for uint8 and float input."""
+        model_path, quantized_path, dataset_dir = quantized
+        float_predictor = ModelPredictor(model_path=str(model_path))
+        quant_predictor = ModelPredictor(model_path=str(quantized_path))
+        batch = ImagePreprocessor(input_size=INPUT_SIZE, normalize=False).preprocess_batch(
+            sorted(dataset_dir.glob("*/*.png"))
+        )
+        
+        assert not quant_predictor.is_demo_mode()
+        assert quant_predictor.get_model_info()["metadata"]["quantization"] == "int8"
+        assert quant_predictor.class_names == CLASS_NAMES
+        assert quant_predictor.get_model_info()["metadata"]["sha256"] == file_sha256(quantized_path)
+        
+        as_uint8 = quant_predictor.predict_batch(batch.astype(np.uint8), top_k=3)
+        as_float = quant_predictor.predict_batch(batch, top_k=3)
+        expected = float_predictor.predict_batch(batch, top_k=3)
+        for uint8_result, float_result, float_model_result in zip(as_uint8, as_float, expected):
+            assert uint8_result.top_predictions == float_result.top_predictions
+            assert sum(p["confidence"] for p in uint8_result.top_predictions) == pytest.approx(1.0, abs=0.05)
+            assert uint8_result.confidence == pytest.approx(float_model_result.confidence, abs=0.1)
+    
+    def test_report_excludes_calibration_images(self, quantized):
+        """The report SHALL only count images not used for calibration and hold sane values."""
+        from models.quantization import evaluate_quantization
+        
+        model_path, quantized_path, dataset_dir = quantized
+        metadata = json.loads(quantized_path.with_suffix(".json").read_text())
+        
+        report = evaluate_quantization(
+            str(model_path), str(quantized_path), str(dataset_dir), input_size=INPUT_SIZE, latency_repeats=2
+        )
+        
+        assert len(metadata["calibration_files"]) == metadata["calibration_images"] == 6
+        assert report.num_images == 18 - 6
+        assert set(report.per_class_accuracy) == set(CLASS_NAMES)
+        assert 0.5 <= report.top1_agreement <= 1.0
+        for value in (report.float_accuracy, report.quantized_accuracy):
+            assert 0.0 <= value <= 1.0
+        assert report.quantized_size_mb < report.float_size_mb
+        assert report.float_latency_ms > 0 and report.quantized_latency_ms > 0
+    
+    def test_report_needs_held_out_images(self, quantized, tmp_path):
+        """A dataset fully used for calibration SHALL raise instead of reporting on seen images."""
+        from models.quantization import evaluate_quantization, quantize_int8
+        
+        model_path, _, dataset_dir = quantized
+        quantized_path = quantize_int8(
+            str(model_path), str(tmp_path / "all.tflite"), str(dataset_dir), calibration_per_class=6
+        )
+        
+        with pytest.raises(ValueError):
+            evaluate_quantization(str(model_path), str(quantized_path), str(dataset_dir), input_size=INPUT_SIZE)
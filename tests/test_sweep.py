@@ -0,0 +1,111 @@
+"""
+Tests for the hyperparameter sweep module.
+Uses Hypothesis library for property-based testing.
+"""
+import io
+import json
+
+import pytest
+from PIL import Image
+from hypothesis import given, strategies as st, settings
+
+from models.sweep import SweepRunner, grid_configs, promote_best, random_configs, should_prune
+from models.train_model import TrainingConfig
+
+spaces = st.dictionaries(
+    st.sampled_from(["conv1_filters", "dense_units", "dropout_rate", "learning_rate", "batch_size"]),
+    st.lists(st.integers(min_value=1, max_value=64), min_size=1, max_size=3, unique=True),
+    min_size=1
+)
+
+
+def trial(trial_id, rung, val_accuracy, history=None, status="completed", model_path=None):
+    """Minimal trial record."""
+    return {
+        "trial_id": trial_id, "rung": rung, "status": status, "val_accuracy": val_accuracy,
+        "val_loss": 1 - val_accuracy, "history": {"val_accuracy": history or []}, "model_path": model_path
+    }
+
+
+# **Feature: atk-classifier-mlops, Property 20: Sweep Candidate Generation**
+# **Validates: Hyperparameter sweep engine**
+class TestCandidates:
+    """Property tests for grid and random candidates."""
+    
+    @given(space=spaces, num_trials=st.integers(min_value=1, max_value=30), seed=st.integers(0, 1000))
+    @settings(max_examples=50)
+    def test_random_is_a_reproducible_subset_of_the_grid(self, space, num_trials, seed):
+        """Grid SHALL cover every combination once; random SHALL sample distinct grid points reproducibly."""
+        grid = grid_configs(space)
+        expected = 1
+        for values in space.values():
+            expected *= len(values)
+        assert len(grid) == expected
+        assert len({tuple(sorted(c.items())) for c in grid}) == expected
+        
+        sample = random_configs(space, num_trials, seed)
+        assert len(sample) == min(num_trials, expected)
+        assert all(c in grid for c in sample)
+        assert sample == random_configs(space, num_trials, seed)
+
+
+class TestPruningAndPromotion:
+    """Tests for the median rule, promotion and an in-process sweep."""
+    
+    def test_median_rule(self):
+        """Trials below the peer median after warm-up SHALL be pruned, others SHALL continue."""
+        peers = [trial(f"t{i}", 0, 0.0, [0.2, acc]) for i, acc in enumerate([0.5, 0.6, 0.7])]
+        assert should_prune(0.55, 2, peers)
+        assert not should_prune(0.65, 2, peers)
+        assert not should_prune(0.0, 1, peers)
+        assert not should_prune(0.0, 2, peers[:2])
+    
+    def test_promote_best_copies_top_rung_winner(self, tmp_path):
+        """The best completed trial of the highest rung SHALL replace the serving model and metadata."""
+        records = []
+        for trial_id, rung, acc in [("r0-a", 0, 0.9), ("r1-b", 1, 0.6), ("r1-c", 1, 0.7)]:
+            model = tmp_path / trial_id / "model.keras"
+            model.parent.mkdir()
+            model.write_bytes(trial_id.encode())
+            model.with_suffix(".json").write_text(json.dumps({"class_names": ["a", "b"]}))
+            records.append(trial(trial_id, rung, acc, model_path=str(model)))
+        records.append(trial("r1-d", 1, 0.99, status="failed"))
+        
+        target = tmp_path / "serving" / "best_model.keras"
+        best = promote_best(records, str(target), "results.jsonl")
+        
+        assert best["trial_id"] == "r1-c"
+        assert target.read_bytes() == b"r1-c"
+        metadata = json.loads(target.with_suffix(".json").read_text())
+        assert metadata["class_names"] == ["a", "b"]
+        assert metadata["sweep"]["trial_id"] == "r1-c"
+    
+    def test_unknown_field_raises(self):
+        """A search space naming a field TrainingConfig lacks SHALL raise ValueError."""
+        with pytest.raises(ValueError):
+            SweepRunner(space={"num_layers": [1, 2]})
+    
+    def test_in_process_halving_sweep(self, tmp_path):
+        """A halving sweep SHALL store every trial and train survivors with a larger budget."""
+        for label in range(2):
+            for i in range(5):
+                buffer = io.BytesIO()
+                Image.new("RGB", (10, 10), (200 * label, 40 * i, 50)).save(buffer, format="PNG")
+                path = tmp_path / "dataset" / f"class{label}" / f"img{i}.png"
+                path.parent.mkdir(parents=True, exist_ok=True)
+                path.write_bytes(buffer.getvalue())
+        base = TrainingConfig(
+            img_height=8, img_width=8, epochs=2, batch_size=4, validation_split=0.2,
+            conv1_filters=2, conv2_filters=2, conv3_filters=2
+        )
+        runner = SweepRunner(
+            dataset_dir=str(tmp_path / "dataset"), output_dir=str(tmp_path / "sweep"),
+            space={"dense_units": [2, 4]}, base_config=base, strategy="grid",
+            max_workers=0, halving=True, min_epochs=1
+        )
+        
+        records = runner.run()
+        
+        assert [(r["rung"], r["config"]["epochs"]) for r in records] == [(0, 1), (0, 1), (1, 2)]
+        assert all(r["status"] == "completed" and r["wall_time_sec"] > 0 for r in records)
+        assert runner.store.load() == records
@@ -0,0 +1,79 @@
+"""
+Tests for the preprocessed tensor cache.
+Uses Hypothesis library for property-based testing.
+"""
+import io
+
+import numpy as np
+import pytest
+from PIL import Image
+from hypothesis import given, strategies as st, settings, HealthCheck
+
+from models.input_pipeline import decode_dataset
+from models.tensor_cache import TensorCache, load_cache
+
+
+def write_image(path, color, image_format="JPEG", size=(23, 17)):
+    """Write a small solid-color image."""
+    buffer = io.BytesIO()
+    Image.new("RGB", size, color).save(buffer, format=image_format)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(buffer.getvalue())
+
+
+# **Feature: atk-classifier-mlops, Property 18: Content-keyed Tensor Cache**
+# **Validates: Preprocessed training-set cache**
+class TestTensorCache:
+    """Tests for TensorCache."""
+    
+    @given(
+        counts=st.lists(st.integers(min_value=0, max_value=3), min_size=1, max_size=3),
+        size=st.tuples(st.integers(min_value=4, max_value=20), st.integers(min_value=4, max_value=20))
+    )
+    @settings(max_examples=10, deadline=None, suppress_health_check=[HealthCheck.function_scoped_fixture])
+    def test_rows_match_decode_pipeline(self, tmp_path_factory, counts, size):
+        """Every cached row SHALL equal the decode pipeline's tensor for its file, labelled by sorted class."""
+        dataset = tmp_path_factory.mktemp("data") / "dataset"
+        dataset.mkdir()
+        for class_idx, count in enumerate(counts):
+            for i in range(count):
+                write_image(dataset / f"class{class_idx}" / f"img{i}.png", (40 * i, 80 * class_idx, 200), "PNG")
+        
+        cached = TensorCache(dataset, img_size=size, num_workers=2).open()
+        
+        height, width = size
+        assert cached.images.shape == (sum(counts), height, width, 3)
+        assert cached.class_names == [f"class{i}" for i, count in enumerate(counts) if count]
+        if not len(cached):
+            return
+        decoded = decode_dataset(
+            [str(dataset / path) for path in cached.paths], cached.labels, size, batch_size=len(cached)
+        )
+        images, labels = next(iter(decoded))
+        np.testing.assert_array_equal(images.numpy(), cached.images.astype(np.float32))
+        for row, path in enumerate(cached.paths):
+            assert cached.class_names[cached.labels[row]] == path.split("/")[0]
+    
+    def test_cache_is_reused_until_dataset_changes(self, tmp_path):
+        """An unchanged dataset SHALL reuse the cache; a changed file SHALL select a new one."""
+        dataset = tmp_path / "dataset"
+        for i in range(3):
+            write_image(dataset / "pensil" / f"img{i}.jpg", (10 * i, 20, 30))
+        cache = TensorCache(dataset, img_size=(8, 8))
+        
+        first = cache.build()
+        built_at = (first / "images.npy").stat().st_mtime_ns
+        assert cache.build() == first
+        assert (first / "images.npy").stat().st_mtime_ns == built_at
+        
+        write_image(dataset / "pensil" / "img0.jpg", (255, 255, 255))
+        second = cache.build()
+        assert second != first
+        assert load_cache(second).images[0].min() > 200
+        assert not any(p.name.endswith(".tmp") for p in cache.cache_dir.iterdir())
+    
+    def test_missing_cache_raises(self, tmp_path):
+        """Opening an unbuilt cache without building SHALL raise FileNotFoundError."""
+        write_image(tmp_path / "dataset" / "eraser" / "img.jpg", (1, 2, 3))
+        with pytest.raises(FileNotFoundError):
+            TensorCache(tmp_path / "dataset").open(build=False)
@@ -0,0 +1,75 @@
+"""
+Tests for the training runtime options.
+Uses Hypothesis library for property-based testing.
+"""
+import io
+import json
+
+import numpy as np
+import pytest
+from PIL import Image
+from hypothesis import given, strategies as st, settings
+
+from models.train_model import (
+    ATKModelTrainer, TrainingConfig, cpu_supports_bfloat16, resolve_precision, train_model_from_dataset
+)
+
+
+def tiny_config(**overrides):
+    """Small, fast TrainingConfig."""
+    values = dict(
+        img_height=8, img_width=8, epochs=1, batch_size=4, validation_split=0.2,
+        conv1_filters=2, conv2_filters=2, conv3_filters=2, dense_units=4
+    )
+    values.update(overrides)
+    return TrainingConfig(**values)
+
+
+# **Feature: atk-classifier-mlops, Property 21: Precision Policy Resolution**
+# **Validates: Mixed-precision training mode**
+class TestPrecision:
+    """Tests for precision policies."""
+    
+    @given(precision=st.sampled_from(["float32", "mixed_bfloat16", "mixed_float16", "auto"]))
+    @settings(max_examples=10)
+    def test_resolve_precision(self, precision):
+        """Explicit policies SHALL pass through; 'auto' SHALL pick bfloat16 only on CPUs that support it."""
+        expected = precision
+        if precision == "auto":
+            expected = "mixed_bfloat16" if cpu_supports_bfloat16() else "float32"
+        assert resolve_precision(precision) == expected
+    
+    def test_unknown_precision_raises(self):
+        """Unknown precision names SHALL raise ValueError."""
+        with pytest.raises(ValueError):
+            resolve_precision("float8")
+    
+    def test_mixed_model_keeps_float32_softmax_and_global_policy(self):
+        """A mixed_bfloat16 model SHALL compute in bfloat16, emit float32 and leave the global policy alone."""
+        from tensorflow.keras import mixed_precision
+        
+        model = ATKModelTrainer(tiny_config(precision="mixed_bfloat16")).build_model(3)
+        
+        assert model.layers[1].compute_dtype == "bfloat16"
+        assert model.layers[-1].compute_dtype == "float32"
+        assert model.predict(np.zeros((1, 8, 8, 3), np.float32), verbose=0).dtype == np.float32
+        assert mixed_precision.global_policy().name == "float32"
+    
+    def test_mixed_training_saves_float32_model(self, tmp_path):
+        """Training in mixed precision SHALL save a float32 model and record the training precision."""
+        from tensorflow import keras
+        
+        for label in range(2):
+            for i in range(5):
+                buffer = io.BytesIO()
+                Image.new("RGB", (10, 10), (200 * label, 40 * i, 50)).save(buffer, format="PNG")
+                path = tmp_path / "dataset" / f"class{label}" / f"img{i}.png"
+                path.parent.mkdir(parents=True, exist_ok=True)
+                path.write_bytes(buffer.getvalue())
+        model_path = tmp_path / "model.keras"
+        
+        train_model_from_dataset(str(tmp_path / "dataset"), str(model_path), tiny_config(precision="mixed_bfloat16"))
+        
+        model = keras.models.load_model(str(model_path))
+        assert {layer.compute_dtype for layer in model.layers} == {"float32"}
+        assert json.loads(model_path.with_suffix(".json").read_text())["training_precision"] == "mixed_bfloat16"